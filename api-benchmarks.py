@@ -0,0 +1,212 @@
+""" Prologue
+ *  Module Name: api-benchmarks.py
+ *  Purpose: Benchmarks for the TaskAPI store, the Task annotation accessors and the task loaders.
+ *  Inputs: Command line arguments, see `python api-benchmarks.py --help`.
+ *  Outputs: JSON timings, to stdout or the file passed with `--output`.
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: Writes a synthetic taskwarrior data directory and snapshot to a temporary directory.
+ *  Invariants: The same `--seed` always benchmarks the same tasks and operations.
+ *  Known Faults: Runs against FakeTaskAPI and taskwarrior's data files, the `task` subprocess isn't benchmarked.
+"""
+
+from utils.task_api import register_api, FakeTaskAPI
+register_api(FakeTaskAPI) # Order matters.
+
+from utils.task_api import api
+from utils.task import Task
+from utils.sortmetric import SortMetric
+from utils.task_generator import generate_records, write_data_dir, MODULES
+from utils.task_data_loader import TaskDataLoader
+from utils.task_snapshot import load_snapshot, save_snapshot
+from typing import Callable
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+def populate(records: list[dict]) -> list[Task]:
+    """Replaces everything in the API with freshly decoded `records`."""
+    api.clear_tasks()  # Clear the tasks in the API
+    for mod in MODULES:
+        api.add_module(mod)  # Make sure every module exists, even an empty one.
+
+    tasks = [Task(r) for r in records]
+    api.add_loaded_tasks(tasks)  # One sort per module.
+    return tasks
+
+def locations(rng: random.Random, k: int) -> list[tuple[str, int]]:
+    """`k` random (module, index) pairs of stored tasks."""
+    mods = [mod for mod in api.task_dict if api.num_tasks(mod) > 0]
+    picks = []
+    for _ in range(k):
+        mod = rng.choice(mods)
+        picks.append((mod, rng.randrange(api.num_tasks(mod))))
+    return picks
+
+class Benchmarks:
+    """Runs every benchmark for one task count and collects the results."""
+    def __init__(self, records: list[dict], ops: int, repeat: int, seed: int, workdir: str):
+        self.records = records  # The synthetic tasks.
+        self.size = len(records)
+        self.ops = min(ops, self.size)  # How many operations the per-operation benchmarks time.
+        self.repeat = repeat  # Each benchmark is run this many times and the fastest run is kept.
+        self.seed = seed
+        self.workdir = workdir  # Where the data directory and snapshot go.
+        self.results: list[dict] = []
+
+    def time(self, name: str, ops: int, setup: Callable[[], object], run: Callable[[object], None]) -> None:
+        """Times `run(setup())` `repeat` times, only counting `run`, and records the fastest."""
+        times = []
+        for _ in range(self.repeat):
+            state = setup()  # Not timed.
+            start = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - start)
+
+        best = min(times)
+        self.results.append({
+            'benchmark': name,
+            'size': self.size,
+            'ops': ops,
+            'seconds': best,
+            'us_per_op': best / ops * 1e6 if ops else None,
+            'runs': times,
+        })
+        print(f"{self.size:>7} {name:<28} {best:9.4f}s", file=sys.stderr)  # One line per benchmark as it finishes, without `--output` the JSON owns stdout.
+
+    def run_all(self) -> list[dict]:
+        self.bench_store()
+        self.bench_annotations()
+        self.bench_loaders()
+        return self.results
+
+    def bench_store(self) -> None:
+        """FakeTaskAPI operations on a store holding every task."""
+        self.time('load', self.size, lambda: None, lambda _: populate(self.records))
+
+        def add(rng: random.Random):
+            for i in range(self.ops):
+                api.add_new_task(description=f"benchmark task {rng.random()}", tags="bench", priority=rng.choice("HML"),
+                                 project="Bench", module=rng.choice(MODULES))
+        self.time('add_new_task', self.ops, lambda: (populate(self.records), random.Random(self.seed))[1], add)
+
+        def update(picks: list[tuple[str, int]]):
+            for mod, idx in picks:
+                t = api.task_at(idx, mod)
+                t.set('description', f"updated {idx}")  # Moves the task within its module.
+                api.update_task(t)
+        self.time('update_task', self.ops, lambda: (populate(self.records), locations(random.Random(self.seed), self.ops))[1], update)
+
+        def delete(rng: random.Random):
+            for _ in range(self.ops):
+                mod, idx = locations(rng, 1)[0]  # Earlier deletes shrink the modules, so pick as we go.
+                api.delete_at(idx, mod)
+        self.time('delete_at', self.ops, lambda: (populate(self.records), random.Random(self.seed))[1], delete)
+
+        def batch(rng: random.Random):
+            with api.batch():
+                for mod, idx in locations(rng, self.ops):
+                    t = api.task_at(idx, mod)
+                    t.set('priority', rng.choice("HML"))
+                    api.update_task(t)
+        self.time('batch_update_task', self.ops, lambda: (populate(self.records), random.Random(self.seed))[1], batch)
+
+        metrics = list(SortMetric)
+        def sort(_):
+            for metric in metrics:
+                api.set_sort_metric(metric)
+        self.time('set_sort_metric', len(metrics), lambda: populate(self.records), sort)
+
+        def iterate(_):
+            for mod in api.task_dict:
+                for i in range(api.num_tasks(mod)):
+                    api.task_at(i, mod)
+        self.time('task_at_iteration', self.size, lambda: populate(self.records), iterate)
+
+        def lookup(uuids: list[str]):
+            for task_uuid in uuids:
+                api.get_by_uuid(task_uuid)
+        self.time('get_by_uuid', self.size, lambda: (populate(self.records), [r['uuid'] for r in self.records])[1], lookup)
+
+    def bench_annotations(self) -> None:
+        """The `Task` annotation accessors, on freshly decoded tasks and then again once cached."""
+        def get_module(tasks: list[Task]):
+            for t in tasks:
+                t.get_module()
+        self.time('get_module_cold', self.size, lambda: [Task(r) for r in self.records], get_module)
+
+        def warm() -> list[Task]:
+            tasks = [Task(r) for r in self.records]
+            get_module(tasks)  # Decode the annotations up front.
+            return tasks
+        self.time('get_module_warm', self.size, warm, get_module)
+
+        def nonstandard(tasks: list[Task]):
+            for i, t in enumerate(tasks):
+                t.set_nonstandard_col('estimate', str(i))
+                t.get_nonstandard_col('estimate')
+        self.time('nonstandard_col_set_get', self.size, warm, nonstandard)
+
+    def bench_loaders(self) -> None:
+        """Reading tasks from a stand-in taskwarrior data directory, and the warm-start snapshot."""
+        data_dir = os.path.join(self.workdir, f'data-{self.size}')
+        write_data_dir(data_dir, self.records)
+
+        loader = TaskDataLoader(data_dir)
+        self.time('data_dir_records', self.size, lambda: None, lambda _: list(loader.records()))
+        self.time('data_dir_decode', self.size, lambda: None, lambda _: [Task(x) for x in loader.records()])
+
+        path = os.path.join(self.workdir, f'snapshot-{self.size}.bin')
+        self.time('snapshot_save', self.size, lambda: populate(self.records),
+                  lambda _: save_snapshot(path, api.take_snapshot(('bench',))))
+        self.time('snapshot_restore', self.size, lambda: None,
+                  lambda _: api.restore_snapshot(load_snapshot(path, ('bench',))))
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the TaskAPI store and task loaders on synthetic tasks.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000], help="task counts to benchmark")
+    parser.add_argument('--ops', type=int, default=1_000, help="operations per add/update/delete benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per benchmark, the fastest is reported")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the generated tasks and operations")
+    parser.add_argument('--output', help="write the JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            records = generate_records(size, seed=args.seed)
+            results += Benchmarks(records, args.ops, args.repeat, args.seed, workdir).run_all()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'ops': args.ops,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+# Program entry point
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan
  *  Date: 3/10/2025
- *  Last Modified: 2/25/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -19,6 +19,7 @@ from utils.task_api import register_api, TaskAPIImpl
 register_api(TaskAPIImpl) # Order matters.
 
 from utils.task_api import api
+import datetime
 
 MODULE_TEST_NAME = "Main"
 
@@ -61,4 +62,58 @@ class TestClass:
         assert task_idx != -1 # test that a task exists. If not, then the test method failed.
 
         api.delete_at(task_idx, MODULE_TEST_NAME)  # delete the task at the index
-        assert api.num_tasks("Main") == 0  # test if the number of tasks is 0
\ No newline at end of file
+        assert api.num_tasks("Main") == 0  # test if the number of tasks is 0
+
+    def test_api_ids_after_delete(self):
+        """Test that the stored ids follow taskwarrior's renumbering after a delete"""
+        first = api.add_new_task(description="Renumber A")  # add two tasks, the second one gets the higher id
+        second = api.add_new_task(description="Renumber B")
+        api.delete_by_uuid(str(first.get_uuid()))  # taskwarrior moves every later id down
+
+        for x in api.warrior._get_json('status:pending', 'export'):
+            stored = api.get_by_uuid(x['uuid'])
+            assert stored is not None and str(stored['id']) == str(x['id'])  # test if every stored id is taskwarrior's
+            assert str(api.get_by_id(x['id'])['uuid']) == x['uuid']  # test if the id index agrees
+        api.delete_by_uuid(str(second.get_uuid()))  # clean up
+
+    def test_api_recurring_task(self):
+        """Test that a recurring task shows its pending instances, and never its template"""
+        due = datetime.date.today().isoformat()
+        template = api.add_new_task(description="Recurring Test", recur="weekly", due=due)
+        template_uuid = str(template.get_uuid())
+
+        def instances():
+            return [t for mod in api.task_dict.values() for t in mod if str(t.get('parent')) == template_uuid]
+
+        assert api.get_by_uuid(template_uuid) is None  # test that the template isn't stored
+        assert [t['status'] for t in instances()] == ['pending']  # test that its instance is
+
+        first = instances()[0]
+        first.set('status', 'completed')
+        api.update_task(first)  # completing it spawns the next one
+        assert api.get_by_uuid(str(first.get_uuid()))['status'] == 'completed'
+        assert any(t['status'] == 'pending' for t in instances())  # test that the next instance is stored
+        assert all(t['status'] in api.SHOWN_STATUSES for mod in api.task_dict.values() for t in mod)
+
+        for t in instances():  # clean up
+            if t['status'] == 'pending':
+                api.delete_by_uuid(str(t.get_uuid()))
+        _, stored_template = api.warrior.get_task(uuid=template_uuid)
+        if stored_template['status'] != 'deleted':
+            api.warrior.task_delete(uuid=template_uuid)
+
+    def test_api_batch_add_blank_fields(self):
+        """Test a batch that imports a task with the GUI's blank fields and deletes another"""
+        doomed = api.add_new_task(description="Batch Delete")
+        with api.batch():
+            task = api.add_new_task(description="Batch Add", tags=None, priority="", project="", recur="", due="")  # what the add dialog sends
+            api.delete_by_uuid(str(doomed.get_uuid()))
+
+        stored = api.get_by_uuid(str(task.get_uuid()))
+        assert stored is not None and stored.get_description() == "Batch Add"  # test if the import was stored
+        for field in ("priority", "project", "recur", "due"):
+            assert not stored.get(field)  # test that blank fields stayed unset
+        _, exported = api.warrior.get_task(uuid=str(task.get_uuid()))
+        assert exported['status'] == 'pending' and str(stored['id']) == str(exported['id'])  # test if it matches the re-export
+        assert api.get_by_uuid(str(doomed.get_uuid())) is None  # test if the delete went through
+        api.delete_by_uuid(str(task.get_uuid()))  # clean up
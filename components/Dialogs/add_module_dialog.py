@@ -6,25 +6,24 @@
  *  Additional code sources: None
  *  Developers: Mo Morgan
  *  Date: 3/26/2025
- *  Last Modified: 3/26/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
- *  Side effects:   Updates the `self.config` dictionary with the new module and its attributes.
-                    Saves the updated configuration to the configuration file using `save_module_config`.
+ *  Side effects:   Adds the new module and its attributes to `module_registry`, which saves them to the
+                    configuration file and tells the GUI, so the module's tab shows up right away.
 
  *  Invariants: None
  *  Known Faults: None encountered
 """
 
 from PySide6.QtWidgets import QDialog, QLineEdit, QGroupBox, QVBoxLayout, QCheckBox, \
-    QDialogButtonBox, QFormLayout, QPushButton, QMessageBox
+    QDialogButtonBox, QFormLayout, QPushButton
 from PySide6.QtCore import Signal
 from typing import Optional
 import os
-from utils.config_loader import load_module_config, save_module_config
-from utils.config_paths import CONFIG_DIR, MODULES_CONFIG_FILE
-from components.Dialogs.preset_modules_dialog import PresetModulesDialog
+from utils.module_registry import module_registry
+from utils.config_paths import CONFIG_DIR
 
 
 class AddModuleDialog(QDialog):
@@ -33,16 +32,13 @@ class AddModuleDialog(QDialog):
             self.grid_name = module_name
             self.attributes = attributes
 
-    def __init__(self, config_file=MODULES_CONFIG_FILE):
+    def __init__(self):
         super().__init__()
         os.makedirs(CONFIG_DIR, exist_ok=True)
         self.setWindowTitle("Add Module")
         self.form = QFormLayout() # Create a form layout for the dialog
         self.layout = QVBoxLayout()
 
-        self.config_file = config_file
-        self.config: dict[str, list[str]] = load_module_config(self.config_file)
-
         self.new_module = QLineEdit()
         self.new_module.setPlaceholderText("Module Name")
 
@@ -99,9 +95,7 @@ class AddModuleDialog(QDialog):
             attributes.append('Description') # Easier this way imo
 
             new_module[module_name] = attributes # Add the module and its attributes to the dictionary.
-            self.config[module_name] = attributes # Add the module and its attributes to the configuration.
-
-            save_module_config(self.config, self.config_file) # Save the configuration to the file.
+            module_registry.set_module(module_name, attributes) # Save the module, which adds its tab.
 
             self.new_module.clear() # Clear the module name to prevent it showing upon the next module creation.
             return AddModuleDialog.ModuleDetails(module_name, attributes)
@@ -114,6 +108,7 @@ class AddModuleDialog(QDialog):
 
     def open_preset_modules_dialog(self):
         """Opens the Preset Modules dialog, allowing the user to select a predefined module."""
+        from components.Dialogs.preset_modules_dialog import PresetModulesDialog  # Only imported if it's used.
         dialog = PresetModulesDialog()
         dialog.setStyleSheet("background-color: #8aa1f6; color: black;")
         if dialog.exec():
@@ -123,7 +118,7 @@ class AddModuleDialog(QDialog):
 
     def create_preset_module(self, selected_module):
         """ Creates a preset module with predefined attributes based on the selected module name.
-            The module and its attributes are saved to the configuration file.
+            The module and its attributes are saved to `module_registry`, which adds its tab right away.
 
             Args:
                 selected_module (str): The name of the selected preset module.
@@ -131,22 +126,11 @@ class AddModuleDialog(QDialog):
         """
         if selected_module == "Workouts":
             attributes = ["Description", "Type of Workout", "Number of Sets", "Number of Reps", "Weight", "Duration"]
-            self.config["Workouts"] = attributes
-            save_module_config(self.config, self.config_file)
+            module_registry.set_module("Workouts", attributes)
         elif selected_module == "Personal Finance":
             attributes = ["Description", "Cash In", "Cash Out", "Transaction Type", "Transaction Date", "Date"]
-            self.config["Personal Finance"] = attributes
-            save_module_config(self.config, self.config_file)
+            module_registry.set_module("Personal Finance", attributes)
         else:
             attributes = ["Description", "Project", "Due Date", "Priority"]
-            self.config["Programming Project"] = attributes
-            save_module_config(self.config, self.config_file)
-
-        # Tell the user that the app has to be reset to see the new preset module using a message box
-        user_notice = QMessageBox()
-        user_notice.setStyleSheet("background-color: #8aa1f6; color: black;")
-        user_notice.setWindowTitle("Restart Required")
-        user_notice.setText(f"Please restart TaskChampion to see the new preset module: {selected_module}.")
-        user_notice.setStandardButtons(QMessageBox.StandardButton.Ok)
-        user_notice.exec()
+            module_registry.set_module("Programming Project", attributes)
 
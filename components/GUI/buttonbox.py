@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 2/23/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -36,8 +36,5 @@ class ButtonBox(TableCell):
 
     def update_task(self):
         super().update_task()  # Call the parent update task method.
-        if self.active:  # If the cell is active.
-            self.my_button.setEnabled(True)  # Enable the button.
-        else:   # If the cell is not active.
-            self.my_button.setEnabled(False)  # Disable the button.
-        self.update()  # Update the cell.
\ No newline at end of file
+        if self.my_button.isEnabled() != bool(self.active):  # Only touch the button if it changed.
+            self.my_button.setEnabled(bool(self.active))  # Enabled only if there's a task.
\ No newline at end of file
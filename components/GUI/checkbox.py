@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 2/23/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -21,6 +21,14 @@ from components.GUI.tablecell import TableCell
 from typing import Callable, Optional
 from utils.task import Task
 
+def set_completed(task: Task, checked: bool) -> None:
+    """Marks `task` completed or pending and writes it to taskwarrior.
+
+    Shared by `Checkbox` and `TaskTableModel`, the two ways of ticking a task off."""
+    # TODO: There are more statuses than `completed` and `pending`. Do we care?
+    task.set('status', 'completed' if checked else 'pending')  # Set the status of the task.
+    api.update_task(task)  # Update the task status.
+
 class Checkbox(TableCell):
     def __init__(self, row_num: int, get_task: Callable[[], Optional[Task]], on_update : Callable[[bool], None], attribute:str=""):
         self.my_checkbox = QtWidgets.QCheckBox()  # Create a checkbox.
@@ -34,25 +42,18 @@ class Checkbox(TableCell):
 
     def update_task(self):
         super().update_task()  # Call the parent update task method.
-        if self.active:  # If the cell is active.
-            assert self.task  # Assert that the task is not None.
-            self.my_checkbox.setEnabled(True)  # Enable the checkbox.
-            self.my_checkbox.setChecked(self.task.get_status() == 'completed')  # Set the checked state of the checkbox to the status of the task.
-        else:
-            self.my_checkbox.setChecked(False)  # Set the checkbox to be unchecked.
-            self.my_checkbox.setEnabled(False)  # Disable the checkbox.
-        self.update()  # Update the cell.
+        checked = bool(self.active) and self.task.get_status() == 'completed'  # Checked if the task is completed.
+
+        # Showing a task isn't the user checking it, so don't let `check_checkbox` write it back.
+        self.my_checkbox.blockSignals(True)
+        if self.my_checkbox.isChecked() != checked:  # Only touch the checkbox if it changed.
+            self.my_checkbox.setChecked(checked)
+        if self.my_checkbox.isEnabled() != bool(self.active):
+            self.my_checkbox.setEnabled(bool(self.active))  # Enabled only if there's a task.
+        self.my_checkbox.blockSignals(False)
 
     @QtCore.Slot()
     def check_checkbox(self):  # Check the checkbox.
-        # TODO: There are more statuses than `completed` and `pending`. Do we care?
         assert self.task  # Assert that the task is not None.
-
-        if self.my_checkbox.isChecked():  # If the checkbox is checked.
-            self.task.set('status', 'completed')  # Set the status of the task to completed.
-
-        else:  # If the checkbox is not checked.
-            self.task.set('status', 'pending')  # Set the status of the task to pending.
-            
-        api.update_task(self.task)  # Update the task status.
+        set_completed(self.task, self.my_checkbox.isChecked())  # Complete or reopen the task.
         self.on_update(self.my_checkbox.isChecked()) # handle the xp updates
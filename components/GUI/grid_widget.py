@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 2/23/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -15,7 +15,7 @@
  *  Known Faults: None encountered
 """
 
-from typing import Callable
+from typing import Callable, Iterable
 from PySide6 import QtCore, QtWidgets
 from components.GUI.task_row import TaskRow, DEFAULT_COLS
 from components.GUI.xp_bar import XpBar
@@ -23,9 +23,11 @@ from styles.extra_styles import get_style
 from typing import Optional
 from utils.task import Task
 from utils.task_api import api
+from utils.task_change import TaskChange
 from utils.logger import logger
-from utils.config_loader import load_module_config
-from utils.config_paths import MODULES_CONFIG_FILE
+from utils.module_registry import module_registry
+from utils.refresh_scheduler import refresh_scheduler
+from utils.task_search import search_index
 
 
 class GridWidget(QtWidgets.QWidget):
@@ -33,6 +35,7 @@ class GridWidget(QtWidgets.QWidget):
     ROW_HEIGHT=50  # Height of each row in the grid.
     DEFAULT_ROWS=10  # Default number of rows to display.
     DEFAULT_WIDTH=1000 # Default width, scrollable.
+    HIDE_ROWS=20  # Hide the grid while adding more rows than this at once, see `_grow_rows`.
     #            Done,  Description,    id, start,  priority,   project, 
     COL_STRETCH=(0,     4,              0,  1,      0,          2, 
 
@@ -63,8 +66,7 @@ class GridWidget(QtWidgets.QWidget):
                 self.col_stretch.append(self.COL_STRETCH[i+1])
 
         else:
-            mod_info = load_module_config(MODULES_CONFIG_FILE)
-            self.cols: list[str] = [x.lower() for x in mod_info[module_name]]
+            self.cols: list[str] = list(module_registry.columns(module_name))
             self.col_stretch = [0 for _ in self.cols]
             for i in range(len(self.cols)):
                 c = self.cols[i]
@@ -91,28 +93,85 @@ class GridWidget(QtWidgets.QWidget):
         self.refresh_styles = load_styles
         self.fetch_xp_fns = fetch_xp_fns
 
-    def add_task(self) -> None:
-        """Assumes that addTask has already been called in TaskChampionGUI. 
-        .
-        Since that means TaskAPI has the updated list of tasks, 
-        all we need to do is:
+        self.dirty_rows: set[int] = set()  # Rows to update on the next refresh.
+        self.dirty_all = False  # Whether the next refresh updates every row instead.
+        self.query = ""  # The search the rows are filtered by, see `set_filter`.
+        api.subscribe(self.on_task_change)  # Keep the rows up to date with the store.
 
-        1) See if we need to add a new `TaskRow`
-        2) broadcast to all `TaskRow`s to update their current task.
-        """
-        num_tasks = api.num_tasks(self.module_name)  # Increment the number of rows.
+    def detach(self) -> None:
+        """Stops following the store, before the grid is thrown away."""
+        api.unsubscribe(self.on_task_change)
+        refresh_scheduler.cancel(('grid', id(self)))
 
-        if self.grid.rowCount() == num_tasks:  # If the row count of the grid is equal to the number of rows.
-            self.setMinimumHeight(num_tasks * self.ROW_HEIGHT)  # Set the minimum height of the widget to be the number of rows times the row height.
+    def on_task_change(self, change: TaskChange) -> None:
+        """Marks the rows whose task `change` touched, see `TaskChange.dirty_rows`, and schedules a refresh.
 
-            row = TaskRow(num_tasks, self.fetch_xp_fns, self.module_name)  # Create a new task row.
-            row.insert(self.grid, num_tasks) # Row inserts itself into the grid, insertion logic is handled in `TaskRow` obj.
+        Every change until the next event loop turn lands in the same refresh, so a row is updated once."""
+        rows = change.dirty_rows(self.module_name, api.num_tasks(self.module_name))
+
+        if rows is None:  # The whole module changed.
+            self.dirty_all = True
+        elif rows and not self.dirty_all:
+            self.dirty_rows.update(rows)
+        else:  # Nothing new to update.
+            return
+
+        refresh_scheduler.schedule(('grid', id(self)), self.flush_rows)
+
+    def flush_rows(self) -> None:
+        """Updates the rows marked by `on_task_change` since the last refresh."""
+        dirty_all, rows = self.dirty_all, sorted(self.dirty_rows)
+        self.dirty_all, self.dirty_rows = False, set()
+
+        if dirty_all:
+            self.sync_rows()
+        else:
+            self.update_rows(rows)
+
+    def update_rows(self, rows: Iterable[int]) -> None:
+        """Shows the current task in each of `rows`, adding rows first if the module outgrew the grid."""
+        self._grow_rows(api.num_tasks(self.module_name))
+        matches = search_index.search(self.query) if self.query else None  # Only rows showing a match are visible.
+
+        for idx in rows:
+            if idx < len(self.row_arr):  # A removal dirties the position past the end, which may not have a row.
+                row = self.row_arr[idx]
+                row.update_task()  # Cells that changed between active and inactive restyle themselves.
+                row.set_visible(matches is None or (row.task is not None and str(row.task.get_uuid()) in matches))
+
+    def set_filter(self, query: str) -> None:
+        """Only shows the rows whose task matches `query`, see `TaskSearchIndex.search`. An empty query shows every row."""
+        self.query = query
+        self.sync_rows()  # Which rows match only changes with the task they show, so from now on the dirty rows are enough.
+
+    def sync_rows(self) -> None:
+        """Grows the grid to one row per task in the module and updates every row.
+
+        Used when the grid is first built, or the store was replaced before the grid was listening."""
+        self.update_rows(range(max(api.num_tasks(self.module_name), len(self.row_arr))))  # Rows past the last task show nothing.
+
+    def _grow_rows(self, num_tasks: int) -> None:
+        """Adds rows until there is one for each of `num_tasks` tasks. Private."""
+        if len(self.row_arr) >= num_tasks:  # Already enough rows.
+            return
+
+        # Adding widgets to a visible grid relayouts it once per widget, so hide it while many rows go in.
+        # Nothing paints until we return to the event loop, so the grid never actually disappears.
+        # Showing it again costs about as much as a full relayout though, so a few rows just go straight in.
+        hide = self.isVisible() and num_tasks - len(self.row_arr) > self.HIDE_ROWS
+        if hide:
+            self.hide()
+
+        while len(self.row_arr) < num_tasks:  # Add rows until every task has one.
+            idx = len(self.row_arr)
+            row = TaskRow(idx, self.fetch_xp_fns, self.module_name)  # Create a new task row.
+            row.insert(self.grid, idx + 1)  # +1 for the header row.
             self.row_arr.append(row)
-            
-        for row in range(len(self.row_arr)):
-            self.row_arr[row].update_task()
-        
-        self.refresh_styles()
+
+        if hide:
+            self.show()
+
+        self.setMinimumHeight(max(len(self.row_arr), self.DEFAULT_ROWS) * self.ROW_HEIGHT)  # Make room for the rows.
 
 
     def add_header(self):
@@ -139,7 +198,7 @@ class GridWidget(QtWidgets.QWidget):
 
     def fill_grid(self):
 
-        for i in range(self.DEFAULT_ROWS):
+        for i in range(len(self.row_arr), self.DEFAULT_ROWS):  # Rows may already have been added for tasks.
             row = TaskRow(i, self.fetch_xp_fns, self.module_name)
             row.insert(self.grid, i+1)
             self.row_arr.append(row)
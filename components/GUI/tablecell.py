@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Mo Morgan
  *  Date: 2/15/2025
- *  Last Modified: 3/14/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -17,6 +17,7 @@
 from utils.task import Task
 from PySide6 import QtWidgets
 from typing import Callable, Optional
+from styles.extra_styles import repolish
 
 class TableCell(QtWidgets.QLabel):
     """Base class for all table cells."""
@@ -52,6 +53,9 @@ class TableCell(QtWidgets.QLabel):
         Args: None
         """
         self.task = self.get_task()  # Get the task from the get task method.
-        self.active = self.task is not None  # Set the active variable to True if the task is not None.
+        active = self.task is not None  # True if the task is not None.
 
-        self.setProperty('row-active', str(self.active))  # Set the row active property of the cell.
+        if active != self.active:  # Restyling is the expensive part, so only do it when the property changes.
+            self.active = active
+            self.setProperty('row-active', str(self.active))  # Set the row active property of the cell.
+            repolish(self)  # The stylesheet picks the row color from the property.
@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 3/24/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -17,26 +17,33 @@
 
 from PySide6 import QtWidgets
 from components.GUI.task_champion_widget import TaskChampionWidget
+from utils.task_api import api
+from utils.task_loader import TaskLoader
+from styles.extra_styles import get_style_string
+from utils.startup_profiler import startup_profiler
 
 class TaskChampionGUI:
     """The main application class for Task Champion."""  
     def __init__(self): 
         # Initialize the Qt App and TaskWarrior objects  
-        self.qtapp = QtWidgets.QApplication([])  # Create a new Qt Application.
+        with startup_profiler.phase('qapplication'):
+            self.qtapp = QtWidgets.QApplication([])  # Create a new Qt Application.
         
         # Initialize the main Qt Widget 
-        self.main_widget = TaskChampionWidget(self.load_styles)  # Create a new TaskChampionWidget.
-        self.main_widget.setWindowTitle("Task Champion")  # Set the window title.
-        self.main_widget.resize(800, 400) # set basic window size.
-        self.main_widget.show() # show the window
+        with startup_profiler.phase('widgets'):
+            self.main_widget = TaskChampionWidget(self.load_styles)  # Create a new TaskChampionWidget.
+            self.main_widget.setWindowTitle("Task Champion")  # Set the window title.
+            self.main_widget.resize(800, 400) # set basic window size.
+            self.main_widget.show() # show the window
 
-        self.move_window()
+            self.move_window()
 
-        self.style_str = ""  # Initialize the style string.
-        with open ('styles/style.qss', 'r')as f:  # Open the style file.
-            self.style_str = f.read()  # Read the style file.
+        with startup_profiler.phase('styles'):
+            self.style_str = get_style_string()  # Read the style file, once.
 
-        self.load_styles()  # Load the styles.
+            self.load_styles()  # Load the styles.
+
+        self.loader: TaskLoader | None = None  # Set by `load_tasks` if the tasks load in the background.
     
     def move_window(self, x=None, y=None):
         if x is None or y is None:
@@ -59,10 +66,58 @@ class TaskChampionGUI:
         self.qtapp.setStyleSheet(self.style_str)  # Set the style sheet of the Qt Application to be the style string.
 
     def load_tasks(self):
-        self.main_widget.grids[0].fill_grid()  # Fill the grid.
+        with startup_profiler.phase('first_fill'):
+            self.main_widget.grids[0].fill_grid()  # Fill the grid. The rows restyle themselves, see `repolish`.
+            self.main_widget.xp_bars.update_bars()  # Update the XP bars.
+
+            if api.from_snapshot:  # Last run's tasks are already in the store, show them right away.
+                self.main_widget.sync_grids()
+
+        if not api.loaded:  # If the API was registered without loading, stream the tasks in.
+            self.loader = TaskLoader(api.fetch_tasks)  # Create the loader.
+            if api.from_snapshot:  # Collect everything and compare it against the snapshot at the end.
+                self.verified_tasks: list = []
+                self.loader.chunk_loaded.connect(self.verified_tasks.extend)
+                self.loader.finished.connect(self.on_snapshot_verified)
+            else:
+                self.loader.chunk_loaded.connect(self.main_widget.add_loaded_tasks)  # Fill the grids as chunks arrive.
+                self.loader.finished.connect(self.on_tasks_loaded)  # Finish up once everything is in.
+            self.loader.failed.connect(self.on_tasks_failed)  # Keep whatever is in the store and say so.
+            api.begin_load()  # Edits from now on are newer than what the loader reads.
+            self.loader.start()  # Start loading.
+        else:
+            self.main_widget.build_search_index()  # Everything is in already.
+            startup_profiler.mark('tasks_loaded')
+
+    def on_snapshot_verified(self):
+        api.replace_tasks(self.verified_tasks)  # If taskwarrior changed since the snapshot was taken, the grids hear about it.
+        self.verified_tasks = []
+        self.on_tasks_loaded()
+
+    def on_tasks_loaded(self):
+        api.loaded = True  # Every task is in the store now.
+        self.finish_loading()
+
+    def on_tasks_failed(self, message: str):
+        """The tasks couldn't be read. The store keeps what it has, the snapshot or the chunks so far, and isn't saved on exit."""
+        self.verified_tasks = []  # Nothing to check the snapshot against.
+        self.load_error = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Icon.Warning, "Task Champion",
+                                                f"Couldn't load your tasks, the ones shown may be out of date.\n\n{message}",
+                                                parent=self.main_widget)  # Kept, so it isn't garbage collected while shown.
+        self.load_error.setModal(False)  # Don't hold up the event loop, e.g. `--profile-startup`.
+        self.load_error.show()
+        startup_profiler.mark('tasks_failed')
+        self.finish_loading()
+
+    def finish_loading(self):
+        """Everything that waits for the load to end, however it ended."""
+        api.end_load()  # What's stored is all there is to go on now.
         self.main_widget.xp_bars.update_bars()  # Update the XP bars.
-        self.load_styles()  # Load the styles.
+        self.main_widget.build_search_index()  # Nothing is resetting whole modules anymore.
+        startup_profiler.mark('tasks_loaded')
 
     def on_exit(self) -> int:
         """The behavior for exiting the application."""
-        return self.qtapp.exec()  # Execute the Qt Application.
\ No newline at end of file
+        ret = self.qtapp.exec()  # Execute the Qt Application.
+        api.save_snapshot()  # Let the next launch start from where we are now.
+        return ret
\ No newline at end of file
@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 3/26/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -15,20 +15,34 @@
  *  Known Faults: None encountered
 """
 
-from PySide6 import QtWidgets
-from components.Dialogs.add_task_dialog import AddTaskDialog
-from components.Dialogs.add_module_dialog import AddModuleDialog
+from PySide6 import QtCore, QtWidgets
 from components.GUI.grid_widget import GridWidget
+from components.GUI.task_table import TaskTableView
 from components.GUI.xp_controller_widget import XpControllerWidget
-from components.GUI.menubar import MenuBar
 from utils.task_api import api
-from typing import Callable
+from utils.logger import logger
+from typing import Callable, Optional, TYPE_CHECKING
 from styles.extra_styles import get_style
+from utils.task import Task
+from utils.config_loader import load_settings
+from utils.config_paths import SETTINGS_FILE
+from utils.module_registry import module_registry
+from utils.refresh_scheduler import refresh_scheduler
+from utils.task_search import search_index
+from utils.startup_profiler import startup_profiler
+import time
+
+if TYPE_CHECKING:  # The dialogs and the menu bar are only imported once they're used, see `add_task_dialog`.
+    from components.Dialogs.add_task_dialog import AddTaskDialog
+    from components.Dialogs.add_module_dialog import AddModuleDialog
 
 
 class TaskChampionWidget(QtWidgets.QWidget):
     """The main widget for the Task Champion application."""
-    def __init__(self, load_styles : Callable[[], None]):
+    IDLE_CHECK_MS = 60_000  # How often to look for idle tabs, see `tear_down_idle_tabs`.
+
+    def __init__(self, load_styles : Callable[[], None], task_view: Optional[str] = None):
+        """`task_view` overrides the setting of the same name, e.g. so the benchmarks can time both views."""
         super().__init__()  # Call the parent constructor.
         self.setObjectName('MainWidget')  # Set the object name for styling.
         
@@ -47,10 +61,15 @@ class TaskChampionWidget(QtWidgets.QWidget):
         self.add_button = QtWidgets.QPushButton("Add Task")  # Create a push button.
         self.add_mod_button = QtWidgets.QPushButton("Add Module")  # Create a push button for adding a new module.
         self.xp_bars = XpControllerWidget() # Create XP Controller Widget
+        self.search_bar = QtWidgets.QLineEdit()  # Filters the current tab, see `search`.
 
         self.add_button.setMaximumWidth(80)  # Set the maximum width of the push button.
         self.add_button.clicked.connect(self.add_task)  # Connect the clicked signal of the push button to the addTask method.
         self.add_mod_button.setMaximumWidth(100)  # Set the maximum width of the push button for adding a new module.
+        self.search_bar.setObjectName('SearchBar')  # Set the object name for styling.
+        self.search_bar.setPlaceholderText("Search tasks, e.g. groceries project:home priority:h")
+        self.search_bar.setClearButtonEnabled(True)
+        self.search_bar.textChanged.connect(self.search)  # Narrow the tasks with every keystroke.
 
         self.button_layout = QtWidgets.QHBoxLayout() # Create a horizontal layout for the buttons.
 
@@ -59,14 +78,27 @@ class TaskChampionWidget(QtWidgets.QWidget):
         self.button_layout.addWidget(self.add_mod_button)  # Add the push button for adding a new module to the layout.
 
         self.task_layout.addLayout(self.button_layout)  # Add the button layout to the task layout.
+        self.task_layout.addWidget(self.search_bar)  # Add the search bar above the tabs.
         self.task_layout.addWidget(self.main_tab)  # Add the tab widget to the layout.
         self.main_layout.addWidget(self.xp_bars) # Add the xp bar widget to the layout.
 
-        self.grids = [GridWidget(load_styles, self.xp_bars.get_relevant_xp_bars)]  # Create a list of grid widgets. Initially only has the Main grid.
-        self.grids[0].module_name = "Main"
+        settings = load_settings(SETTINGS_FILE)
+        # Which widget shows each module's tasks. Both have the same interface.
+        self.grid_class = GridWidget if (task_view or settings["task_view"]) == "grid" else TaskTableView
+        self.load_styles = load_styles  # Kept for the grids that are built later.
+        self.fetch_xp_fns = self.xp_bars.get_relevant_xp_bars
+
+        # Every module gets a tab right away, but its grid is only built once the tab is opened, see `build_grid`.
+        self.module_names: list[str] = []  # The module shown in each tab.
+        self.pages: list[QtWidgets.QWidget] = []  # The page of each tab, which the grid goes into.
+        self.grids: list[Optional[GridWidget | TaskTableView]] = []  # The grid of each tab, None until it's opened.
+        self.last_opened: list[float] = []  # When each tab was last current, see `tear_down_idle_tabs`.
+
+        api.add_module("Main")  # Make sure Main exists even before any task has loaded.
+        self.add_module_tab("Main")  # Main is the first tab.
+        self.build_grid(0)  # And the one that's open at startup.
         self.add_mod_button.clicked.connect(lambda: self.add_new_module(load_styles)) # Connect the clicked signal of the push button for adding a new module to the addNewModule method.
 
-        self.main_tab.addTab(self.grids[0].scroll_area, "Main")  # Add the first grid widget to the tab widget.
         self.main_tab.setStyleSheet(get_style('example_tab'))  # Set the style of the tab widget.
         self.main_tab.currentChanged.connect(lambda: self.update_current_grid(self.main_tab.currentIndex()))
 
@@ -77,20 +109,52 @@ class TaskChampionWidget(QtWidgets.QWidget):
 
         self.current_grid = 0  # Set the current grid to 0.
 
-        self.add_task_dialog : AddTaskDialog = AddTaskDialog()  # Create an instance of the AddTaskDialog class.
-        self.new_mod_dialog: AddModuleDialog = AddModuleDialog()  # Create an instance of the AddModuleDialog class.
+        # The dialogs are built the first time they're opened, the first frame doesn't need them.
+        self._add_task_dialog: Optional['AddTaskDialog'] = None
+        self._new_mod_dialog: Optional['AddModuleDialog'] = None
 
-        self.menu_bar = None    # declare the window's menu bar
-        self.set_menu_bar()     # set the window's menu bar
+        self.menu_bar = None    # declare the window's menu bar. It isn't attached anywhere yet, so `set_menu_bar` isn't called.
 
         modules_data = self.load_modules()
         self.create_all_grids(modules_data, load_styles, self.xp_bars.get_relevant_xp_bars)
+        module_registry.subscribe(self.on_module_saved)  # Modules added from now on get their tab right away.
+
+        # Tabs that haven't been opened in a while give their widgets back, if the settings ask for it.
+        self.idle_minutes: Optional[float] = settings["tab_idle_minutes"]
+        if self.idle_minutes is not None:
+            self.idle_timer = QtCore.QTimer(self)
+            self.idle_timer.setInterval(self.IDLE_CHECK_MS)
+            self.idle_timer.timeout.connect(self.tear_down_idle_tabs)
+            self.idle_timer.start()
+
+        # Builds the search index a step per idle turn once the tasks are in, see `build_search_index`.
+        self.index_timer = QtCore.QTimer(self)
+        self.index_timer.setInterval(0)
+        self.index_timer.timeout.connect(self._search_index_step)
+
 
+    @property
+    def add_task_dialog(self) -> 'AddTaskDialog':
+        """The add task dialog, imported and built the first time it's needed."""
+        if self._add_task_dialog is None:
+            with startup_profiler.phase('dialogs'):
+                from components.Dialogs.add_task_dialog import AddTaskDialog
+                self._add_task_dialog = AddTaskDialog()  # Create an instance of the AddTaskDialog class.
+        return self._add_task_dialog
+
+    @property
+    def new_mod_dialog(self) -> 'AddModuleDialog':
+        """The add module dialog, imported and built the first time it's needed."""
+        if self._new_mod_dialog is None:
+            with startup_profiler.phase('dialogs'):
+                from components.Dialogs.add_module_dialog import AddModuleDialog
+                self._new_mod_dialog = AddModuleDialog()  # Create an instance of the AddModuleDialog class.
+        return self._new_mod_dialog
 
     def add_task(self) -> None:
         """Add a task to the GUI list and link it to a new task in TaskWarrior."""
-        module_name = self.grids[self.current_grid].module_name # Get the annotations for the task. This will link tasks to their respective modules.
-        new_task_details : AddTaskDialog.TaskDetails | None = self.add_task_dialog.add_task(module_name)  # Get the details of the new task from the add task dialog.
+        module_name = self.module_names[self.current_grid] # Get the annotations for the task. This will link tasks to their respective modules.
+        new_task_details : 'AddTaskDialog.TaskDetails | None' = self.add_task_dialog.add_task(module_name)  # Get the details of the new task from the add task dialog.
         
         if new_task_details is None:  # If the new task details are None.
             return  # Return.
@@ -103,44 +167,156 @@ class TaskChampionWidget(QtWidgets.QWidget):
             recur       = new_task_details.recurrence,
             due         = new_task_details.due,
             module      = module_name
-        )  # Create a new task with the details from the add task dialog.
+        )  # Create a new task with the details from the add task dialog. The grid hears about it from the API.
+
+        refresh_scheduler.schedule('xp_bars', self.xp_bars.update_bars)  # Update the XP bars, with the grid's refresh.
 
-        self.grids[self.current_grid].add_task()  # Add the new task to the current grid.
-        self.xp_bars.update_bars()  # Update the XP bars.
+    def add_loaded_tasks(self, tasks: list[Task]) -> None:
+        """Stores a chunk of tasks from `TaskLoader`."""
+        api.add_loaded_tasks(tasks)  # Store the tasks. Only the grids of the modules in the chunk hear about it.
+
+    def sync_grids(self) -> None:
+        """Shows whatever is in the store on every grid, e.g. after it was replaced wholesale."""
+        for grid in self.grids:
+            if grid is not None:  # Tabs that were never opened read the store when they are.
+                grid.sync_rows()
 
     def set_menu_bar(self):
         """Sets the menu bar for the application."""
+        from components.GUI.menubar import MenuBar  # Only imported if there's a menu bar.
         self.menu_bar = MenuBar()  # Create a new menu bar.
 
     def add_new_module(self, load_styles : Callable[[], None]) -> None:
         """Adds a new module to the GUI."""
-        new_mod_details: AddModuleDialog.ModuleDetails | None = self.new_mod_dialog.add_module()
-        if new_mod_details is None:
-            return # Do nothing if the module name is None.
-        api.add_module(new_mod_details.grid_name)
-        new_grid = GridWidget(load_styles, self.xp_bars.get_relevant_xp_bars, new_mod_details.grid_name)  # Create a new grid widget.
+        # The dialog saves the module to `module_registry`, and `on_module_saved` adds its tab.
+        self.new_mod_dialog.add_module()
+
+    def on_module_saved(self, module_name: str) -> None:
+        """Adds a tab for a new module, or rebuilds the grid of one whose columns changed."""
+        if module_name not in self.module_names:
+            api.add_module(module_name)
+            self.add_module_tab(module_name)  # The grid is built when the tab is opened.
+            return
+
+        idx = self.module_names.index(module_name)
+        if self.grids[idx] is not None:  # Built with the old columns.
+            self._drop_grid(idx)
+            if idx == self.current_grid:
+                self.build_grid(idx)
+
+    def add_module_tab(self, module_name: str) -> None:
+        """Adds an empty tab for `module_name`. Nothing in it is built until it's opened."""
+        page = QtWidgets.QWidget()  # Holds the grid, once there is one.
+        layout = QtWidgets.QVBoxLayout(page)
+        layout.setContentsMargins(0, 0, 0, 0)
 
-        self.main_tab.addTab(new_grid.scroll_area, f"{new_mod_details.grid_name}")  # Add the new grid widget to the tab widget.
-        new_grid.fill_grid()
-        self.grids.append(new_grid)  # Append the new grid widget to the list of grid widgets.
+        self.main_tab.addTab(page, f"{module_name}")  # Add the page to the tab widget.
+        self.module_names.append(module_name)
+        self.pages.append(page)
+        self.grids.append(None)
+        self.last_opened.append(time.monotonic())
+
+    def build_grid(self, idx: int) -> GridWidget | TaskTableView:
+        """Builds the grid of tab `idx`, if it isn't built yet, and shows the module's tasks in it."""
+        grid = self.grids[idx]
+        if grid is not None:  # Already built.
+            return grid
+
+        grid = self.grid_class(self.load_styles, self.fetch_xp_fns, self.module_names[idx])  # Create a new grid widget.
+        self.pages[idx].layout().addWidget(grid.scroll_area)
+        grid.fill_grid()
+        grid.sync_rows()  # New widgets are styled when they're first shown.
+        self.grids[idx] = grid
+        if self.search_bar.text():
+            grid.set_filter(self.search_bar.text())  # Show the same search as the other tabs.
+        return grid
+
+    def build_search_index(self) -> None:
+        """Builds the search index in the background, a few thousand tasks per event loop turn,
+        so even the first keystroke only costs a lookup. Called once every task is loaded."""
+        self.index_timer.start()
+
+    def _search_index_step(self) -> None:
+        if not search_index.build_step():  # Done.
+            self.index_timer.stop()
+
+    def search(self, query: str) -> None:
+        """Filters the current tab down to the tasks matching `query`, see `TaskSearchIndex.search`.
+
+        Other tabs catch up when they're opened, so a keystroke only filters what's on screen."""
+        if not 0 <= self.current_grid < len(self.grids):
+            return
+        grid = self.grids[self.current_grid]
+        if grid is not None and grid.query != query:
+            grid.set_filter(query)
+
+    def tear_down_grid(self, idx: int) -> None:
+        """Throws away the grid of tab `idx`, unless it's the current tab. It's built again when the tab is opened."""
+        grid = self.grids[idx]
+        if grid is None or idx == self.current_grid:  # Nothing to free, or someone's looking at it.
+            return
+
+        usage = self.tab_usage()[idx]
+        self._drop_grid(idx)
+        logger.log_info(f"Tore down the {self.module_names[idx]} tab, freeing {usage['widgets']} widgets "
+                        f"after {usage['idle_seconds'] / 60:.0f} idle minutes.")
+
+    def _drop_grid(self, idx: int) -> None:
+        """Throws away the grid of tab `idx`, leaving its page empty. Private."""
+        grid = self.grids[idx]
+        grid.detach()  # Stop following the store.
+        self.pages[idx].layout().removeWidget(grid.scroll_area)
+        grid.scroll_area.deleteLater()  # Takes the grid and its rows with it.
+        self.grids[idx] = None
+
+    def tear_down_idle_tabs(self) -> None:
+        """Tears down every grid whose tab hasn't been current for `tab_idle_minutes`."""
+        if self.idle_minutes is None:
+            return
+
+        for idx, usage in enumerate(self.tab_usage()):
+            if usage['built'] and usage['idle_seconds'] >= self.idle_minutes * 60:
+                self.tear_down_grid(idx)
+
+    def tab_usage(self) -> list[dict]:
+        """What each tab is holding on to: whether its grid is built, how many rows and widgets that is,
+        and how long it's been since the tab was current. `widgets` is a count, it stands in for the
+        memory a tab holds, Qt doesn't report the size of a widget."""
+        now = time.monotonic()
+        usage = []
+        for idx, grid in enumerate(self.grids):
+            usage.append({
+                'module': self.module_names[idx],
+                'built': grid is not None,
+                'rows': 0 if grid is None else len(grid.row_arr) if isinstance(grid, GridWidget) else grid.model().rowCount(),
+                'widgets': 0 if grid is None else len(grid.scroll_area.findChildren(QtWidgets.QWidget)),
+                'idle_seconds': 0.0 if idx == self.current_grid else now - self.last_opened[idx],
+            })
+        return usage
 
     def update_current_grid(self, idx) -> None:
-        """Updates the current grid to the selected grid."""
+        """Updates the current grid to the selected grid, building it if it's the first time it's opened."""
+        if 0 <= self.current_grid < len(self.last_opened):
+            self.last_opened[self.current_grid] = time.monotonic()  # The tab we're leaving was current until now.
+
+        module_registry.refresh()  # Pick up modules.json edits, before a grid is built from it.
+
         # use qt library to change self.current_grid to the index of the selected tab
         self.current_grid = idx # Set the current grid to the index of the selected tab.
+        if idx >= 0:  # -1 if there are no tabs.
+            self.build_grid(idx)
+            self.search(self.search_bar.text())  # It may have been built before the last search.
+            self.last_opened[idx] = time.monotonic()
 
     def load_modules(self):
-        return self.new_mod_dialog.config
+        return module_registry.modules()
 
     def create_all_grids(self, modules_data, load_styles, fetch_xp_fns):
-        """Creates all the grids for the modules. The grids are created based on the data in the modules_data dictionary
-        which is stored in a config file. All module tabs are created and added to the main tab widget."""
+        """Creates a tab for every module in the modules_data dictionary, which is stored in a config file.
+        The grids themselves are built the first time their tab is opened, see `build_grid`."""
         for module_name, headers in modules_data.items():
             api.add_module(module_name)
-            new_grid = GridWidget(load_styles, fetch_xp_fns, module_name)
-            self.main_tab.addTab(new_grid.scroll_area, f"{module_name}")
-            new_grid.fill_grid()
-            self.grids.append(new_grid)
+            self.add_module_tab(module_name)
 
         return self.grids
 
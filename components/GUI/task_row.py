@@ -6,13 +6,13 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 3/14/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: If attempting to add a task after another task has been deleted
  *  Side effects: None
  *  Invariants: None
- *  Known Faults: RuntimeError: Internal C++ object (Checkbox) already deleted.
+ *  Known Faults: None encountered
 """
 
 from PySide6 import QtWidgets
@@ -23,16 +23,46 @@ from components.GUI.checkbox import Checkbox
 from components.GUI.textbox import Textbox
 from components.GUI.buttonbox import ButtonBox
 from components.GUI.xp_bar import XpBar
-from components.Dialogs.edit_task_dialog import EditTaskDialog
 from typing import Callable, Final
-from utils.config_loader import load_module_config
-from utils.config_paths import MODULES_CONFIG_FILE
+from utils.module_registry import module_registry
 
 # The names of the columns.
 # TODO: in the image Richard posted, the second col was Age instead of 'start', but taskw_ng doesn't have an age.
 # Should we keep it as start? do something else? Idk what start even means.
 DEFAULT_COLS: Final = ( 'description', 'id', 'start', 'priority', 'project', 'recur', 'due', 'until','urgency')
 
+def edit_task(task: Task, module_name: str, delete_task: Callable[[], None]) -> bool:
+    """Opens an `EditTaskDialog` for `task` and saves whatever the user changed.
+
+    Shared by `TaskRow` and `TaskTableView`. Returns whether the task was saved, which it isn't if the
+    dialog was cancelled or the task was deleted from it."""
+    # TODO: I bet we are gonna have to do something slightly awkward related to nonstandard cols here. Get ready for that.
+    from components.Dialogs.edit_task_dialog import EditTaskDialog  # Only imported once a task is edited.
+    edit_task_dialog = EditTaskDialog(
+        delete_task=delete_task,
+        description=str(task.get("description") or ""),
+        due=str(task.get("due") or ""),
+        priority=str(task.get("priority") or ""),
+        project=str(task.get("project") or ""),
+        tags=[str(tag) for tag in task.get("tags") or []],
+        module_name=module_name)  # Create an instance of the EditTaskDialog class.
+
+    if not edit_task_dialog.exec():  # If the dialog was cancelled.
+        return False
+
+    if api.get_by_uuid(str(task.get_uuid())) is None:  # The task was deleted from the dialog.
+        return False
+
+    task.set("description", edit_task_dialog.description or None)  # Set the description of the task.
+    task.set("due", edit_task_dialog.due or None)  # Set the due date of the task.
+
+    task.set("priority", edit_task_dialog.priority or None)  # Set the priority of the task.
+    task.set("project", edit_task_dialog.project or None)  # Set the project of the task.
+    task.set("tags", edit_task_dialog.tags_list or None)  # Set the tags of the task.
+
+    api.update_task(task)  # Update the task.
+    return True
+
 class TaskRow:
     # Minimum size for each column to maintain a consistent width
     COLUMN_WIDTHS: Final[dict[str, int]] = {
@@ -60,15 +90,14 @@ class TaskRow:
         self.xp_add_calls : list[Callable[[int], int]] = [] # list of function calls to call when a task is checked
         self.xp_sub_calls : list[Callable[[int], int]] = [] # list of function calls to call when a task is unchecked
         self.fetch_xp_brs : Callable[[Task], list[XpBar]] = fetch_xp_brs # call to fetch relevant xp functions
+        self.xp_bars : list[XpBar] | None = None  # The bars the calls above were bound from, see `_bind_xp_fns`.
         self.module_name = module_name
         self.col_names: list[str] = []
 
         if module_name == 'Main':
             self.col_names = [x for x in DEFAULT_COLS]
         else:
-
-            mod_info = load_module_config(MODULES_CONFIG_FILE)
-            self.col_names = [x.lower() for x in mod_info[module_name]]
+            self.col_names = module_registry.columns(module_name)  # From memory, not modules.json.
 
 
         self.task = api.task_at(self.idx, module_name)  # Get the task at the index.
@@ -76,6 +105,7 @@ class TaskRow:
         self.cols = [Textbox(row_num, self.get_task, attr) for attr in self.col_names]  # Create a list of textboxes.
 
         self.edit_button = ButtonBox(row_num, self.get_task, "edit", self.edit_task)  # Create an edit button.
+        self.visible = True  # Whether the row is shown, see `set_visible`.
 
         # Initial fetch of function calls
         if self.task is not None:
@@ -131,34 +161,25 @@ class TaskRow:
         if self.task is not None:  # If the task is not None.
             self._bind_xp_fns(self.fetch_xp_brs(self.task))  # Bind the xp functions.
 
+    def set_visible(self, visible: bool) -> None:
+        """Shows or hides every widget of the row, e.g. when it doesn't match the search."""
+        if visible == self.visible:  # Nothing to do.
+            return
+
+        self.visible = visible
+        for widget in [self.check] + self.cols + [self.edit_button]:
+            widget.setVisible(visible)
+
     def edit_task(self):
         if not self.task:  # If the task is None.
             return  # Return.
 
-        # TODO: I bet we are gonna have to do something slightly awkward related to nonstandard cols here. Get ready for that.
-        edit_task_dialog = EditTaskDialog(
-            delete_task=self.delete_task,
-            description=str(self.task.get("description") or ""),
-            due=str(self.task.get("due") or ""),
-            priority=str(self.task.get("priority") or ""),
-            project=str(self.task.get("project") or ""),
-            tags=[str(tag) for tag in self.task.get("tags") or []],
-            module_name=self.module_name)  # Create an instance of the EditTaskDialog class.
-
-        if edit_task_dialog.exec():  # If the dialog is executed.
-            self.task.set("description", edit_task_dialog.description or None)  # Set the description of the task.
-            self.task.set("due", edit_task_dialog.due or None)  # Set the due date of the task.
-            
-            self.task.set("priority", edit_task_dialog.priority or None)  # Set the priority of the task.
-            self.task.set("project", edit_task_dialog.project or None)  # Set the project of the task.
-            self.task.set("tags", edit_task_dialog.tags_list or None)  # Set the tags of the task.
-            
-            api.update_task(self.task)  # Update the task.
-            self.update_task()  # Update the task.
+        edit_task(self.task, self.module_name, self.delete_task)  # The grid updates whichever rows it moved.
 
     def delete_task(self):
-        api.delete_at(self.idx, self.module_name)  # Delete the task at the index.
-        self.remove_task_row()  # remove the task row from the UI
+        if self.task is not None:  # Delete by uuid, the row's index may be stale after a re-sort.
+            api.delete_by_uuid(str(self.task.get_uuid()))  # Delete the task shown in this row.
+        # The grid hears about the deletion and shifts the rows below up, so this row's widgets stay.
 
     def remove_task_row(self):
         # Get the parent grid layout
@@ -190,7 +211,12 @@ class TaskRow:
         grid.addWidget(QtWidgets.QLabel(), grid.row_count(), 0)  # Add a label to the grid.
 
     def _bind_xp_fns(self, xp_bars : list[XpBar]) -> None:
-        # clear the lists and reset them every time.
+        # The controller hands out the same list until the task's attributes or the bars change, so most updates stop here.
+        if xp_bars is self.xp_bars:
+            return
+        self.xp_bars = xp_bars
+
+        # clear the lists and reset them.
         self.xp_add_calls.clear()  # Clear the xp add calls.
         self.xp_sub_calls.clear()  # Clear the xp sub calls.
 
@@ -0,0 +1,336 @@
+""" Prologue
+ *  Module Name: task_table.py
+ *  Purpose: A model/view task table for a module, the lightweight alternative to `GridWidget`.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: The API must be registered, and the module added to it, before a table is created.
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: None
+ *  Invariants: The model never holds tasks itself, every row is read from `api.task_dict[module]` when it's painted.
+ *  Known Faults: None encountered
+"""
+
+from PySide6 import QtCore, QtGui, QtWidgets
+from components.GUI.checkbox import set_completed
+from components.GUI.task_row import DEFAULT_COLS, TaskRow, edit_task
+from components.GUI.xp_bar import XpBar
+from components.GUI.xp_controller_widget import XpControllerWidget
+from typing import Callable, Optional
+from utils.task import Task
+from utils.task_api import api
+from utils.task_change import TaskChange
+from utils.module_registry import module_registry
+from utils.refresh_scheduler import refresh_scheduler
+from utils.task_search import search_index
+
+def module_columns(module_name: str) -> list[str]:
+    """The task attributes shown as columns for `module_name`, same as `TaskRow` uses."""
+    if module_name == 'Main':
+        return list(DEFAULT_COLS)
+
+    return list(module_registry.columns(module_name))
+
+class TaskTableModel(QtCore.QAbstractTableModel):
+    """Table model over one module's tasks.
+
+    Column 0 is the done checkbox, then one column per attribute, then the edit button. Like
+    `GridWidget`, there are always at least `MIN_ROWS` rows, the ones past the last task are inactive.
+    While filtered, see `set_filter`, the rows only show the matching tasks, still in order."""
+    MIN_ROWS = 10  # Same as `GridWidget.DEFAULT_ROWS`.
+
+    # The row colors from style.qss, keyed by (row is even, row is active).
+    ROW_COLORS = {
+        (False, True): QtGui.QColor("#e27285"),
+        (True, True): QtGui.QColor("#fdc9c9"),
+        (False, False): QtGui.QColor("#7864c6"),
+        (True, False): QtGui.QColor("#9c8bdb"),
+    }
+
+    def __init__(self, module_name: str, on_check: Callable[[Task, bool], None]):
+        super().__init__()  # Call the parent constructor.
+        self.module_name = module_name
+        self.cols = module_columns(module_name)  # The attribute shown in each middle column.
+        self.on_check = on_check  # Called with the task and its new state whenever a checkbox is toggled.
+        self.query = ""  # The search the rows are filtered by, see `set_filter`.
+        self.positions: Optional[list[int]] = None  # Where each row's task is in the module, None if not filtered.
+
+        self.row_count = self.rowCount()  # What the view was last told, to tell rows changing from rows being added.
+        self.dirty: Optional[range] = range(0)  # Rows to tell the view about on the next refresh, None for all of them.
+        api.subscribe(self.on_task_change)  # Keep the view up to date with the store.
+
+    @property
+    def edit_column(self) -> int:
+        return len(self.cols) + 1  # After the checkbox and every attribute.
+
+    def task_at(self, row: int) -> Optional[Task]:
+        if self.positions is not None:  # Filtered, go through the matches.
+            if row >= len(self.positions):
+                return None
+            row = self.positions[row]
+        return api.task_at(row, self.module_name)  # None for the inactive rows.
+
+    def set_filter(self, query: str) -> None:
+        """Only shows the tasks matching `query`, see `TaskSearchIndex.search`. An empty query shows every task."""
+        self.query = query
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Tells the view the module changed. Only the visible rows get read again."""
+        self.beginResetModel()
+        self.positions = search_index.positions(self.query, self.module_name) if self.query else None
+        self.row_count = self.rowCount()
+        self.endResetModel()
+
+    def on_task_change(self, change: TaskChange) -> None:
+        """Marks the rows `change` touched, see `TaskChange.dirty_rows`, and schedules a refresh.
+
+        Every change until the next event loop turn is covered by one `dataChanged`."""
+        rows = change.dirty_rows(self.module_name, api.num_tasks(self.module_name))
+        if self.dirty is None:  # Already refreshing everything.
+            return
+        if rows is None:
+            self.dirty = None
+        elif not rows:  # Another module.
+            return
+        elif not self.dirty:
+            self.dirty = rows
+        else:  # One span covering both, the view repaints the visible part of it anyway.
+            self.dirty = range(min(self.dirty.start, rows.start), max(self.dirty.stop, rows.stop))
+
+        refresh_scheduler.schedule(('table', id(self)), self.flush_rows)
+
+    def flush_rows(self) -> None:
+        """Tells the view about the rows marked by `on_task_change` since the last refresh."""
+        rows, self.dirty = self.dirty, range(0)
+        if rows is None or self.positions is not None or self.rowCount() != self.row_count:  # The rows themselves changed, start over.
+            self.refresh()
+        elif rows:
+            last = min(rows.stop, self.row_count) - 1  # A removal dirties the position past the end.
+            self.dataChanged.emit(self.index(rows.start, 0), self.index(last, self.columnCount() - 1))
+
+    def detach(self) -> None:
+        """Stops following the store, once the model is replaced."""
+        api.unsubscribe(self.on_task_change)
+        refresh_scheduler.cancel(('table', id(self)))
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():  # It's a table, nothing has children.
+            return 0
+        shown = api.num_tasks(self.module_name) if self.positions is None else len(self.positions)
+        return max(shown, self.MIN_ROWS)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.cols) + 2  # Plus the checkbox and the edit button.
+
+    def headerData(self, section: int, orientation, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if orientation != QtCore.Qt.Orientation.Horizontal or role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if section == 0:
+            return "Done?"
+        if section == self.edit_column:
+            return ""
+        return self.cols[section - 1]
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        task = self.task_at(index.row())
+        col = index.column()
+
+        if role == QtCore.Qt.ItemDataRole.BackgroundRole:
+            return self.ROW_COLORS[(index.row() % 2 == 1, task is not None)]
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return QtCore.Qt.AlignmentFlag.AlignCenter
+        if task is None:  # Inactive rows are blank.
+            return None
+
+        if col == 0:
+            if role == QtCore.Qt.ItemDataRole.CheckStateRole:
+                return QtCore.Qt.CheckState.Checked if task.get_status() == 'completed' else QtCore.Qt.CheckState.Unchecked
+            return None
+        if col == self.edit_column:
+            return "edit" if role == QtCore.Qt.ItemDataRole.DisplayRole else None
+
+        if role in (QtCore.Qt.ItemDataRole.DisplayRole, QtCore.Qt.ItemDataRole.ToolTipRole):
+            return str(task.get(self.cols[col - 1]) or "")  # Same text a `Textbox` shows.
+        return None
+
+    def setData(self, index: QtCore.QModelIndex, value, role=QtCore.Qt.ItemDataRole.EditRole) -> bool:
+        if role != QtCore.Qt.ItemDataRole.CheckStateRole or index.column() != 0:
+            return False
+
+        task = self.task_at(index.row())
+        if task is None:
+            return False
+
+        checked = QtCore.Qt.CheckState(value) == QtCore.Qt.CheckState.Checked
+        set_completed(task, checked)  # `on_task_change` repaints wherever it ended up.
+
+        self.on_check(task, checked)  # Handle the xp updates.
+        return True
+
+    def flags(self, index: QtCore.QModelIndex):
+        if self.task_at(index.row()) is None:  # Inactive rows can't be interacted with.
+            return QtCore.Qt.ItemFlag.NoItemFlags
+
+        flags = QtCore.Qt.ItemFlag.ItemIsEnabled | QtCore.Qt.ItemFlag.ItemIsSelectable
+        if index.column() == 0:
+            flags |= QtCore.Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+class CheckboxDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints the done checkbox centered in its cell and toggles it on click."""
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        painter.fillRect(option.rect, index.data(QtCore.Qt.ItemDataRole.BackgroundRole))  # The row color.
+
+        state = index.data(QtCore.Qt.ItemDataRole.CheckStateRole)
+        check = QtWidgets.QStyleOptionButton()
+        size = option.widget.style().pixelMetric(QtWidgets.QStyle.PixelMetric.PM_IndicatorWidth)
+        check.rect = QtCore.QRect(option.rect.center().x() - size // 2, option.rect.center().y() - size // 2, size, size)
+        check.state = QtWidgets.QStyle.StateFlag.State_On if state == QtCore.Qt.CheckState.Checked else QtWidgets.QStyle.StateFlag.State_Off
+        if index.flags() & QtCore.Qt.ItemFlag.ItemIsEnabled:
+            check.state |= QtWidgets.QStyle.StateFlag.State_Enabled
+        option.widget.style().drawPrimitive(QtWidgets.QStyle.PrimitiveElement.PE_IndicatorCheckBox, check, painter, option.widget)
+
+    def editorEvent(self, event: QtCore.QEvent, model: QtCore.QAbstractItemModel, option, index: QtCore.QModelIndex) -> bool:
+        if event.type() != QtCore.QEvent.Type.MouseButtonRelease or not index.flags() & QtCore.Qt.ItemFlag.ItemIsUserCheckable:
+            return False
+
+        checked = index.data(QtCore.Qt.ItemDataRole.CheckStateRole) == QtCore.Qt.CheckState.Checked
+        new_state = QtCore.Qt.CheckState.Unchecked if checked else QtCore.Qt.CheckState.Checked
+        return model.setData(index, new_state.value, QtCore.Qt.ItemDataRole.CheckStateRole)  # Toggle it.
+
+class ButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """Paints a push button in its cell and calls `on_click(row)` when it's clicked."""
+    def __init__(self, on_click: Callable[[int], None], parent=None):
+        super().__init__(parent)  # Call the parent constructor.
+        self.on_click = on_click
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        painter.fillRect(option.rect, index.data(QtCore.Qt.ItemDataRole.BackgroundRole))  # The row color.
+
+        button = QtWidgets.QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 4, -4, -4)  # Leave some of the row color around it.
+        button.text = "edit"
+        if index.flags() & QtCore.Qt.ItemFlag.ItemIsEnabled:  # Disabled on inactive rows, like `ButtonBox`.
+            button.state = QtWidgets.QStyle.StateFlag.State_Enabled
+        option.widget.style().drawControl(QtWidgets.QStyle.ControlElement.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event: QtCore.QEvent, model, option, index: QtCore.QModelIndex) -> bool:
+        if event.type() == QtCore.QEvent.Type.MouseButtonRelease and index.flags() & QtCore.Qt.ItemFlag.ItemIsEnabled:
+            self.on_click(index.row())  # Let the view open the dialog.
+            return True
+        return False
+
+class TaskTableView(QtWidgets.QTableView):
+    """Shows a module's tasks with a `TaskTableModel`. A drop-in replacement for `GridWidget`.
+
+    Qt only paints and lays out the rows on screen, so no matter how many tasks there are,
+    there are only ever a screen's worth of rows being drawn and no widgets per row at all."""
+    ROW_HEIGHT = 50  # Same as `GridWidget.ROW_HEIGHT`.
+
+    def __init__(self, load_styles : Callable[[], None], fetch_xp_fns : Callable[[Task], list[XpBar]], module_name="Main"):
+        super().__init__()  # Call the parent constructor.
+        self.setObjectName('TaskTableView')  # Set the object name for styling.
+        self.refresh_styles = load_styles
+        self.fetch_xp_fns = fetch_xp_fns
+        self._module_name = module_name
+
+        self.setModel(TaskTableModel(module_name, self._update_xp_bars))
+        self.setItemDelegateForColumn(0, CheckboxDelegate(self))
+        self.setItemDelegateForColumn(self.model().edit_column, ButtonDelegate(self.edit_task, self))
+
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOn)  # Same as `GridWidget`.
+        self.verticalHeader().hide()
+
+        # Fixed row heights let the view work out which rows are visible without measuring any of them.
+        self.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+
+        header = self.horizontalHeader()
+        header.setObjectName("rowLabels")
+        header.setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(False)
+        self._apply_column_widths()
+
+    @property
+    def module_name(self) -> str:
+        return self._module_name
+
+    @module_name.setter
+    def module_name(self, module_name: str) -> None:
+        """`TaskChampionWidget` sets this after construction for Main, so rebuild the model if it changes."""
+        if module_name == self._module_name:
+            return
+
+        self._module_name = module_name
+        query = self.model().query
+        self.model().detach()  # Only the new model should follow the store.
+        self.setModel(TaskTableModel(module_name, self._update_xp_bars))
+        if query:
+            self.model().set_filter(query)  # Keep showing the same search.
+        self.setItemDelegateForColumn(self.model().edit_column, ButtonDelegate(self.edit_task, self))
+        self._apply_column_widths()
+
+    def detach(self) -> None:
+        """Stops following the store, before the view is thrown away."""
+        self.model().detach()
+
+    @property
+    def query(self) -> str:
+        return self.model().query  # Same as `GridWidget.query`.
+
+    def set_filter(self, query: str) -> None:
+        """Only shows the tasks matching `query`, an empty one shows them all."""
+        self.model().set_filter(query)
+
+    @property
+    def scroll_area(self) -> QtWidgets.QWidget:
+        """What goes in the module's tab. The view scrolls itself."""
+        return self
+
+    def _apply_column_widths(self) -> None:
+        """Sizes the columns like `TaskRow` does. Private."""
+        model = self.model()
+        widths = [TaskRow.COLUMN_WIDTHS['checkbox']]
+        widths += [TaskRow.COLUMN_WIDTHS.get(col, TaskRow.DEFAULT_WIDTH) for col in model.cols]
+        widths.append(TaskRow.COLUMN_WIDTHS['edit'])
+
+        for col, width in enumerate(widths):
+            self.setColumnWidth(col, width)
+        if model.cols:
+            self.horizontalHeader().setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)  # The description.
+
+    def fill_grid(self) -> None:
+        self.model().refresh()  # The model always has at least `MIN_ROWS` rows, so there's nothing to create.
+
+    def sync_rows(self) -> None:
+        """Shows whatever is in the store now, e.g. after the store was replaced before the view was listening."""
+        self.model().refresh()
+
+    def edit_task(self, row: int) -> None:
+        task = self.model().task_at(row)
+        if task is None:  # If the row is inactive.
+            return
+
+        edit_task(task, self.module_name, lambda: api.delete_by_uuid(str(task.get_uuid())))  # The model hears about any change.
+
+    def _update_xp_bars(self, task: Task, checked: bool) -> None:
+        """Same as `TaskRow._update_xp_bars`, but looks the bars up when a box is toggled. Private."""
+        completion_value : int = XpControllerWidget.get_completion_value(task.get_priority(), task.get_project(), task.get_tags())
+
+        for xp_bar in self.fetch_xp_fns(task):
+            if checked:
+                xp_bar.add_xp(completion_value)  # Add the completion value.
+            else:
+                xp_bar.sub_xp(completion_value)  # Subtract the completion value.
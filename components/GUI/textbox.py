@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan
  *  Date: 2/15/2025
- *  Last Modified: 2/23/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -37,9 +37,10 @@ class Textbox(TableCell):  # Create a Textbox class that inherits from TableCell
         if self.active:  # If the cell is active.
             assert self.task  # Assert that the task is not None.
             assert self.attribute  # Assert that the attribute is not None.
-            self.my_text = str(self.task.get(self.attribute) or "")  # Set the text of the label to the attribute of the task.
-            self.my_label.setText(self.my_text)  # Set the text of the label to the text.
+            text = str(self.task.get(self.attribute) or "")  # The attribute of the task.
         else:
-            self.my_text = ""
-            self.my_label.setText("")
-        self.update()  # Update the cell.
+            text = ""
+
+        if text != self.my_text:  # `setText` relayouts the label, so skip it if nothing changed.
+            self.my_text = text
+            self.my_label.setText(self.my_text)  # Set the text of the label to the text.
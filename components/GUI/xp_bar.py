@@ -6,7 +6,7 @@
 * Additional code sources: None
 * Developers: Jacob Wilkus, Mo Morgan
 * Date: 2/25/2025
-* Last Modified: 2/28/2025
+* Last Modified: 10/18/2026
 * Preconditions: None
 * Postconditions: None
 * Error/Exception conditions:
@@ -17,8 +17,12 @@
 
 from PySide6 import QtCore, QtWidgets
 
-from utils.task_api import api
 from utils.task import Task, priority_t
+from typing import TYPE_CHECKING
+import math
+
+if TYPE_CHECKING:
+    from utils.xp_ledger import XpLedger
 
 class XpBar(QtWidgets.QWidget):
     """Wrapper around an XP Bar.
@@ -121,71 +125,50 @@ class XpBar(QtWidgets.QWidget):
         """
         Resets the experience points (XP) of the user.
 
-        This method resets the current XP by subtracting it from the XP bar, sets
-        the XP bar's value to zero, and updates the current XP to zero. It is
-        used to initialize or reset a user's progress.
+        This method empties the XP bar, levels included, and updates the current
+        XP to zero. It is used to initialize or reset a user's progress.
 
         Raises:
             None
         """
-        self.xp_bar._sub_xp(self.cur_xp)  # Subtract the current XP from the XP bar.
-        self.xp_bar.setValue(0)  # Set the value of the XP bar to 0.
+        self.xp_bar._reset_xp()  # Empty the XP bar.
         self.cur_xp = 0  # Set the current XP to 0.
 
-    def update_xp(self) -> None:
+    def update_xp(self, ledger: 'XpLedger') -> None:
         """
-        Updates the experience points (XP) for the current object based on the
-        tasks from the TaskAPI. This includes calculating the maximum possible
-        XP from relevant tasks and the amount of XP gained from completed tasks.
-        Relevance of tasks is determined by comparing their attributes such as
-        priority, project, and tags with the current object's attributes.
-
-        Attributes
-        ----------
-        xp_poss : int
-            Represents the total potential XP that can be gained from all relevant
-            tasks.
-        xp_gain : int
-            Represents the actual XP gained from tasks that are completed.
+        Updates the experience points (XP) for the current object from the running
+        totals in `ledger`, instead of going over every task. A task is relevant if its
+        priority, project or tags are the same as this bar's attributes, and each one
+        is worth this bar's completion value.
 
         Parameters
         ----------
-        None
+        ledger : XpLedger
+            The controller's ledger, see `XpLedger.bar_totals`.
 
         Returns
         -------
         None
         """
-        xp_poss : int = 0  # Set the potential XP to 0.
-        xp_gain : int = 0  # Set the XP gain to 0.
+        totals = ledger.bar_totals(self.attributes.priority, self.attributes.project, self.attributes.tags, self.completion_value)
 
-        # calculate all tasks relevant to set the max_xp value.
-        for i in range(0, api.num_tasks()):  # Loop through the tasks.
-            task : Task = api.task_at(i)  # Get the task at the index.
-
-            if task is None:  # If the task is None.
-                continue  # Continue.
-
-            valid = False  # Set the valid flag to False.
-            valid |= task.get_priority() == self.attributes.priority  # Check if the priority of the task is equal to the priority.
-            valid |= task.get_project() == self.attributes.project  # Check if the project of the task is equal to the project.
-            valid |= task.get_tags() == self.attributes.tags  # Check if the tags of the task are equal to the tags.
-
-            if valid:  # If the task is valid.
-                xp_poss += self.completion_value  # Add the completion value to the potential XP.
-                xp_gain += self.completion_value if task.get_status() == "completed" else 0  # Add the completion value to the XP gain if the task is completed.
-        
-        self.set_max_xp(xp_poss)  # Set the maximum XP to the potential XP.
-        self.add_xp(xp_gain)  # Add the XP gain to the XP.
+        self.set_max_xp(totals.possible)  # Set the maximum XP to the potential XP.
+        self.add_xp(totals.gained)  # Add the XP gain to the XP.
 
 class XpBarChild(QtWidgets.QProgressBar):
     """Class representing an XP Bar. 
 
     internally, even if a 'level' is only 5 xp points,
-    we still put `XpBar.MAX_VAL` steps in the bar so that it supports a smooth animation."""
+    we still put `XpBar.MAX_VAL` steps in the bar so that it supports a smooth animation.
+
+    XP changes only move the target. The bar animates to it once the changes stop coming in for
+    `COALESCE_MSECS`, so a reset and an add, or a bulk completion, are one animation, not one each.
+    Every change restarts the wait, so however long a bulk completion takes, it's one animation at the end."""
     MAX_VAL=50_000   # 50,000
     ANIMATION_DUR_MSECS=2_000  # 2 seconds
     EASING_CURVE=QtCore.QEasingCurve.Type.OutQuad  # OutQuad
+    COALESCE_MSECS=50  # Changes less than this apart share an animation.
+    ANIMATE_HIDDEN=False  # Whether hidden or off-screen bars animate too, instead of jumping to the target.
 
     def __init__(self, parent=None, bar_type="Main"):
         super().__init__(parent)  # Call the parent constructor.
@@ -194,12 +177,19 @@ class XpBarChild(QtWidgets.QProgressBar):
 
         self.max_xp: int = 0  # Set the maximum XP to 0.
         self.multiplier: float = 0.0  # Set the multiplier to 0.0.
-        self.adjusted_value: float = 0.0  # Set the adjusted value to 0.0.
+        self.adjusted_value: float = 0.0  # Set the adjusted value to 0.0, how far into the current level the bar is.
+        self.level: int = 0  # How many levels were filled, see `advance`.
 
         self.animation = QtCore.QPropertyAnimation(self, QtCore.QByteArray(b"value"))  # Create a property animation.
 
         self.animation.setDuration(self.ANIMATION_DUR_MSECS)  # Set the duration of the animation.
         self.animation.setEasingCurve(self.EASING_CURVE)  # Set the easing curve of the animation.
+
+        self.animate_hidden: bool = self.ANIMATE_HIDDEN  # See `ANIMATE_HIDDEN`, per bar.
+        self.animate_timer = QtCore.QTimer(self)  # Runs `_animate` once the changes stop.
+        self.animate_timer.setSingleShot(True)
+        self.animate_timer.setInterval(self.COALESCE_MSECS)
+        self.animate_timer.timeout.connect(self._animate)
         
         self.setRange(0, self.MAX_VAL)  # Set the range of the XP bar.
 
@@ -210,31 +200,66 @@ class XpBarChild(QtWidgets.QProgressBar):
         self.multiplier = self.MAX_VAL / (1 if val == 0 else val)  # Set the multiplier.
 
     
-    def _add_xp(self, val: int) -> None:
-        self.animation.stop()  # Stop the animation.
-        adjusted = val * self.multiplier  # Calculate the adjusted value.
-        
-        self.adjusted_value += adjusted  # Add the adjusted value.
-        
-        while self.adjusted_value >= self.MAX_VAL:  # While the adjusted value is greater than or equal to the maximum value.
-            self.adjusted_value -= 0.1  # Subtract 0.1 from the adjusted value.
-        
-        self.adjusted_value %= self.MAX_VAL  # Set the adjusted value to the adjusted value modulo the maximum value.
-        self.animation.setStartValue(self.value())  # Set the start value of the animation to the current value.
-        self.animation.setEndValue(int(self.adjusted_value))  # Set the end value of the animation to the adjusted value.
-        self.animation.start()  # Start the animation.
+    @classmethod
+    def advance(cls, level: int, value: float, steps: float) -> tuple[int, float]:
+        """
+        Moves a bar at `value` of `MAX_VAL` steps into `level` by `steps`, up or down.
+
+        A level is full at `MAX_VAL` and only rolls over once it's passed, so finishing every
+        task shows a full bar. The bar can't go below empty at level 0. Constant time,
+        however many levels `steps` covers.
 
-    def _sub_xp(self, val : int) -> None:
+        Returns:
+            tuple[int, float]: The new level and how far into it the bar is.
+        """
+        total = level * cls.MAX_VAL + value + steps  # Steps since level 0 was empty.
+        if total <= 0:  # Nothing left.
+            return 0, 0.0
+        level = math.ceil(total / cls.MAX_VAL) - 1  # The level `total` is in, full levels included.
+        return level, total - level * cls.MAX_VAL
+
+    def _move(self, steps: float) -> int:
+        """Moves the bar's target `steps` steps up or down, and returns how many levels that gained."""
+        level = self.level  # The level before the move.
+        self.level, self.adjusted_value = self.advance(self.level, self.adjusted_value, steps)  # Work out where it lands.
+        self._schedule_animation()  # The bar follows once the changes settle.
+        return self.level - level
+
+    def _schedule_animation(self) -> None:
+        """Animates to the target `COALESCE_MSECS` after the last change, see the class docstring."""
+        self.animate_timer.start()  # (Re)starts the wait, so changes still coming in join this animation.
+
+    def is_off_screen(self) -> bool:
+        """Whether none of the bar can be seen right now: it's hidden, clipped away, or its window is minimized."""
+        return not self.isVisible() or self.visibleRegion().isEmpty() or self.window().isMinimized()
+
+    def _animate(self) -> None:
+        """Animates from what's shown to the target, see `_schedule_animation`. Private."""
+        end = int(self.adjusted_value)  # Where the bar should end up.
+        running = self.animation.state() == QtCore.QAbstractAnimation.State.Running
+        if running and self.animation.endValue() == end:  # Already on its way there.
+            return
         self.animation.stop()  # Stop the animation.
-        adjusted = val * self.multiplier  # Calculate the adjusted value.
-        
-        self.adjusted_value -= adjusted  # Subtract the adjusted value.
 
-        while self.adjusted_value <= 0:
-            self.adjusted_value += 0.1  # Add 0.1 to the adjusted value.
-        
-        self.adjusted_value %= self.MAX_VAL  # Set the adjusted value to the adjusted value modulo the maximum value.
+        if not self.animate_hidden and self.is_off_screen():  # Nobody would see it move.
+            self.setValue(end)
+            return
+        if end == self.value():  # Nothing to move.
+            return
         self.animation.setStartValue(self.value())  # Set the start value of the animation to the current value.
-        self.animation.setEndValue(int(self.adjusted_value))  # Set the end value of the animation to the adjusted value.
+        self.animation.setEndValue(end)  # Set the end value of the animation to the adjusted value.
         self.animation.start()  # Start the animation.
-        
\ No newline at end of file
+
+    def _add_xp(self, val: int) -> int:
+        """Adds `val` XP to the bar, and returns how many levels were gained."""
+        return self._move(val * self.multiplier)
+
+    def _sub_xp(self, val : int) -> int:
+        """Takes `val` XP off the bar, and returns how many levels were lost."""
+        return -self._move(-val * self.multiplier)
+
+    def _reset_xp(self) -> None:
+        """Empties the bar and goes back to level 0. The XP added right after is animated to from what's shown now."""
+        self.level = 0  # Back to level 0.
+        self.adjusted_value = 0.0  # Nothing in it.
+        self._schedule_animation()  # Usually `update_bars` adds the XP back before it runs.
@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Jacob Wilkus, Mo Morgan
  *  Date: 2/25/2025
- *  Last Modified: 2/28/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions:
@@ -18,8 +18,15 @@
 from components.GUI.xp_bar import XpBar
 from PySide6 import QtWidgets
 from utils.task import priority_t, Task
-from utils.task_api import api
-from components.Dialogs.define_xp_dialog import XPConfigDialog
+from utils.startup_profiler import startup_profiler
+from utils.config_loader import load_config
+from utils.config_paths import XP_CONFIG_FILE
+from utils.xp_ledger import XpLedger, xp_key
+from utils.xp_router import XpRouter
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:  # Only imported once the dialog is opened, see `popup_xp_config`.
+    from components.Dialogs.define_xp_dialog import XPConfigDialog
 
 
 
@@ -71,6 +78,11 @@ class XpControllerWidget(QtWidgets.QWidget):
 
         return completion_value  # Return the completion value
 
+    @staticmethod
+    def get_multipliers() -> tuple[dict, dict, dict]:
+        """The priority, project and tag multiplier maps `get_completion_value` reads, for `XpLedger`'s vectorized path."""
+        return XpControllerWidget.PRIORITY_MULT_MAP, XpControllerWidget.PROJECT_MULT_MAP, XpControllerWidget.TAG_MULT_MAP
+
     def __init__(self):
         super().__init__()
 
@@ -86,12 +98,14 @@ class XpControllerWidget(QtWidgets.QWidget):
         self.main_xp_bar.set_max_xp(5)  # Set the maximum XP value
         self.main_layout.addWidget(self.main_xp_bar)  # Add the main XP bar to the layout
         self.xp_bars.append(self.main_xp_bar)  # Add the main XP bar to the list of XP bars
+        self.router = XpRouter(self.main_xp_bar)  # Which bars each task counts towards, see `get_relevant_xp_bars`.
 
         self.setLayout(self.main_layout)  # Set the layout of the widget to be the main layout
 
-        self.xp_config_dialog = XPConfigDialog()  # Create an instance of the XPConfigDialog class
-        self.xp_config_dialog.xp_values_updated.connect(self.update_priority_mult_map)  # Connect the xpValuesUpdated signal of the XPConfigDialog to the updatePriorityMultMap method
-        self.update_priority_mult_map(self.xp_config_dialog.config)  # Update the priority multiplier map with the values from the XP configuration dialog
+        self.ledger = XpLedger(self.get_completion_value, self.get_multipliers)  # Running XP totals, so updating the bars doesn't go over every task.
+
+        self.xp_config_dialog: Optional['XPConfigDialog'] = None  # Built the first time it's opened, see `popup_xp_config`.
+        self.update_priority_mult_map(load_config(XP_CONFIG_FILE))  # Update the priority multiplier map with the values the XP configuration dialog would show
         
     def add_xp_bar(self, task : Task, max_xp : int, title : str) -> None:
         """
@@ -121,6 +135,7 @@ class XpControllerWidget(QtWidgets.QWidget):
         new_xp_bar.update_text()  # Update the text
 
         self.xp_bars.append(new_xp_bar)  # Add the XP bar to the list of XP bars
+        self.router.add(new_xp_bar, xp_key(task))  # Route the tasks that match it there.
         self.main_layout.addWidget(new_xp_bar)  # Add the XP bar to the layout
     
     def get_relevant_xp_bars(self, task : Task) -> list[XpBar]:
@@ -139,49 +154,33 @@ class XpControllerWidget(QtWidgets.QWidget):
         list[XpBar]
             A list of experience bars relevant to the task. This includes any matching bars
             based on priority, project, or tags, as well as the main experience bar.
+            Tasks with the same priority, project and tags get the same list, don't modify it.
         """
-        bars_to_return = []  # Initialize the list of bars to return
-
-        for bar in self.xp_bars:  # For each XP bar
-            if bar.attributes is None:  # If the attributes are None
-                continue  # Continue
-            
-            if bar.attributes.priority == task.get_priority():
-                bars_to_return.append(bar)  # Append the bar to the list of bars to return
-            elif bar.attributes.project == task.get_project().deserialize():
-                bars_to_return.append(bar)  # Append the bar to the list of bars to return
-            elif bar.attributes.tags == task.get_tags().deserialize():
-                bars_to_return.append(bar)  # Append the bar to the list of bars to return
-        
-        return bars_to_return + [self.main_xp_bar]  # Return the list of bars to return plus the main XP bar
+        return self.router.route(xp_key(task))  # A few hash lookups, and the same list until a bar is added.
         
     def update_bars(self) -> None:
+        """Sets every bar from the ledger's running totals. Only the stale modules are counted again, see `XpLedger`."""
         for bar in self.xp_bars:  # For each XP bar
             bar.reset_xp()  # Reset the XP value
 
             # update the xp of all bars but the main xp bar
             if bar != self.main_xp_bar:  # If the bar is not the main XP bar
-                bar.update_xp()  # Update the XP value
+                bar.update_xp(self.ledger)  # Update the XP value
 
-        xp_poss : int = 0  # Initialize the possible XP value
-        xp_gain : int = 0  # Initialize the gained XP value
+        totals = self.ledger.total()  # Every stored task, plus the completed tasks outside the loading window.
+        self.main_xp_bar.set_max_xp(totals.possible)  # Set the maximum XP value of the main XP bar
+        self.main_xp_bar.add_xp(totals.gained)  # Add the gained XP value to the main XP bar
 
-        
-        for module in api.task_dict:
-            for i in range(0, api.num_tasks(module)):  # For each task
-                task : Task | None = api.task_at(i, module)  # Get the task at the index
-
-                if task is None:
-                    continue  # Continue
-                
-                completion_value : int = self.get_completion_value(task.get_priority(), task.get_project(), task.get_tags())  # Get the completion value
-                xp_poss += completion_value  # Add the completion value to the possible XP value
-                xp_gain += completion_value if task.get_status() == "completed" else 0  # Add the completion value to the gained XP value if the task is completed
-            
-        self.main_xp_bar.set_max_xp(xp_poss)  # Set the maximum XP value of the main XP bar
-        self.main_xp_bar.add_xp(xp_gain)  # Add the gained XP value to the main XP bar
+    def detach(self) -> None:
+        """Stops the ledger following the store, before the widget is thrown away."""
+        self.ledger.detach()
 
     def popup_xp_config(self):
+        if self.xp_config_dialog is None:  # Build it on first use, it's four tables the first frame doesn't need.
+            with startup_profiler.phase('dialogs'):
+                from components.Dialogs.define_xp_dialog import XPConfigDialog
+                self.xp_config_dialog = XPConfigDialog()  # Create an instance of the XPConfigDialog class
+            self.xp_config_dialog.xp_values_updated.connect(self.update_priority_mult_map)  # Connect the xpValuesUpdated signal of the XPConfigDialog to the updatePriorityMultMap method
         self.xp_config_dialog.exec()  # Execute the XP configuration dialog
         
     def update_priority_mult_map(self, updated_values: dict):
@@ -196,6 +195,7 @@ class XpControllerWidget(QtWidgets.QWidget):
         XpControllerWidget.PRIORITY_MULT_MAP = updated_values['priorities']  # Update the priority multiplier map
         XpControllerWidget.TAG_MULT_MAP = updated_values['tags']  # Update the tag multiplier map
         XpControllerWidget.PROJECT_MULT_MAP_MULT_MAP = updated_values['projects']  # Update the project multiplier map
-        
+
+        self.ledger.rescore()  # Every task may be worth something else now.
         self.update_bars()    # update the XP bars to reflect the new values. This functionality may not be wanted.
                                 # Discuss in PR
\ No newline at end of file
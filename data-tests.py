@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Jacob Wilkus
  *  Date: 2/25/2025
- *  Last Modified: 2/25/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -20,6 +20,42 @@ register_api(FakeTaskAPI) # Order matters.
 
 from utils.task_api import api
 from utils.logger import logger
+from utils.sortmetric import SortMetric
+from utils.completed_archive import CompletedArchive, split_completed
+from utils.task_data_loader import TaskDataLoader, DataLoaderError
+from utils.task import Task
+from utils.task_snapshot import load_snapshot, save_snapshot
+from utils.task_generator import generate_records, write_data_dir
+from utils.task_change import ChangeKind
+from utils.module_registry import module_registry
+from utils.xp_router import XpRouter
+from utils.task_loader import TaskLoader
+from components.GUI.xp_bar import XpBar, XpBarChild
+from utils.refresh_scheduler import refresh_scheduler
+from utils.task_search import search_index
+from utils.startup_profiler import startup_profiler
+from utils.xp_ledger import XpLedger, MAIN
+from styles.extra_styles import parse_styles, get_style, get_style_string, style_blocks
+from utils.config_paths import MODULES_CONFIG_FILE
+from components.GUI.task_table import TaskTableModel
+from components.GUI.task_row import DEFAULT_COLS
+from components.GUI.grid_widget import GridWidget
+from components.GUI.task_champion_widget import TaskChampionWidget
+from PySide6 import QtCore, QtWidgets
+import datetime
+import json
+import math
+import os
+import pytest
+import random
+import sqlite3
+import time
+
+@pytest.fixture
+def qapp():
+    '''An offscreen Qt application, for the tests that build widgets. Once it exists, refreshes wait for `refresh_scheduler.flush()`.'''
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')  # No display needed.
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
 
 class TestClass:
     def test_fake_api_add_task(self):
@@ -69,6 +105,719 @@ class TestClass:
         api.delete_at(task_idx, "Main")  # delete the task at the index
         assert api.num_tasks("Main") == 0  # test if the number of tasks is 0
     
+    def test_fake_api_update_moves_module(self):
+        '''Test that updating a task's module moves it without a full reload'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_new_task("B")  # Add new tasks to the API
+        api.add_new_task("A")
+
+        assert api.task_at(0, "Main").get_description() == "A"  # test if the new task was sorted into place
+
+        task = api.task_at(0, "Main")  # get the task at the index
+        task.set_module("Other")  # move the task to another module
+        api.update_task(task)  # update the task in the API
+
+        assert api.num_tasks("Main") == 1  # test if the task left its old module
+        assert api.num_tasks("Other") == 1  # test if the task arrived in its new module
+        assert api.task_at(0, "Other").get_description() == "A"  # test if the right task was moved
+
+        api.refresh()  # a full refresh shouldn't change anything
+        assert api.num_tasks("Other") == 1  # test if the store is still consistent
+
+    def test_fake_api_uuid_index(self):
+        '''Test looking tasks up, updating and deleting them by uuid and id'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        b = api.add_new_task("B")  # Add new tasks to the API
+        a = api.add_new_task("A")
+
+        assert api.index_of(str(b.get_uuid())) == ("Main", 1)  # test if the index tracks positions
+        assert api.get_by_uuid(str(a.get_uuid())) is a  # test looking a task up by uuid
+        assert api.get_by_id(a.get_id()) is a  # test looking a task up by id
+
+        api.update_by_uuid(str(a.get_uuid()), description="C")  # update the task by uuid
+        assert api.index_of(str(a.get_uuid())) == ("Main", 1)  # test if the task was re-sorted
+        assert api.index_of(str(b.get_uuid())) == ("Main", 0)  # test if the other task's position was updated
+
+        api.delete_by_uuid(str(b.get_uuid()))  # delete the task by uuid
+        assert api.get_by_uuid(str(b.get_uuid())) is None  # test if the task is gone
+        assert api.get_by_id(b.get_id()) is None  # test if its id is gone
+        assert api.index_of(str(a.get_uuid())) == ("Main", 0)  # test if the remaining task moved up
+
+    def test_fake_api_sorted_insertion(self):
+        '''Test that tasks are inserted in sort order, for either sort direction'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        for description in ["b", "D", "a", "c"]:
+            api.add_new_task(description)  # Add new tasks to the API
+
+        descriptions = [str(t.get_description()) for t in api.task_dict["Main"]]
+        assert descriptions == ["a", "b", "c", "D"]  # test if the tasks are sorted, ignoring case
+
+        api.set_sort_metric(SortMetric.DESCRIPTION_DESCENDING)  # flip the sort order
+        api.add_new_task("bb")  # insert a task in the middle
+        descriptions = [str(t.get_description()) for t in api.task_dict["Main"]]
+        assert descriptions == ["D", "c", "bb", "b", "a"]  # test if the new task was bisected into place
+
+        api.set_sort_metric(SortMetric.DESCRIPTION_ASCENDING)  # restore the default sort order
+
+    def test_task_annotation_cache(self):
+        '''Test that the decoded annotations follow every change to the annotations field'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        task = api.add_new_task("Test Description", module="Workouts", nonstandard_cols={"Weight": "10"})
+
+        assert task.get_module() == "Workouts"  # test if the module was set
+        assert task.get_nonstandard_col("Weight") == "10"  # test if the nonstandard column was set
+        assert json.loads(task.get_annotations()) == {"module": "Workouts", "Weight": "10"}  # test the serialized form
+
+        task.set("annotations", json.dumps([{"module": "Other"}]))  # overwrite the raw field
+        assert task.get_module() == "Other"  # test if the cache was invalidated
+        assert task.get_nonstandard_col("Weight") == ""  # test if the old column is gone
+
+        task.denotate()  # remove the annotations entirely
+        assert task.get_module() == "Main"  # test if the task fell back to the default module
+
+    def test_fake_api_batch(self):
+        '''Test that batched mutations are only applied when the batch exits'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        keep = api.add_new_task("Keep")  # Add new tasks to the API
+        drop = api.add_new_task("Drop")
+
+        with api.batch():
+            for description in ["C", "A", "B"]:
+                api.add_new_task(description)  # queue new tasks
+            keep.set("status", "completed")
+            api.update_task(keep)  # queue an update
+            api.delete_by_uuid(str(drop.get_uuid()))  # queue a deletion
+
+            assert api.num_tasks("Main") == 2  # test that nothing was applied yet
+
+        descriptions = [str(t.get_description()) for t in api.task_dict["Main"]]
+        assert descriptions == ["A", "B", "C", "Keep"]  # test if everything was applied and sorted
+        assert api.get_by_uuid(str(keep.get_uuid())).get_status() == "completed"  # test if the update was applied
+        assert api.index_of(str(keep.get_uuid())) == ("Main", 3)  # test if the index was refreshed
+
+        try:
+            with api.batch():
+                api.add_new_task("Discarded")  # queue a task, then fail
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+        assert api.num_tasks("Main") == 4  # test that a failed batch writes nothing
+
+    def test_completed_window(self, tmp_path):
+        '''Completed task window and archive Test'''
+
+        now = datetime.datetime(2025, 3, 31, tzinfo=datetime.timezone.utc)
+        records = [
+            {'uuid': '1', 'end': '20250101T000000Z', 'priority': 'H'},
+            {'uuid': '2', 'end': '20250325T000000Z', 'project': 'P'},
+            {'uuid': '3', 'end': '20250328T000000Z', 'tags': ['a', 'b']},
+            {'uuid': '4', 'end': '20250330T000000Z', 'tags': ['a', 'b']},
+        ]
+
+        kept, archived = split_completed(records, days=30, now=now)
+        assert [x['uuid'] for x in kept] == ['2', '3', '4'] and [x['uuid'] for x in archived] == ['1']  # test the day limit
+
+        kept, archived = split_completed(records, days=30, count=2, now=now)
+        assert [x['uuid'] for x in kept] == ['3', '4']  # test the count limit keeps the newest
+        assert sorted(x['uuid'] for x in archived) == ['1', '2']  # test everything else is archived
+
+        archive = CompletedArchive()
+        archive.add_records(records)
+        archive.cutoff = '20250301T000000Z'
+        assert archive.counts[(None, None, ('a', 'b'))] == 2 and len(archive) == 4  # test if tasks are counted per key
+
+        path = str(tmp_path / 'archive.json')
+        archive.save(path)
+        loaded = CompletedArchive.load(path)
+        assert loaded.counts == archive.counts and loaded.cutoff == archive.cutoff  # test if the archive round trips
+        assert len(CompletedArchive.load(str(tmp_path / 'missing.json'))) == 0  # test a missing archive is empty
+
+    def test_data_loader_ff4(self, tmp_path):
+        '''Direct FF4 data file loader Test'''
+
+        (tmp_path / 'pending.data').write_text(
+            '[description:"Write \\"docs\\"" entry:"1740787200" status:"pending" tags:"a,b" '
+            'uuid:"00000000-0000-0000-0000-000000000001" annotation_1740787200:"{\\"module\\": \\"Work\\"}"]\n'
+            '[description:"Gone" entry:"1740787200" status:"deleted" uuid:"00000000-0000-0000-0000-000000000002"]\n'
+            '[description:"Second" entry:"1740787200" status:"pending" uuid:"00000000-0000-0000-0000-000000000003"]\n'
+        )
+        (tmp_path / 'completed.data').write_text(
+            '[description:"Done" end:"1740873600" entry:"1740787200" status:"completed" uuid:"00000000-0000-0000-0000-000000000004"]\n'
+        )
+
+        records = list(TaskDataLoader(str(tmp_path)).records())
+        assert [x['description'] for x in records] == ['Write "docs"', 'Second', 'Done']  # test if deleted tasks are skipped
+        assert [x['id'] for x in records] == [1, 2, 0]  # test if the deleted line doesn't take an id
+        assert records[0]['tags'] == ['a', 'b'] and records[0]['entry'] == '20250301T000000Z'  # test tags and dates
+
+        task = Task(records[0])
+        assert task.get_module() == 'Work'  # test if our annotation survives the round trip
+
+        with open(tmp_path / 'pending.data', 'a') as f:  # waiting tasks aren't loaded, but still take an id
+            f.write('[description:"Later" entry:"1740787200" status:"waiting" uuid:"00000000-0000-0000-0000-000000000005" wait:"4102444800"]\n'
+                    '[description:"Third" entry:"1740787200" status:"pending" uuid:"00000000-0000-0000-0000-000000000006"]\n')
+        records = list(TaskDataLoader(str(tmp_path)).records())
+        assert [x['id'] for x in records if x['status'] == 'pending'] == [1, 2, 4]  # test if the waiting line is counted
+
+        try:
+            list(TaskDataLoader(str(tmp_path / 'missing')).records())
+            assert False  # test that a directory without data raises
+        except DataLoaderError:
+            pass
+
+    def test_data_loader_sqlite(self, tmp_path):
+        '''Direct SQLite replica loader Test'''
+
+        db = sqlite3.connect(str(tmp_path / 'taskchampion.sqlite3'))
+        db.execute('CREATE TABLE tasks (uuid STRING PRIMARY KEY, data STRING)')
+        db.execute('CREATE TABLE working_set (id INTEGER PRIMARY KEY, uuid STRING)')
+        rows = [
+            ('00000000-0000-0000-0000-000000000001', {'description': 'Done', 'status': 'completed', 'end': '1740873600'}),
+            ('00000000-0000-0000-0000-000000000002', {'description': 'Later', 'status': 'pending', 'tag_x': ''}),
+            ('00000000-0000-0000-0000-000000000003', {'description': 'First', 'status': 'pending', 'annotation_1740787200': 'note'}),
+        ]
+        db.executemany('INSERT INTO tasks VALUES (?, ?)', [(u, json.dumps(d)) for u, d in rows])
+        db.executemany('INSERT INTO working_set VALUES (?, ?)', [(1, rows[2][0]), (2, rows[1][0])])
+        db.commit()
+        db.close()
+
+        records = list(TaskDataLoader(str(tmp_path)).records())
+        assert [x['description'] for x in records] == ['First', 'Later', 'Done']  # test if pending tasks come first, by id
+        assert records[1]['tags'] == ['x']  # test if tag_ attributes become tags
+        assert records[0]['annotations'] == [{'entry': '20250301T000000Z', 'description': 'note'}]  # test annotations
+        assert records[2]['end'] == '20250302T000000Z'  # test if dates are converted
+
+    def test_task_snapshot(self, tmp_path):
+        '''Task snapshot save and restore Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        for description in ["B", "C", "A"]:
+            api.add_new_task(description=description, module="Main")  # Add tasks in any order
+        tasks = list(api.fetch_tasks())
+
+        path = str(tmp_path / 'snapshot.bin')
+        save_snapshot(path, api.take_snapshot(('key',)))
+        assert load_snapshot(path, ('other key',)) is None  # test that a snapshot for other data is ignored
+
+        snapshot = load_snapshot(path, ('key',))
+        api.clear_tasks()
+        api.restore_snapshot(snapshot)
+        assert [str(t.get_description()) for t in api.task_dict["Main"]] == ["A", "B", "C"]  # test if the order survives
+        assert api.get_by_uuid(str(tasks[0].get_uuid())) == tasks[0]  # test if the indices were rebuilt
+        assert api.task_dict["Main"][0].get_module() == "Main"  # test if restored tasks still work
+
+        fresh = load_snapshot(path, ('key',)).task_dict["Main"]  # Copies of the stored tasks
+        for t in fresh:
+            dict.__setitem__(t, 'urgency', 4.2)  # Read only for taskw_ng, export works it out again every time
+        assert not api.replace_tasks(fresh)  # test that identical tasks change nothing, whatever their urgency
+        changes = []
+        api.subscribe(changes.append)
+        fresh[0].set("description", "D")
+        assert api.replace_tasks(fresh)  # test that a changed task replaces the stored one
+        assert [str(t.get_description()) for t in api.task_dict["Main"]] == ["B", "C", "D"]
+        assert [c.kind for c in changes] == [ChangeKind.MOVED]  # test that only that task is sent, not the module
+        assert not api.from_snapshot  # test that the store counts as checked
+
+        api.begin_load()  # The check is read, then the user edits and deletes tasks before it lands
+        stale = load_snapshot(path, ('key',)).task_dict["Main"]
+        api.update_by_uuid(str(stale[1].get_uuid()), description="E")
+        api.delete_by_uuid(str(stale[2].get_uuid()))
+        changes.clear()
+        api.replace_tasks(stale[1:])  # "A" was deleted outside TaskChampion
+        assert [str(t.get_description()) for t in api.task_dict["Main"]] == ["E"]  # test that the edits made meanwhile are kept
+        assert [c.kind for c in changes] == [ChangeKind.REMOVED]
+        api.end_load()
+        api.unsubscribe(changes.append)
+
+    def test_loaded_tasks_after_edits(self):
+        '''Loading tasks while they are edited Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        records = generate_records(20, seed=5, completed_ratio=0, modules=["Main"])
+        edited, deleted = records[0]['uuid'], records[1]['uuid']
+
+        api.begin_load()
+        api.add_loaded_tasks([Task(r) for r in records[:10]])  # The first chunk
+        api.update_by_uuid(edited, description="Edited")
+        api.delete_by_uuid(deleted)
+        api.add_loaded_tasks([Task(records[0]), Task(records[1])] + [Task(r) for r in records[10:]])  # Read before the edits
+        assert api.get_by_uuid(edited)['description'] == "Edited"  # test if a later chunk doesn't revert an edit
+        assert api.get_by_uuid(deleted) is None and api.num_tasks("Main") == 19  # test if it doesn't re-add a deleted task
+
+        api.end_load()
+        api.add_loaded_tasks([Task(records[1])])
+        assert api.get_by_uuid(deleted) is not None  # test if nothing is skipped once the load is over
+
+    def test_task_loader(self):
+        '''Background task loader Test'''
+
+        tasks = [Task(r) for r in generate_records(1_234, seed=6)]
+        chunks, events = [], []
+        loader = TaskLoader(lambda: iter(tasks))
+        loader.chunk_loaded.connect(chunks.append)
+        loader.finished.connect(lambda: events.append(('finished', len(chunks))))
+        loader.failed.connect(lambda message: events.append(('failed', message)))
+        loader.run()  # On this thread, so every signal is delivered right away
+        assert [len(c) for c in chunks] == [50, 500, 500, 184]  # test if the first chunk is small and the rest are full
+        assert [t for c in chunks for t in c] == tasks  # test if every task is sent once, in order
+        assert events == [('finished', 4)]  # test if finished comes after the last chunk
+
+        def broken():
+            yield tasks[0]
+            raise OSError("export failed")
+        chunks, events = [], []
+        loader = TaskLoader(broken)
+        loader.chunk_loaded.connect(chunks.append)
+        loader.finished.connect(lambda: events.append(('finished', len(chunks))))
+        loader.failed.connect(lambda message: events.append(('failed', message)))
+        loader.run()
+        assert len(events) == 1 and events[0][0] == 'failed' and "export failed" in events[0][1]  # test if a failed read is reported
+        assert chunks == []  # test if nothing half read is sent
+
+    def test_lazy_tabs(self, qapp, tmp_path):
+        '''Lazy module tabs and idle tab teardown Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        module_registry.load(str(tmp_path / "modules.json"))
+        for mod in ["Work", "Home"]:
+            module_registry.set_module(mod, list(DEFAULT_COLS))
+        api.add_loaded_tasks([Task(r) for r in generate_records(60, seed=7, modules=["Main", "Work", "Home"])])
+
+        widget = TaskChampionWidget(lambda: None, task_view="grid")
+        assert widget.module_names == ["Main", "Work", "Home"]
+        assert [grid is not None for grid in widget.grids] == [True, False, False]  # test if only the open tab is built
+
+        built = []
+        grid_class = widget.grid_class
+        widget.grid_class = lambda *args: built.append(args[2]) or grid_class(*args)
+        widget.update_current_grid(1)
+        work = widget.grids[1]
+        widget.update_current_grid(0)
+        widget.update_current_grid(1)
+        assert built == ["Work"] and widget.grids[1] is work  # test if opening a tab builds it exactly once
+        assert widget.tab_usage()[1]['rows'] >= 1 and widget.tab_usage()[2]['widgets'] == 0
+
+        widget.tear_down_grid(1)
+        assert widget.grids[1] is work  # test if the current tab is never torn down
+
+        main = widget.grids[0]
+        api.update_by_uuid(str(api.task_at(0, "Main").get_uuid()), description="Changed")  # Main's grid has a refresh pending
+        assert main.on_task_change in api._listeners and ('grid', id(main)) in refresh_scheduler._pending
+        widget.idle_minutes = 0  # Everything that isn't current is idle
+        widget.tear_down_idle_tabs()
+        assert [grid is not None for grid in widget.grids] == [False, True, False]  # test if idle tabs are torn down
+        assert main.on_task_change not in api._listeners  # test if the torn down grid stops following the store
+        assert ('grid', id(main)) not in refresh_scheduler._pending  # test if its pending refresh is dropped
+
+        refresh_scheduler.flush()
+        module_registry.unsubscribe(widget.on_module_saved)
+        widget.grids[1].detach()
+        widget.xp_bars.detach()
+        widget.deleteLater()
+
+    def test_renumber(self):
+        '''Renumbered task ids Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        records = generate_records(4, seed=8, completed_ratio=0, modules=["Main"])
+        api.add_loaded_tasks([Task(r) for r in records])
+        api.set_sort_metric(SortMetric.ID_ASCENDING)
+        api.delete_by_uuid(records[0]['uuid'])  # Taskwarrior moves every later id down by one
+
+        changes = []
+        api.subscribe(changes.append)
+        api._renumber([Task(dict(r, id=r['id'] - 1)) for r in records[1:]])
+        assert [t['id'] for t in api.task_dict["Main"]] == [1, 2, 3]  # test if the stored ids are the new ones
+        assert str(api.get_by_id(1)['uuid']) == records[1]['uuid'] and api.get_by_id(4) is None  # test if the id index follows
+        assert [c.kind for c in changes] == [ChangeKind.CHANGED] * 3  # test if the rows just change, nothing moves
+
+        changes.clear()
+        api._renumber([Task(dict(records[1], id=9))])  # Out of order, say something else was renumbered too
+        assert [t['id'] for t in api.task_dict["Main"]] == [2, 3, 9] and api.get_by_id(9) is not None
+        assert [c.kind for c in changes] == [ChangeKind.RESET]  # test if an out of order module is re-sorted
+        api.unsubscribe(changes.append)
+        api.set_sort_metric(SortMetric.DESCRIPTION_ASCENDING)
+
+    def test_task_generator(self, tmp_path):
+        '''Synthetic task generator Test'''
+
+        records = generate_records(200, seed=1)
+        assert records == generate_records(200, seed=1)  # test if a seed always gives the same tasks
+        assert len({r['uuid'] for r in records}) == 200  # test if every uuid is unique
+        assert {r['status'] for r in records} == {'pending', 'completed'}  # test if both statuses are generated
+
+        write_data_dir(str(tmp_path), records)
+        loaded = list(TaskDataLoader(str(tmp_path)).records())
+        by_uuid = {r['uuid']: r for r in records}
+        for x in loaded:
+            expected = by_uuid[x['uuid']]
+            assert x['description'] == expected['description']  # test if the data files round trip
+            assert x.get('tags') == expected.get('tags') and x['annotations'] == expected['annotations']
+        assert len(loaded) == 200
+
+    def test_task_table_model(self):
+        '''Task table model Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        api.add_loaded_tasks([Task(r) for r in generate_records(25, seed=3, completed_ratio=0, modules=["Main"])])
+
+        toggled = []
+        model = TaskTableModel("Main", lambda task, checked: toggled.append(checked))
+        assert model.rowCount() == 25  # test if there is a row per task
+        assert model.columnCount() == len(model.cols) + 2  # test if there is a checkbox and edit column
+
+        first = api.task_at(0, "Main")
+        assert model.data(model.index(0, 1)) == first["description"]  # test if the rows follow the store
+        assert model.data(model.index(0, 0), QtCore.Qt.ItemDataRole.CheckStateRole) == QtCore.Qt.CheckState.Unchecked
+
+        assert model.setData(model.index(0, 0), QtCore.Qt.CheckState.Checked.value, QtCore.Qt.ItemDataRole.CheckStateRole)
+        assert api.get_by_uuid(str(first.get_uuid())).get_status() == 'completed'  # test if checking completes the task
+        assert toggled == [True]  # test if the xp callback ran
+
+        api.clear_tasks()
+        api.add_module("Main")
+        model.refresh()
+        assert model.rowCount() == TaskTableModel.MIN_ROWS  # test if empty modules still show inactive rows
+        assert model.flags(model.index(0, 0)) == QtCore.Qt.ItemFlag.NoItemFlags  # test if inactive rows can't be used
+        model.detach()
+
+    def test_fake_api_change_notifications(self):
+        '''Fake API change notification Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        api.add_module("Other")
+        changes = []
+        api.subscribe(changes.append)
+
+        b = api.add_new_task(description="b")
+        d = api.add_new_task(description="d")
+        a = api.add_new_task(description="a")  # Sorts before the other two.
+        assert [c.kind for c in changes] == [ChangeKind.ADDED] * 3  # test if adds are reported
+        assert changes[-1].new == ("Main", 0)
+        assert list(changes[-1].dirty_rows("Main", 3)) == [0, 1, 2]  # test if everything after an insert is dirty
+        assert list(changes[-1].dirty_rows("Other", 0)) == []  # test if other modules are left alone
+
+        changes.clear()
+        b.set('priority', 'H')
+        api.update_task(b)  # Same description, so it stays put.
+        assert changes[0].kind == ChangeKind.CHANGED and list(changes[0].dirty_rows("Main", 3)) == [1]
+
+        changes.clear()
+        d.set('description', '0')
+        api.update_task(d)  # Moves from last to first.
+        assert changes[0].kind == ChangeKind.MOVED and (changes[0].old, changes[0].new) == (("Main", 2), ("Main", 0))
+        assert list(changes[0].dirty_rows("Main", 3)) == [0, 1, 2]  # test if only the rows in between are dirty
+
+        changes.clear()
+        api.delete_by_uuid(str(a.get_uuid()))
+        assert len(changes) == 1 and changes[0].kind == ChangeKind.REMOVED  # test if an update isn't reported twice
+        assert list(changes[0].dirty_rows("Main", 2)) == [1, 2]  # test if the emptied last row is dirty
+
+        changes.clear()
+        with api.batch():
+            api.add_new_task(description="x", module="Other")
+            d.set('priority', 'L')
+            api.update_task(d)
+            assert changes == []  # test if nothing is reported until the batch is flushed
+        assert sorted(c.module for c in changes) == ["Main", "Other"]  # test if a batch resets each touched module
+        assert all(c.kind == ChangeKind.RESET and c.dirty_rows(c.module, 1) is None for c in changes)
+
+        api.unsubscribe(changes.append)
+
+    def test_module_registry(self, tmp_path):
+        '''Module registry Test'''
+
+        path = str(tmp_path / "modules.json")
+        module_registry.load(path)  # Doesn't exist yet.
+        assert module_registry.modules() == {}
+
+        saved = []
+        module_registry.subscribe(saved.append)
+        module_registry.set_module("Work", ["Priority", "Description"])
+        assert module_registry.columns("Work") == ["priority", "description"]  # test if columns are lowercased
+        assert json.load(open(path)) == {"Work": ["Priority", "Description"]}  # test if it writes through
+        assert saved == ["Work"] and module_registry.refresh() == []  # test if its own write isn't read back
+
+        with open(path, 'w') as file:  # Someone else edits the file.
+            json.dump({"Work": ["Priority", "Description"], "Home": ["Description", "Due"]}, file)
+        os.utime(path, ns=(0, 0))  # Make sure the mtime changed, whatever the clock resolution.
+        assert module_registry.refresh() == ["Home"]  # test if only new and changed modules are reported
+        assert "Home" in module_registry and saved == ["Work", "Home"]
+
+        module_registry.unsubscribe(saved.append)
+        module_registry.load(MODULES_CONFIG_FILE)  # Back to the real file.
+
+    def test_style_registry(self):
+        '''Parsed stylesheet Test'''
+
+        get_style_string()  # Read the real stylesheet first, so it isn't read over ours.
+        parse_styles("""
+            /* A comment with a brace } in it
+            #Commented { color: red; } */
+            QLabel { color: black; }
+            Bar#Thing, #Other { color: blue; }
+            #Thing { color: green; }
+        """)
+        assert list(style_blocks) == ["QLabel", "Bar#Thing, #Other", "#Thing"]  # test if comments are skipped
+        assert get_style("Thing") == "Bar#Thing, #Other { color: blue; }"  # test if the first rule naming it wins
+        assert get_style("Other") == get_style("Thing") and get_style("Commented") is None
+
+        parse_styles(get_style_string())  # Back to the real stylesheet.
+        assert "border" in get_style("rowLabels")  # test if the real stylesheet parses
+
+    def test_refresh_scheduler(self):
+        '''Refresh scheduler Test'''
+
+        ran = []
+        def refresh():
+            ran.append("grid")
+            refresh_scheduler.schedule('xp_bars', lambda: ran.append("xp_bars"))  # Joins this frame.
+            refresh_scheduler.schedule('xp_bars', lambda: ran.append("xp_bars again"))  # Replaces the one above.
+
+        refresh_scheduler.schedule(('grid', 1), refresh)  # Runs right away without an application.
+        refresh_scheduler.flush()  # And on the next turn with one, e.g. if a widget test ran first.
+        assert ran == ["grid", "xp_bars again"]  # test if a key only runs once, its latest refresh
+
+        frame = refresh_scheduler.frames[-1]
+        assert list(frame.costs) == ["grid", "xp_bars"] and frame.requests == 3  # test if the frame cost is reported
+        assert frame.seconds >= 0 and refresh_scheduler.flush() is None  # test if nothing is left pending
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        model = TaskTableModel("Main", lambda task, checked: None)
+        with api.batch():
+            for i in range(3):
+                api.add_new_task(description=f"task {i}")
+        refresh_scheduler.flush()
+        assert refresh_scheduler.frames[-1].costs.keys() == {"table"}  # test if the model refreshes through it
+        model.detach()
+
+    def test_task_search_index(self):
+        '''Task search index Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        api.add_module("Home")
+        search_index.rebuild()  # `clear_tasks` doesn't notify.
+
+        milk = api.add_new_task(description="Buy milk", tags=["errand"], priority="H", project="Home.Kitchen", module="Home")
+        mail = api.add_new_task(description="Answer mail", priority="H", nonstandard_cols={"Estimate": "2h"})
+        assert search_index.search("") is None  # test if an empty search filters nothing
+        assert search_index.search("m") == {str(milk.get_uuid()), str(mail.get_uuid())}  # test if terms are prefixes
+        assert search_index.search("MI erra") == {str(milk.get_uuid())}  # test if every term has to match
+        assert search_index.search("project:kit priority:h") == {str(milk.get_uuid())}  # test if fields can be named
+        assert search_index.search("estimate:2") == {str(mail.get_uuid())}  # test if nonstandard columns are indexed
+        assert search_index.search("h") == {str(milk.get_uuid())}  # test if the priority only matches when named
+
+        milk.set('description', 'Buy bread')
+        api.update_task(milk)
+        assert search_index.search("milk") == set() and search_index.search("bread")  # test if updates are indexed
+        api.delete_by_uuid(str(mail.get_uuid()))
+        assert search_index.search("mail") == set()  # test if deletes are unindexed
+
+        with api.batch():
+            for i in range(3):
+                api.add_new_task(description=f"milk {i}")
+        assert search_index.positions("milk", "Main") == [0, 1, 2]  # test if a batch is indexed before the next search
+        assert search_index.positions("milk", "Home") == []
+
+        model = TaskTableModel("Main", lambda task, checked: None)
+        model.set_filter("milk 1")
+        assert model.rowCount() == TaskTableModel.MIN_ROWS and model.task_at(0)["description"] == "milk 1"  # test if the table filters
+        assert model.task_at(1) is None
+        model.set_filter("")
+        assert model.task_at(2)["description"] == "milk 2"  # test if clearing the search shows every task
+        model.detach()
+
+    def test_startup_profiler(self, tmp_path, capsys):
+        '''Startup profiler Test'''
+
+        done = []
+        startup_profiler.when_marked(['test_a', 'test_b'], lambda: done.append(True))
+        with startup_profiler.phase('test_outer') as outer:
+            with startup_profiler.phase('test_inner') as inner:
+                startup_profiler.mark('test_a')
+        assert inner.depth == outer.depth + 1 and outer.seconds >= inner.seconds  # test if phases nest
+        assert done == []  # test if the callback waits for every mark
+        startup_profiler.mark('test_b')
+        startup_profiler.mark('test_b')  # Only the first one counts.
+        assert done == [True]
+
+        path = str(tmp_path / "startup.json")
+        startup_profiler.write_report(path)
+        report = json.load(open(path))
+        assert capsys.readouterr().err == ''  # test that a report file keeps the terminal quiet
+        assert [p['phase'] for p in report['phases']][-2:] == ['test_outer', 'test_inner']  # test if the report has the phases
+        assert report['marks']['test_a'] <= report['marks']['test_b'] <= report['total']
+
+        startup_profiler.write_report('-')
+        out = capsys.readouterr()
+        assert json.loads(out.out)['marks'].keys() == report['marks'].keys() and 'test_outer' in out.err  # test stdout gets the JSON and stderr the table
+
+    def test_xp_ledger(self):
+        '''XP ledger Test'''
+
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_module("Main")
+        api.add_module("Home")
+        multipliers = {'H': 3, 'M': 2}
+        ledger = XpLedger(lambda priority, project, tags: multipliers.get(priority, 0.5))
+
+        high = api.add_new_task(description="High", priority="H", project="Chores", tags="gym", module="Home")
+        api.add_new_task(description="Medium", priority="M", project="Chores")
+        assert ledger.total().possible == 5 and ledger.total().gained == 0  # test if new tasks are counted
+        assert ledger.total(('project', 'Chores')).possible == 5 and ledger.total(('tag', 'gym')).possible == 3
+
+        high['status'] = 'completed'
+        api.update_task(high)
+        assert ledger.total().gained == 3 and ledger.total(('module', 'Home')).gained == 3  # test if completing counts
+        high.set_priority("M")
+        high.set_module("Main")
+        api.update_task(high)  # Worth less, and moves to Main.
+        assert ledger.total(('priority', 'H')).possible == 0 and ledger.total(('module', 'Main')).possible == 4
+        assert ledger.bar_totals("M", None, None, 1).possible == 2  # test if bars count the matching tasks
+
+        with api.batch():
+            for i in range(3):
+                api.add_new_task(description=f"batch {i}", priority="H")
+        assert ledger.total().possible == 13 and ledger.verify()  # test if a batch is counted before the next read
+
+        api.delete_by_uuid(str(high.get_uuid()))
+        multipliers['M'] = 10
+        ledger.rescore()
+        assert ledger.total().possible == 19 and ledger.total().gained == 0  # test if deletes and rescoring add up
+        assert ledger.verify()  # test if the running totals match a full recount
+        ledger.detach()
+
+    def test_xp_ledger_vectorized(self):
+        '''Vectorized XP ledger Test'''
+
+        pytest.importorskip("numpy")
+        api.clear_tasks()  # Clear the tasks in the API
+        api.add_loaded_tasks([Task(r) for r in generate_records(2_000, seed=3)])
+        priorities, projects, tags = {'H': 3, 'M': 2, 'L': 1}, {'T': 2}, {'urgent': 2, 'gym': 1.5}
+        score = lambda priority, project, task_tags: (priorities.get(priority, 0.5) * (2 if project and 'T' in project else 1)
+                                                      * (2 if task_tags and 'urgent' in task_tags else 1)
+                                                      * (1.5 if task_tags and 'gym' in task_tags else 1))
+        ledger = XpLedger(score, lambda: (priorities, projects, tags))
+        assert ledger.vectorized  # test if NumPy is used when it's there
+
+        priorities['H'] = 10
+        ledger.rescore()
+        keys = [('main',), ('priority', 'H'), ('project', 'Thesis'), ('tag', 'urgent'), ('module', 'Work')]
+        fast = [ledger.total(key) for key in keys]
+        bar = ledger.bar_totals("H", "Garden", ("gym",), 2)
+        ledger.vectorized = False
+        ledger.rescore()
+        assert all(x.isclose(ledger.total(key)) for x, key in zip(fast, keys))  # test if both paths agree
+        assert bar.isclose(ledger.bar_totals("H", "Garden", ("gym",), 2))
+
+        ledger.vectorized = True
+        t = api.task_at(0, "Main")
+        t['status'] = 'completed' if t.get('status') != 'completed' else 'pending'
+        api.update_task(t)
+        api.delete_at(1, "Home")
+        assert ledger.bar_totals(None, None, None, 1).possible > 0 and ledger.verify()  # test if the columns follow the deltas
+        ledger.detach()
+
+    def test_xp_router(self):
+        '''XP bar routing Test'''
+
+        router = XpRouter('main')
+        router.add('high', ('H', None, None))
+        router.add('thesis', (None, 'Thesis', None))
+        router.add('gym', ('L', None, ('gym',)))
+        route = router.route(('H', 'Thesis', None))
+        assert route == ['high', 'thesis', 'main']  # test if bars come in the order they were added, the main one last
+        assert router.route(('L', None, ('gym',))) == ['high', 'gym', 'main']  # test if a missing project matches bars without one
+        assert router.route(('M', 'Garden', ('gym', 'urgent'))) == ['main']  # test if tags only match the whole set
+        assert router.route(('H', 'Thesis', None)) is route  # test if the same key gets the same list
+
+        router.add('urgent', ('M', None, ('urgent',)))
+        assert router.route(('H', 'Thesis', None)) is not route and len(router) == 4  # test if adding a bar hands out new lists
+
+    def test_xp_bar_advance(self):
+        '''Closed-form XP bar progress Test'''
+
+        M = XpBarChild.MAX_VAL
+        def old_add(value, steps):  # What `_add_xp` did before, 0.1 steps at a time.
+            value += steps
+            while value >= M:
+                value -= 0.1
+            return value % M
+        def old_sub(value, steps):  # What `_sub_xp` did before.
+            value -= steps
+            while value <= 0:
+                value += 0.1
+            return value % M
+
+        rng = random.Random(24)
+        for _ in range(2_000):
+            max_xp = rng.randint(1, 500)
+            steps = rng.randint(0, max_xp) * (M / max_xp)  # `val * multiplier`, as the bars get it.
+            value = rng.uniform(0, M)
+            if value + steps < M:
+                assert XpBarChild.advance(0, value, steps) == (0, old_add(value, steps))  # test if adding within a level is unchanged
+            if value - steps > 0:
+                assert XpBarChild.advance(0, value, -steps) == (0, old_sub(value, steps))  # test if subtracting within a level is unchanged
+            else:
+                assert XpBarChild.advance(0, value, -steps) == (0, 0.0)  # test if the bar stops at empty, like it did
+
+            level, rest = XpBarChild.advance(0, value, steps * 40)
+            assert level == math.ceil((value + steps * 40) / M) - 1 and 0 < rest <= M  # test if every full level is counted
+            assert math.isclose(level * M + rest, value + steps * 40)
+            back = XpBarChild.advance(level, rest, -steps * 40)
+            assert back[0] == 0 and math.isclose(back[1], value, abs_tol=1e-6)  # test if taking it off again goes back
+
+        assert XpBarChild.advance(0, 0.0, M) == (0, M)  # test if finishing every task shows a full bar, not a new empty level
+        assert XpBarChild.advance(0, 0.0, M * 2.5) == (2, M / 2)
+
+    def test_xp_bar_animation(self, qapp):
+        '''Coalesced XP bar animation Test'''
+
+        def settle(bar: XpBar):  # Run the event loop until the bar's wait is over
+            for _ in range(200):
+                qapp.processEvents()
+                if not bar.xp_bar.animate_timer.isActive():
+                    return
+                time.sleep(0.005)
+
+        bar = XpBar(1)
+        bar.set_max_xp(10)  # 5,000 steps per XP
+        bar.show()
+        started = []
+        bar.xp_bar.animation.stateChanged.connect(
+            lambda new, old: started.append(new) if new == QtCore.QAbstractAnimation.State.Running else None)
+        for _ in range(3):  # Like `update_bars` a few times in a row, then a bulk completion
+            bar.reset_xp()
+            bar.add_xp(2)
+        for _ in range(2):
+            bar.add_xp(1)
+        assert started == [] and bar.xp_bar.animate_timer.isActive()  # test if changes wait for the window to end
+        settle(bar)
+        assert len(started) == 1  # test if every change within the window is one animation
+        assert bar.xp_bar.animation.endValue() == 20_000 == int(bar.xp_bar.adjusted_value)  # test if it ends on the target
+        bar.xp_bar.animation.stop()
+
+        hidden = XpBar(1)
+        hidden.set_max_xp(10)
+        assert not hidden.xp_bar.animate_hidden and hidden.xp_bar.is_off_screen()
+        hidden.add_xp(3)
+        settle(hidden)
+        assert hidden.xp_bar.animation.state() != QtCore.QAbstractAnimation.State.Running  # test if a hidden bar doesn't animate
+        assert hidden.xp_bar.value() == 15_000  # test if it jumps straight to the target
+        bar.deleteLater()
+        hidden.deleteLater()
+
     def test_logger(self):
         '''Test the logger'''
 
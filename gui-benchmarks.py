@@ -0,0 +1,278 @@
+""" Prologue
+ *  Module Name: gui-benchmarks.py
+ *  Purpose: Benchmarks for the GUI widgets, run headless on the offscreen Qt platform.
+ *  Inputs: Command line arguments, see `python gui-benchmarks.py --help`.
+ *  Outputs: JSON timings, widget counts and memory use, to stdout or the file passed with `--output`.
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: Writes a modules.json for the benchmarked modules to a temporary directory. The grids log to `logs/`.
+ *  Invariants: The same `--seed` always benchmarks the same tasks and operations.
+ *  Known Faults: RSS is only reported where `/proc/self/statm` exists, i.e. on Linux. Elsewhere it's null.
+"""
+
+import os
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')  # No display needed. Before Qt is imported.
+
+from utils.task_api import register_api, FakeTaskAPI
+register_api(FakeTaskAPI) # Order matters.
+
+from PySide6 import QtCore, QtWidgets
+from utils.task_api import api
+from utils.task import Task
+from utils.task_generator import generate_records, MODULES
+from utils.module_registry import module_registry
+from utils.refresh_scheduler import refresh_scheduler
+from utils.task_search import search_index
+from components.GUI.grid_widget import GridWidget
+from components.GUI.task_row import DEFAULT_COLS
+from components.GUI.xp_controller_widget import XpControllerWidget
+from components.GUI.task_champion_widget import TaskChampionWidget
+from styles.extra_styles import get_style_string
+from typing import Callable, Optional
+import argparse
+import datetime
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+
+VIEWS = ["grid", "table"]  # The `task_view` settings, tab switching is timed with both.
+XP_UPDATES = 10  # How many tasks `update_bars` is timed after completing, one at a time.
+
+def populate(records: list[dict]) -> list[Task]:
+    """Replaces everything in the API with freshly decoded `records`."""
+    api.clear_tasks()  # Clear the tasks in the API
+    for mod in MODULES:
+        api.add_module(mod)  # Make sure every module exists, even an empty one.
+
+    tasks = [Task(r) for r in records]
+    api.add_loaded_tasks(tasks)  # One sort per module.
+    search_index.rebuild()  # `clear_tasks` doesn't notify, so forget the old tasks.
+    return tasks
+
+def rss_bytes() -> Optional[int]:
+    """The resident memory of this process right now, or None if the platform doesn't say."""
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')  # Resident pages.
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def settle() -> None:
+    """Runs what the event loop would before the next frame: deferred deletes, scheduled refreshes, layout and paint."""
+    QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete)  # `processEvents` skips these.
+    QtWidgets.QApplication.processEvents()
+
+class GuiBenchmarks:
+    """Runs every benchmark for one task count and collects the results.
+
+    Every widget is shown in the offscreen window system, so layout and painting are part of the
+    timings, the same as on a screen."""
+    def __init__(self, records: list[dict], ops: int, repeat: int, seed: int):
+        self.records = records  # The synthetic tasks.
+        self.size = len(records)
+        self.ops = min(ops, self.size)  # How many operations the per-operation benchmarks time.
+        self.repeat = repeat  # Each benchmark is run this many times and the fastest run is kept.
+        self.seed = seed
+        self.results: list[dict] = []
+        self.live: list[QtWidgets.QWidget] = []  # Top level widgets the current setup built, see `discard`.
+
+    def time(self, name: str, ops: int, setup: Callable[[], object], run: Callable[[object], None]) -> None:
+        """Times `run(setup())` `repeat` times, only counting `run`, and records the fastest.
+
+        The widget count and RSS are taken right after the last run, before its widgets are thrown away."""
+        times = []
+        widgets = rss = None
+        for _ in range(self.repeat):
+            state = setup()  # Not timed.
+            settle()  # Don't time whatever the setup left for the event loop.
+            start = time.perf_counter()
+            run(state)
+            times.append(time.perf_counter() - start)
+
+            widgets = len(QtWidgets.QApplication.allWidgets())
+            rss = rss_bytes()
+            self.discard()
+
+        best = min(times)
+        self.results.append({
+            'benchmark': name,
+            'size': self.size,
+            'ops': ops,
+            'seconds': best,
+            'us_per_op': best / ops * 1e6 if ops else None,
+            'runs': times,
+            'widgets': widgets,
+            'rss_bytes': rss,
+        })
+        print(f"{self.size:>7} {name:<28} {best:9.4f}s {widgets:>8} widgets", file=sys.stderr)  # Widget counts show here as each run ends, the JSON only comes at the very end.
+
+    def keep(self, widget: QtWidgets.QWidget) -> QtWidgets.QWidget:
+        """Shows `widget` and remembers to throw it away after the run."""
+        widget.resize(1200, 800)
+        widget.show()
+        self.live.append(widget)
+        return widget
+
+    def discard(self) -> None:
+        """Throws away every widget `keep` was given, so the next run starts from nothing."""
+        for widget in self.live:
+            if isinstance(widget, TaskChampionWidget):
+                module_registry.unsubscribe(widget.on_module_saved)
+                grids = [grid for grid in widget.grids if grid is not None]
+            else:
+                grids = [grid for grid in widget.findChildren(GridWidget)]
+            for grid in grids:
+                grid.detach()  # Stop following the store.
+            for xp in [widget] if isinstance(widget, XpControllerWidget) else widget.findChildren(XpControllerWidget):
+                xp.detach()  # So does its ledger.
+            widget.deleteLater()
+        self.live = []
+        settle()
+
+    def run_all(self) -> list[dict]:
+        self.bench_grid()
+        self.bench_xp()
+        self.bench_tabs()
+        return self.results
+
+    def built_grid(self) -> GridWidget:
+        """A shown grid of the Main module, with a row for every task, like `TaskChampionWidget.build_grid` leaves it."""
+        populate(self.records)
+        grid = GridWidget(lambda: None, lambda t: [])
+        self.keep(grid.scroll_area)
+        grid.fill_grid()
+        grid.sync_rows()
+        return grid
+
+    def bench_grid(self) -> None:
+        """`GridWidget` and `TaskRow`, on the Main module."""
+        main_tasks = sum(1 for r in self.records if 'Main' in r['annotations'][0]['description'])
+
+        def empty_grid() -> GridWidget:
+            populate(self.records)
+            grid = GridWidget(lambda: None, lambda t: [])
+            self.keep(grid.scroll_area)
+            return grid
+        def fill(grid: GridWidget):
+            grid.fill_grid()
+            grid.sync_rows()  # `fill_grid` only adds the default rows, this adds the rest, see `build_grid`.
+            settle()
+        self.time('fill_grid', main_tasks, empty_grid, fill)
+
+        new_records = generate_records(self.ops, seed=self.seed + 1, completed_ratio=0.0, modules=['Main'])
+        def add(_):
+            for r in new_records:
+                api.add_task(Task(r))
+                refresh_scheduler.flush()  # The grid's refresh, as it'd run on the next turn.
+                settle()
+        self.time('add_task', len(new_records), self.built_grid, add)
+
+        def picks() -> list:
+            grid = self.built_grid()
+            rng = random.Random(self.seed)
+            return [rng.choice(grid.row_arr) for _ in range(self.ops)]
+        def update(rows: list):
+            for row in rows:
+                row.update_task()
+            settle()
+        self.time('update_task', self.ops, picks, update)
+
+        def remove(grid: GridWidget):
+            for row in grid.row_arr[:self.ops]:
+                row.remove_task_row()
+            settle()
+        self.time('remove_task_row', min(self.ops, max(main_tasks, GridWidget.DEFAULT_ROWS)), self.built_grid, remove)
+
+    def bench_xp(self) -> None:
+        """`XpControllerWidget.update_bars`, after a task was completed each time."""
+        def controller() -> XpControllerWidget:
+            populate(self.records)
+            return self.keep(XpControllerWidget())
+        def update(xp: XpControllerWidget):
+            for i in range(XP_UPDATES):
+                t = api.task_at(i, 'Main')
+                t['status'] = 'completed' if t.get('status') != 'completed' else 'pending'
+                api.update_task(t)  # The ledger hears about it.
+                xp.update_bars()
+            settle()
+        self.time('update_bars', XP_UPDATES, controller, update)
+
+    def bench_tabs(self) -> None:
+        """Switching between the module tabs of the main widget, with each view."""
+        for view in VIEWS:
+            def main_widget() -> TaskChampionWidget:
+                populate(self.records)
+                widget = self.keep(TaskChampionWidget(lambda: None, task_view=view))
+                for mod in MODULES:
+                    if mod not in widget.module_names:
+                        widget.add_module_tab(mod)
+                return widget
+            def open_all(widget: TaskChampionWidget):
+                for idx in range(1, widget.main_tab.count()):  # Main is open already.
+                    widget.main_tab.setCurrentIndex(idx)  # Builds the grid, the first time.
+                    settle()
+            self.time(f'tab_open_{view}', len(MODULES) - 1, main_widget, open_all)
+
+            def opened() -> TaskChampionWidget:
+                widget = main_widget()
+                open_all(widget)
+                return widget
+            def switch(widget: TaskChampionWidget):
+                for i in range(self.ops):
+                    widget.main_tab.setCurrentIndex((widget.main_tab.currentIndex() + 1) % widget.main_tab.count())
+                    settle()
+            self.time(f'tab_switch_{view}', self.ops, opened, switch)
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks the GUI widgets on synthetic tasks, headless.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1_000], help="task counts to benchmark")
+    parser.add_argument('--ops', type=int, default=50, help="operations per add/update/remove/switch benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per benchmark, the fastest is reported")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the generated tasks and operations")
+    parser.add_argument('--output', help="write the JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    app = QtWidgets.QApplication([])
+    app.setStyleSheet(get_style_string())  # Styling is a good part of what widgets cost.
+
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        module_registry.load(os.path.join(workdir, 'modules.json'))  # Leave the user's modules alone.
+        for mod in MODULES[1:]:
+            module_registry.set_module(mod, list(DEFAULT_COLS))
+
+        for size in args.sizes:
+            records = generate_records(size, seed=args.seed)
+            results += GuiBenchmarks(records, args.ops, args.repeat, args.seed).run_all()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'qt_platform': app.platformName(),
+            'seed': args.seed,
+            'ops': args.ops,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+# Program entry point
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
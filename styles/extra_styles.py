@@ -1,12 +1,12 @@
 """ Prologue:
  *  Module Name: extra_styles.py
- *  Purpose: Access extra specific styles for the GUI.
+ *  Purpose: Access extra specific styles for the GUI, and restyle single widgets.
  *  Inputs: None
  *  Outputs: None
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/26/2025
- *  Last Modified: 2/28/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -14,27 +14,58 @@
  *  Invariants: None
  *  Known Faults: None encountered
 """
+import re
+from PySide6 import QtCore, QtWidgets
+
+STYLE_FILE = 'styles/style.qss'
+
 style_string = None  # Start as None to distinguish "not loaded" from "empty file"
+style_blocks: dict[str, str] = {}  # Selector -> its whole rule, e.g. "#rowLabels" -> "#rowLabels {...}".
+id_styles: dict[str, str] = {}  # Object name -> the first rule whose selector names it, for `get_style`.
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)  # QSS comments, which may hold braces of their own.
+_RULE = re.compile(r'([^{}]+)\{([^{}]*)\}')  # One `selector { declarations }` rule. QSS doesn't nest.
+_ID = re.compile(r'#([\w-]+)')  # An object name in a selector.
 
 
 def get_style_string():
     # open style.qss, read it to a global string
-    style_str = ""
-    with open ('styles/style.qss', 'r') as f:  # Open the style file.
-        style_str = f.read()  # Read the style file.
-    return style_str  # Return the style string
+    global style_string
+    if style_string is None:  # Only read it once.
+        with open (STYLE_FILE, 'r') as f:  # Open the style file.
+            style_string = f.read()  # Read the style file.
+        parse_styles(style_string)
+    return style_string  # Return the style string
+
+
+def parse_styles(qss):
+    """Splits a stylesheet into `style_blocks` and `id_styles`, so lookups never scan the text again."""
+    style_blocks.clear()
+    id_styles.clear()
+    for match in _RULE.finditer(_COMMENT.sub('', qss)):
+        selector = ' '.join(match.group(1).split())  # Collapse the indentation and newlines.
+        rule = f"{selector} {{{match.group(2)}}}"
+        style_blocks.setdefault(selector, rule)
+
+        for name in _ID.findall(selector):
+            id_styles.setdefault(name, rule)  # The first rule wins, same as searching the text.
 
 
 def get_style(style_name):
-    global style_string
-    if style_string is None:  # Only load if it's never been loaded
-        style_string = get_style_string()  # Load the style string
-        
-    # find the style in the style string. The style will be named #style_name have contents with curly braces
-    start = style_string.find(f"#{style_name}")  # Find the style name in the style string.
-    if start == -1:  # If the style name is not found.
-        return None
-    
-    end = style_string.find("}", start)  # Find the closing curly brace.
-    # print(f"Found style {style_name} contents: {style_string[start:end]}")
-    return style_string[start:end+1]  # Return the style contents
+    get_style_string()  # Make sure the stylesheet was parsed.
+    return id_styles.get(style_name)  # The rule for #style_name, or None if there isn't one.
+
+
+def repolish(widget: QtWidgets.QWidget):
+    """Restyles just `widget`, e.g. after a property a selector looks at changed.
+
+    Qt only matches property selectors when a widget is polished, so without this the change
+    only shows once the whole application stylesheet is applied again. Widgets that were never
+    polished will be when they're first shown, so they're skipped."""
+    if not widget.testAttribute(QtCore.Qt.WidgetAttribute.WA_WState_Polished):
+        return
+
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+    widget.update()  # Repaint with the new style.
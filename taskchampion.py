@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Jacob Wilkus, Ethan Berkley, Mo Morgan, Richard Moser, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 2/23/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -14,16 +14,53 @@
  *  Invariants: None
  *  Known Faults: None encountered
 """
-from utils.task_api import TaskAPIImpl, register_api
-register_api(TaskAPIImpl) # Order matters.
-
+from utils.startup_profiler import startup_profiler  # First, so everything below is timed.
+import argparse
+import os
 import sys
-from utils.logger import logger
-from components.GUI.task_champion_gui import TaskChampionGUI  # Import the GUI class
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="TaskChampion, a gamified taskwarrior GUI.")
+    parser.add_argument('--profile-startup', nargs='?', const='-', metavar='REPORT',
+                        help="time each startup phase, write a JSON report to REPORT (stdout if omitted) and quit "
+                             "once the window has painted and every task is loaded")
+    parser.add_argument('--cprofile', metavar='FILE', help="with --profile-startup, also dump cProfile stats to FILE")
+    parser.add_argument('--headless', action='store_true', help="use Qt's offscreen platform, nothing is shown")
+    return parser.parse_known_args(argv)[0]  # Leave anything else to Qt.
+
+args = parse_args(sys.argv[1:])
+if args.headless:
+    os.environ['QT_QPA_PLATFORM'] = 'offscreen'  # Must be set before the QApplication exists.
+if args.profile_startup and args.cprofile:
+    startup_profiler.enable_cprofile()
+
+with startup_profiler.phase('settings'):
+    from utils.config_loader import load_settings
+    from utils.config_paths import SETTINGS_FILE, COMPLETED_ARCHIVE_FILE, TASK_SNAPSHOT_FILE
+    settings = load_settings(SETTINGS_FILE)  # Load the user's settings.
+
+with startup_profiler.phase('api'):
+    from utils.task_api import TaskAPIImpl, register_api
+    register_api(TaskAPIImpl, load_tasks=False, # Order matters. The GUI loads the tasks in the background.
+                 completed_days=settings["completed_days"], completed_count=settings["completed_count"],
+                 archive_file=COMPLETED_ARCHIVE_FILE, loader=settings["loader"], snapshot_file=TASK_SNAPSHOT_FILE)
+
+with startup_profiler.phase('imports'):
+    from utils.logger import logger
+    from components.GUI.task_champion_gui import TaskChampionGUI  # Import the GUI class
+
+def finish_profile(app: 'TaskChampionGUI') -> None:
+    """Writes the startup report and quits. Called once the window painted and every task is loaded."""
+    startup_profiler.write_report(args.profile_startup, args.cprofile)
+    app.qtapp.quit()
 
 # Program entry point
 if __name__ == "__main__":
     app = TaskChampionGUI()  # Create a new TaskChampionGUI object.
+    if args.profile_startup:
+        startup_profiler.watch_first_paint(app.main_widget)
     app.load_tasks()  # Load the tasks.
+    if args.profile_startup:
+        startup_profiler.when_marked(['first_paint', 'tasks_loaded'], lambda: finish_profile(app))
     sys.exit(app.on_exit())  # Exit the application.
     logger.exit()  # Exit the logger.
@@ -0,0 +1,118 @@
+""" Prologue
+ *  Module Name: completed_archive.py
+ *  Purpose: Keeps a running XP summary of completed tasks that fall outside the loading window.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: A missing or corrupt archive file is treated as an empty archive.
+ *  Side effects: `CompletedArchive.save` writes the archive file.
+ *  Invariants: `counts` only ever holds completed tasks with an `end` before `cutoff`,
+ *              plus whatever `add_records` was handed on top for the current load.
+ *  Known Faults: Tasks that are reopened or deleted after being archived stay counted until the archive file is deleted.
+"""
+
+import datetime
+import json
+import os
+from typing import Iterable
+
+TIMESTAMP_FORMAT = '%Y%m%dT%H%M%SZ'  # How taskwarrior exports dates.
+
+# (priority, project, tags) of an archived task. That's everything XP is computed from.
+ArchiveKey = tuple[str | None, str | None, tuple[str, ...] | None]
+
+def archive_key(record: dict) -> ArchiveKey:
+    """The `ArchiveKey` of a raw taskwarrior record, as exported."""
+    tags = record.get('tags')
+    return (record.get('priority'), record.get('project'), tuple(tags) if tags else None)
+
+def window_cutoff(days: int | None, now: datetime.datetime | None = None) -> str | None:
+    """The `end` timestamp a completed task has to be at or after to stay in a `days` long window.
+
+    Returns None when there's no day limit."""
+    if days is None:
+        return None
+
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    return (now - datetime.timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+
+def shift_timestamp(timestamp: str, seconds: int) -> str:
+    """Moves a taskwarrior timestamp by `seconds`.
+
+    Taskwarrior dates only go down to the second, so this turns its strict `.after:`
+    into an "at or after" by shifting the date back a second."""
+    dt = datetime.datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+    return (dt + datetime.timedelta(seconds=seconds)).strftime(TIMESTAMP_FORMAT)
+
+def split_completed(records: list[dict], days: int | None = None, count: int | None = None,
+                    now: datetime.datetime | None = None) -> tuple[list[dict], list[dict]]:
+    """Splits raw completed task records into the ones inside the window and the ones outside it.
+
+    A record is kept if it ended within the last `days` days and is one of the `count` most
+    recently ended. Either limit can be None. Returns `(kept, archived)`."""
+    cutoff = window_cutoff(days, now)
+
+    kept: list[dict] = []
+    archived: list[dict] = []
+    for x in records:
+        if cutoff is not None and x.get('end', '') < cutoff:  # The timestamps sort as strings.
+            archived.append(x)
+        else:
+            kept.append(x)
+
+    if count is not None and len(kept) > count:
+        kept.sort(key=lambda x: x.get('end', ''))  # Oldest first.
+        archived += kept[:len(kept) - count]  # Everything but the newest `count`.
+        kept = kept[len(kept) - count:]
+
+    return kept, archived
+
+class CompletedArchive:
+    """How many archived completed tasks there are per `ArchiveKey`.
+
+    XP only depends on a task's priority, project and tags, so this is all the XP code needs to
+    count archived tasks without having them in the store."""
+    def __init__(self):
+        self.counts: dict[ArchiveKey, int] = {}  # How many archived tasks share each key.
+        self.cutoff: str | None = None  # Every completed task that ended before this is counted.
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())  # The number of archived tasks.
+
+    def add_records(self, records: Iterable[dict]) -> None:
+        """Counts each raw taskwarrior record."""
+        for x in records:
+            key = archive_key(x)
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def clear(self) -> None:
+        self.counts.clear()  # Forget every count.
+        self.cutoff = None
+
+    @staticmethod
+    def load(path: str) -> 'CompletedArchive':
+        """Reads an archive written by `save`, or returns an empty one if there isn't a usable one."""
+        archive = CompletedArchive()
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+            archive.cutoff = data['cutoff']
+            for priority, project, tags, n in data['counts']:
+                archive.counts[(priority, project, tuple(tags) if tags else None)] = n
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            archive.clear()  # Start over, `TaskAPIImpl` rebuilds it from taskwarrior.
+
+        return archive
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            json.dump({
+                'cutoff': self.cutoff,
+                'counts': [[p, proj, list(tags) if tags else None, n] for (p, proj, tags), n in self.counts.items()],
+            }, file, indent=2)
@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Jacob Wilkus, Ethan Berkley, Mo Morgan
  *  Date: 3/12/2025
- *  Last Modified: 4/12/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: FileNotFoundError: if the configuration file does not exist, json.JSONDecodeError:
@@ -22,6 +22,15 @@ import os
 # Used by XPConfigDialog
 XP_CONFIG="config/user_defined_xp.json"
 
+# Every setting and its default, see `load_settings`.
+DEFAULT_SETTINGS = {
+    "completed_days": None,  # Only load completed tasks that ended in the last N days. None for no limit.
+    "completed_count": None,  # Only load the N most recently completed tasks. None for no limit.
+    "loader": "taskwarrior",  # "taskwarrior" reads tasks with `task export`, "files" reads taskwarrior's data files directly.
+    "task_view": "table",  # "table" shows modules with `TaskTableView`, "grid" with the widget per cell `GridWidget`.
+    "tab_idle_minutes": None,  # Tear down a module tab that hasn't been opened for N minutes. None to keep every tab.
+}
+
 def load_config(config_file):
     """
     Loads configuration data from a file into a dictionary attribute.
@@ -58,4 +67,15 @@ def load_module_config(config_file):
 
 def save_module_config(config, config_file):
     with open(config_file, 'w') as file:
-        json.dump(config, file, indent=2)
\ No newline at end of file
+        json.dump(config, file, indent=2)
+
+def load_settings(config_file):
+    """Loads the application settings, falling back to `DEFAULT_SETTINGS` for anything that isn't set."""
+    settings = dict(DEFAULT_SETTINGS)  # Start from the defaults.
+    try:
+        with open(config_file, 'r') as file:
+            settings.update(json.load(file))  # Override them with whatever the user set.
+    except (FileNotFoundError, json.JSONDecodeError):
+        pass  # Just use the defaults.
+
+    return settings
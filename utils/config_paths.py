@@ -3,5 +3,8 @@ import os
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), '..', 'components', 'config')
 MODULES_CONFIG_FILE = os.path.join(CONFIG_DIR, 'modules.json')
 XP_CONFIG_FILE = os.path.join(CONFIG_DIR, 'user_defined_xp.json')
+SETTINGS_FILE = os.path.join(CONFIG_DIR, 'settings.json')
+COMPLETED_ARCHIVE_FILE = os.path.join(CONFIG_DIR, 'completed_archive.json')
+TASK_SNAPSHOT_FILE = os.path.join(CONFIG_DIR, 'task_snapshot.bin')
 
 os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -0,0 +1,110 @@
+""" Prologue
+ *  Module Name: module_registry.py
+ *  Purpose: Keeps the module column schemas from modules.json in memory.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Jacob Wilkus, Ethan Berkley, Mo Morgan
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: A missing or corrupt modules.json reads as no modules, same as `load_module_config`.
+ *  Side effects: `set_module` writes modules.json.
+ *  Invariants: Lookups never touch the disk, only `load` and `refresh` read the file.
+ *  Known Faults: Modules removed from the file by hand keep their tab until the next launch.
+"""
+
+import os
+from typing import Callable, Optional
+from utils.singleton import singleton
+from utils.config_loader import load_module_config, save_module_config
+from utils.config_paths import MODULES_CONFIG_FILE
+
+@singleton
+class ModuleRegistry:
+    """Every module's columns, read from modules.json once and then served from memory.
+
+    Anything that adds or changes a module goes through `set_module`, which writes the file and
+    tells the listeners. Edits made to the file some other way are picked up by `refresh`."""
+    def __init__(self, config_file: str):
+        self._modules: dict[str, list[str]] = {}  # Module name -> its attributes, as written in the file.
+        self._columns: dict[str, list[str]] = {}  # Module name -> its columns, the attributes lowercased.
+        self._listeners: list[Callable[[str], None]] = []  # Called with the name of every added or changed module.
+        self.load(config_file)
+
+    def load(self, config_file: str) -> None:
+        """Reads `config_file` and serves it from now on. Listeners aren't told, it's a fresh start."""
+        self.config_file = config_file
+        self._stamp = self._file_stamp()  # Taken before reading, so a write in between is caught next time.
+        self._set_modules(load_module_config(self.config_file))
+
+    def _file_stamp(self) -> Optional[tuple[int, int]]:
+        """The mtime and size of the file, or None if it doesn't exist. Private."""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _set_modules(self, modules: dict[str, list[str]]) -> None:
+        """Replaces the cached schemas. Private."""
+        self._modules = modules
+        self._columns = {name: [x.lower() for x in attributes] for name, attributes in modules.items()}
+
+    def refresh(self) -> list[str]:
+        """Re-reads the file if it changed since it was last read or written, and tells the listeners.
+
+        One `os.stat`, so it's cheap enough to call whenever the GUI is about to show a module.
+        Returns the names of the modules that were added or changed."""
+        stamp = self._file_stamp()
+        if stamp == self._stamp:  # Nothing changed.
+            return []
+
+        self._stamp = stamp
+        old = self._modules
+        self._set_modules(load_module_config(self.config_file))
+
+        changed = [name for name, attributes in self._modules.items() if old.get(name) != attributes]
+        for name in changed:
+            self._notify(name)
+        return changed
+
+    def modules(self) -> dict[str, list[str]]:
+        """Every module and its attributes, in the order they were added. Don't modify it, use `set_module`."""
+        return self._modules
+
+    def columns(self, module_name: str) -> list[str]:
+        """The columns of `module_name`, lowercased like the task attributes they show.
+
+        Raises:
+            KeyError: If there's no such module."""
+        return self._columns[module_name]
+
+    def __contains__(self, module_name: str) -> bool:
+        return module_name in self._modules
+
+    def set_module(self, module_name: str, attributes: list[str]) -> None:
+        """Adds `module_name`, or replaces its attributes, writes the file and tells the listeners."""
+        modules = dict(self._modules)  # Don't change the dict anyone may be holding on to.
+        modules[module_name] = list(attributes)
+        save_module_config(modules, self.config_file)
+
+        self._set_modules(modules)
+        self._stamp = self._file_stamp()  # We wrote it, so `refresh` doesn't need to read it again.
+        self._notify(module_name)
+
+    def subscribe(self, listener: Callable[[str], None]) -> None:
+        """Calls `listener` with the name of every module that's added or changed from now on."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, module_name: str) -> None:
+        """Tells every listener about `module_name`. Private."""
+        for listener in list(self._listeners):
+            listener(module_name)
+
+module_registry = ModuleRegistry(MODULES_CONFIG_FILE)
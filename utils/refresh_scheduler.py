@@ -0,0 +1,113 @@
+""" Prologue
+ *  Module Name: refresh_scheduler.py
+ *  Purpose: Collects the GUI refreshes asked for during one event loop turn and runs each of them once.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: Logs the frames that go over `FRAME_BUDGET`.
+ *  Invariants: A refresh scheduled under a key that's already pending replaces it, so it only runs once.
+ *  Known Faults: Without a running Qt application there's no next turn, so refreshes run right away.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Hashable
+from PySide6 import QtCore
+from utils.singleton import singleton
+from utils.logger import logger
+
+class RefreshFrame:
+    """What one `RefreshScheduler.flush` ran, and how long each part took."""
+    def __init__(self, started: float, costs: dict[str, float], requests: int):
+        self.started = started  # `time.perf_counter()` when the frame started.
+        self.costs = costs  # Seconds spent on each refresh, by key.
+        self.requests = requests  # How many times refreshes were asked for, including the ones that were coalesced.
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.costs.values())  # The whole frame.
+
+    def __repr__(self) -> str:
+        parts = ', '.join(f"{key}={cost * 1000:.1f}ms" for key, cost in self.costs.items())
+        return f"RefreshFrame({self.seconds * 1000:.1f}ms, {self.requests} requests: {parts})"
+
+@singleton
+class RefreshScheduler:
+    """Runs refreshes on the next event loop turn, once each, however often they were asked for.
+
+    A single user action can ask for the same refresh many times, e.g. a batch touching a module
+    over and over, or every grid asking for the XP bars. `schedule` only remembers the latest
+    callback per key, and a zero-timeout `QTimer` runs them all as one frame once control is back
+    in the event loop."""
+    FRAME_BUDGET = 1 / 60  # Frames slower than this get logged.
+    HISTORY = 100  # How many frames `frames` keeps.
+
+    def __init__(self):
+        self._pending: dict[Hashable, Callable[[], None]] = {}  # Key -> the refresh to run, in the order they were asked for.
+        self._requests = 0  # Requests since the last frame.
+        self._timer: QtCore.QTimer | None = None  # Created once there's an application to run it.
+        self._flushing = False  # Whether `flush` is running, anything scheduled meanwhile joins its frame.
+        self.frames: deque[RefreshFrame] = deque(maxlen=self.HISTORY)  # The most recent frames.
+
+    def schedule(self, key: Hashable, refresh: Callable[[], None]) -> None:
+        """Runs `refresh` on the next turn, instead of whatever was scheduled under `key` so far."""
+        self._pending.pop(key, None)  # Move it to the end, so it runs after what it may depend on.
+        self._pending[key] = refresh
+        self._requests += 1
+
+        if self._flushing:  # The running frame picks it up.
+            return
+        if QtCore.QCoreApplication.instance() is None:  # No event loop to wait for.
+            self.flush()
+            return
+
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setSingleShot(True)
+            self._timer.setInterval(0)  # As soon as the event loop gets to it.
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self, key: Hashable) -> None:
+        """Forgets the refresh scheduled under `key`, e.g. because what it would refresh is gone."""
+        self._pending.pop(key, None)
+        if not self._pending and not self._flushing:  # No frame is coming, so don't count its requests towards the next one.
+            self._requests = 0
+
+    def flush(self) -> RefreshFrame | None:
+        """Runs everything that's pending right now, as one frame. Returns the frame, or None if nothing ran."""
+        if not self._pending or self._flushing:
+            return None
+
+        started = time.perf_counter()
+        costs: dict[str, float] = {}
+        requests = self._requests
+        self._requests = 0
+
+        self._flushing = True
+        try:
+            while self._pending:  # A refresh may schedule more, those run in the same frame.
+                key = next(iter(self._pending))
+                refresh = self._pending.pop(key)
+                start = time.perf_counter()
+                refresh()
+                name = str(key[0] if isinstance(key, tuple) else key)  # Tuple keys are (kind, which one).
+                costs[name] = costs.get(name, 0.0) + time.perf_counter() - start
+        finally:
+            self._flushing = False
+
+        frame = RefreshFrame(started, costs, requests + self._requests)
+        self._requests = 0
+        self.frames.append(frame)
+        if frame.seconds > self.FRAME_BUDGET:
+            logger.log_debug(f"Slow refresh: {frame}")
+        return frame
+
+refresh_scheduler = RefreshScheduler()
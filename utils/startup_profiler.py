@@ -0,0 +1,162 @@
+""" Prologue
+ *  Module Name: startup_profiler.py
+ *  Purpose: Times the phases of a launch, for `taskchampion.py --profile-startup`.
+ *  Inputs: None
+ *  Outputs: A JSON report, and optionally a cProfile dump, see `StartupProfiler.write_report`.
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: Imported before anything else that should be timed, the clock starts on import.
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: None until `enable_cprofile` or `write_report` is called, phases are always timed.
+ *  Invariants: Phase and mark times are seconds since the profiler was imported.
+ *  Known Faults: Time spent before Python imported the profiler (interpreter start) isn't counted.
+"""
+
+import datetime
+import json
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from PySide6 import QtCore
+from utils.singleton import singleton
+
+class Phase:
+    """One timed part of the launch. Phases can nest, e.g. the dialogs are built while the widgets are."""
+    def __init__(self, name: str, start: float, depth: int):
+        self.name = name
+        self.start = start  # Seconds since the profiler started.
+        self.seconds = 0.0  # How long it took, set once it ends.
+        self.depth = depth  # How many phases it's inside of.
+
+    def to_dict(self) -> dict:
+        return {'phase': self.name, 'start': self.start, 'seconds': self.seconds, 'depth': self.depth}
+
+class _FirstPaintFilter(QtCore.QObject):
+    """Marks `first_paint` the first time the widget it's installed on paints. Private."""
+    def __init__(self, profiler: 'StartupProfiler'):
+        super().__init__()
+        self.profiler = profiler
+
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        if event.type() == QtCore.QEvent.Type.Paint:
+            watched.removeEventFilter(self)  # Only the first one counts.
+            self.profiler.mark('first_paint')
+        return False  # Let the widget paint.
+
+@singleton
+class StartupProfiler:
+    """Times the phases of a launch: imports, API load, widget construction, styles, and so on,
+    plus marks for moments like the first paint or every task being loaded.
+
+    Phases are always timed, it's one `perf_counter` call on either side. Nothing is written unless
+    `write_report` is called, which `taskchampion.py` does when it's launched with `--profile-startup`."""
+    def __init__(self):
+        self.started = time.perf_counter()  # The clock starts when the profiler is imported.
+        self.phases: list[Phase] = []  # In the order they started.
+        self.marks: dict[str, float] = {}  # Mark name -> seconds since the start.
+        self._depth = 0  # How many phases are running.
+        self._profile = None  # The `cProfile.Profile`, set by `enable_cprofile`.
+        self._waiting: Optional[tuple[set[str], Callable[[], None]]] = None  # See `when_marked`.
+        self._paint_filter: Optional[_FirstPaintFilter] = None
+
+    def now(self) -> float:
+        """Seconds since the profiler started."""
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Phase]:
+        """Times the body of the `with` block as the phase `name`."""
+        phase = Phase(name, self.now(), self._depth)
+        self.phases.append(phase)
+        self._depth += 1
+        try:
+            yield phase
+        finally:
+            self._depth -= 1
+            phase.seconds = self.now() - phase.start
+
+    def mark(self, name: str) -> None:
+        """Records that `name` happened now. Only the first time counts."""
+        if name in self.marks:
+            return
+        self.marks[name] = self.now()
+        self._check_waiting()
+
+    def when_marked(self, names: list[str], callback: Callable[[], None]) -> None:
+        """Calls `callback` once every mark in `names` was recorded, right away if they already were."""
+        self._waiting = (set(names), callback)
+        self._check_waiting()
+
+    def _check_waiting(self) -> None:
+        """Calls the `when_marked` callback if its marks are all in. Private."""
+        if self._waiting is not None and self._waiting[0] <= self.marks.keys():
+            callback = self._waiting[1]
+            self._waiting = None
+            callback()
+
+    def watch_first_paint(self, widget: QtCore.QObject) -> None:
+        """Marks `first_paint` when `widget` first paints."""
+        self._paint_filter = _FirstPaintFilter(self)
+        widget.installEventFilter(self._paint_filter)
+
+    def enable_cprofile(self) -> None:
+        """Runs cProfile from now until the report is written."""
+        import cProfile  # Only needed when asked for.
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def totals(self) -> dict[str, float]:
+        """Seconds per phase name, for phases that ran more than once, e.g. each dialog."""
+        totals: dict[str, float] = {}
+        for phase in self.phases:
+            totals[phase.name] = totals.get(phase.name, 0.0) + phase.seconds
+        return totals
+
+    def report(self) -> dict:
+        return {
+            'meta': {
+                'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'qt_platform': QtCore.QCoreApplication.instance().platformName() if QtCore.QCoreApplication.instance() else None,
+            },
+            'total': self.now(),
+            'phases': [phase.to_dict() for phase in self.phases],
+            'totals': self.totals(),
+            'marks': dict(self.marks),
+        }
+
+    def format_report(self) -> str:
+        """The report as an indented table, slowest phases are easy to spot."""
+        lines = [f"{'phase':<36} {'start':>8} {'seconds':>8}"]
+        for phase in self.phases:
+            name = '  ' * phase.depth + phase.name
+            lines.append(f"{name:<36} {phase.start:8.3f} {phase.seconds:8.3f}")
+        for name, at in sorted(self.marks.items(), key=lambda x: x[1]):
+            lines.append(f"{'@ ' + name:<36} {at:8.3f}")
+        return '\n'.join(lines)
+
+    def write_report(self, path: Optional[str], cprofile_path: Optional[str] = None) -> None:
+        """Writes the JSON report to `path`, or stdout if it's None or `-`, with `format_report`'s table on stderr.
+
+        A report written to a file prints nothing. If cProfile is running, it's stopped and its stats are dumped to `cprofile_path`."""
+        if self._profile is not None:
+            self._profile.disable()
+            if cprofile_path:
+                self._profile.dump_stats(cprofile_path)
+            self._profile = None
+
+        if path is None or path == '-':
+            print(self.format_report(), file=sys.stderr)  # Readable summary, the JSON below is for tools.
+            json.dump(self.report(), sys.stdout, indent=2)
+            print()
+        else:
+            with open(path, 'w') as file:
+                json.dump(self.report(), file, indent=2)
+
+startup_profiler = StartupProfiler()
@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Mo Morgan, Jacob Wilkus
  *  Date: 2/15/2025
- *  Last Modified: 2/25/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -24,58 +24,68 @@ status_t: TypeAlias = Literal['pending', 'completed', 'deleted', 'waiting', 'rec
 priority_t: TypeAlias = Literal['H', 'M', 'L'] | None
 
 class Task(task.Task):
-    def get_module(self) -> str: 
-        annotations = str(self.get('annotations', '[]')).replace("'","")
-
-        ls=json.loads(annotations)
-        if len(ls) == 0:
-            return "Main"
-        
-        annotation_dict:dict[str, str] = ls[0]
-        return annotation_dict.get("module", "Main")
+    def __init__(self, data, udas=None):
+        # Our annotations are a single JSON object stored as the task's first annotation. It's decoded
+        # at most once per change of the `annotations` field instead of on every access.
+        self._annotation_cache: dict[str, str] | None = None  # The decoded annotation dict.
+        self._annotation_str: str | None = None  # The same dict, serialized.
+        super().__init__(data, udas)  # Call the parent constructor.
+
+    def __setitem__(self, key, value, force=False):
+        if key == 'annotations':  # `set` and `update` go through here too.
+            self._invalidate_annotations()  # The raw field changed, decode it again next time.
+        return super().__setitem__(key, value, force=force)
+
+    def __reduce__(self):
+        """Pickles the already decoded fields, so unpickling skips the decoding in `__init__`. Used by task snapshots."""
+        state = dict(vars(self))  # Our attributes and taskw_ng's.
+        if state.get('_fields') == self.FIELDS:  # No UDAs, so don't pickle a copy of every field per task.
+            state['_fields'] = None
+        return (_unpickle_task, (dict(self), state))
+
+    def _invalidate_annotations(self) -> None:
+        self._annotation_cache = None  # Forget the decoded annotations.
+        self._annotation_str = None
+
+    def _annotation_dict(self) -> dict[str, str]:
+        """Returns the decoded annotation dict, parsing the `annotations` field only if it changed. Private."""
+        if self._annotation_cache is None:  # If it hasn't been decoded yet.
+            annotations = str(self.get('annotations', '[]')).replace("'","")
+
+            ls = json.loads(annotations)
+            self._annotation_cache = ls[0] if len(ls) != 0 else {}  # Only the first annotation is ours.
+
+        return self._annotation_cache
+
+    def _write_annotations(self, annotation_dict: dict[str, str]) -> None:
+        """Serializes `annotation_dict` back into the `annotations` field, keeping it decoded. Private."""
+        annotation_str = json.dumps(annotation_dict)  # Serialize it once.
+        self["annotations"] = f"[{annotation_str}]"  # Same as `json.dumps([annotation_dict])`.
+
+        self._annotation_cache = annotation_dict  # No need to parse what we just wrote.
+        self._annotation_str = annotation_str
 
+    def get_module(self) -> str: 
+        return self._annotation_dict().get("module", "Main")
 
     def set_module(self, s: str) -> None:
-        annotations = str(self.get('annotations', '[]')).replace("'","")
-
-        ls = json.loads(annotations)
-        annotation_dict: dict[str, str]
-
-        if len(ls) == 0:
-            annotation_dict = {}
-        else:
-            annotation_dict = ls[0]
-        
+        annotation_dict = self._annotation_dict()
         annotation_dict["module"] = s
-        self["annotations"] = json.dumps([annotation_dict])
+        self._write_annotations(annotation_dict)
 
     def get_nonstandard_col(self, colname: str) -> str:
-        annotations = str(self.get('annotations', '{}')).replace("'","")
-
-        ls = json.loads(annotations)
+        return self._annotation_dict().get(colname, "")
 
-        if len(ls) == 0:
-            return ""
-            
-        annotation_dict: dict[str, str] = json.loads(annotations)[0]
-
-        return annotation_dict.get(colname, "")
+    def get_nonstandard_cols(self) -> dict[str, str]:
+        """Every nonstandard column the task has a value for, by name. Doesn't include the module."""
+        return {col: val for col, val in self._annotation_dict().items() if col != "module"}
 
     def set_nonstandard_col(self, colname: str, val: str) -> None:
 
         """It is up to the caller to update taskAPI."""
-        annotations = str(self.get('annotations', '[]')).replace("'","")
-
-        ls = json.loads(annotations)
-        annotation_dict: dict[str, str]
-
-        if len(ls) == 0:
-            annotation_dict = {}
-        else:
-            annotation_dict = ls[0]
-        
+        annotation_dict = self._annotation_dict()
         annotation_dict[colname] = val
-        self["annotations"] = json.dumps([annotation_dict])
+        self._write_annotations(annotation_dict)
 
     
     def denotate(self):
@@ -83,22 +93,17 @@ class Task(task.Task):
 
         It is UP TO THE CALLER to keep track of annotations and reset them after."""
         self.pop("annotations")
+        self._invalidate_annotations()  # The field is gone, so are the decoded annotations.
 
     def get_annotations(self) -> str:
         """`Task['annotations']` returns something like
             `"['{<actual annotations>}']"`, 
         this function returns 
             `"{<actual annotations>}"`"""
-        annotations = str(self.get('annotations', '[]')).replace("'","")
-        ls = json.loads(annotations)
-        annotation_dict: dict[str, str]
-
-        if len(ls) == 0:
-            annotation_dict = {}
-        else:
-            annotation_dict = ls[0]
-        
-        return json.dumps(annotation_dict)
+        if self._annotation_str is None:  # Only serialize when the annotations changed.
+            self._annotation_str = json.dumps(self._annotation_dict())
+
+        return self._annotation_str
         
 
     def has_annotations(self) -> bool:
@@ -191,5 +196,11 @@ class Task(task.Task):
     def get_wait(self) -> fields.DateField:
         return self['wait']  # Return the wait field.
 
-
-
+def _unpickle_task(data: dict, state: dict) -> Task:
+    """Rebuilds a `Task` pickled by `Task.__reduce__`. Private."""
+    t = Task.__new__(Task)  # Skip `__init__`, the fields are already decoded.
+    if state['_fields'] is None:
+        state['_fields'] = Task.FIELDS.copy()
+    t.__dict__.update(state)
+    dict.update(t, data)  # Skip `__setitem__`, nothing actually changed.
+    return t
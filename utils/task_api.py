@@ -6,7 +6,7 @@
  *  Additional code sources: None
  *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
  *  Date: 2/15/2025
- *  Last Modified: 3/26/2025
+ *  Last Modified: 10/18/2026
  *  Preconditions: None
  *  Postconditions: None
  *  Error/Exception conditions: None
@@ -21,39 +21,475 @@ from taskw_ng.warrior import TaskWarrior
 from utils.singleton import singleton
 from utils.sortmetric import SortMetric
 from utils.task import Task
-from typing import Callable, Optional
+from utils.completed_archive import CompletedArchive, split_completed, window_cutoff, shift_timestamp
+from utils.task_data_loader import TaskDataLoader, DataLoaderError, find_data_dir
+from utils.task_snapshot import TaskSnapshot, load_snapshot, save_snapshot, snapshot_key
+from utils.task_change import ChangeKind, TaskChange
+from utils.logger import logger
+from typing import Callable, Iterable, Iterator, Optional
+from bisect import bisect_right
+from contextlib import contextmanager
+import datetime
+import os
+import tempfile
 import uuid
 from PySide6 import QtCore
 import json
 
+class _Descending:
+    """Wraps a sort key so that it orders backwards.
+
+    Lets descending sort metrics keep their module lists in plain ascending order of keys, so both
+    directions can share the same `bisect` logic."""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.key < self.key  # Flip the comparison.
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
 class TaskAPI:
+    VOLATILE_FIELDS = ('id', 'urgency')  # Worked out by taskwarrior on export, they change without an edit, e.g. urgency grows with age.
+
     def __init__(self):
         self.sort_metric: SortMetric = SortMetric.DESCRIPTION_ASCENDING
 
         # The list that is sorted according to some criteria.
         self.task_dict: dict[str, list[Task]] = {}  # List of tasks.
         self.module_list: set[str] = set()
+
+        # Each module's cached sort keys, parallel to `task_dict[module]` and always in ascending order.
+        self._sort_keys: dict[str, list] = {}
+        self._sort_key_fn, self._sort_reverse = self._get_sort_params(self.sort_metric)
+
+        # Indices over `task_dict`, kept up to date by every mutation.
+        self._uuid_index: dict[str, tuple[str, int]] = {}  # uuid -> (module, position in the module).
+        self._id_index: dict[str, str] = {}  # taskwarrior id -> uuid.
+
+        # Mutations queued by `batch()`, collapsed per uuid.
+        self._batch_depth = 0  # How many `with api.batch():` blocks we're inside.
+        self._batch_puts: dict[str, Task] = {}  # Tasks to add or update.
+        self._batch_deletes: dict[str, Task] = {}  # Tasks to delete.
+        self._batch_new: set[str] = set()  # Tasks added during the batch, so they don't exist anywhere yet.
+
+        # XP summary of the completed tasks that are too old to be loaded, see `utils/completed_archive.py`.
+        self.archive = CompletedArchive()
+
+        # Called with a `TaskChange` after every change to the store, see `subscribe`.
+        self._listeners: list[Callable[[TaskChange], None]] = []
+
+        self.loaded = False  # Whether the store holds every task yet, see `TaskLoader`.
+        self.from_snapshot = False  # Whether the store came from a snapshot and still needs checking, see `restore_snapshot`.
+        self._mutated: Optional[set[str]] = None  # The uuids changed through the API while a load runs, see `begin_load`.
         self._init_task_list()  # Initialize the task list.
         
     def _init_task_list(self) -> None:
-        k, r = self._get_sort_params(self.sort_metric)  # Get the sort parameters.
-        for key in self.task_dict:
-            self.task_dict[key].sort(key=k, reverse=r)  # Sort the task list.
+        self._load_store(list(self.fetch_tasks()))  # Rebuild the store from scratch.
+        self.loaded = True
+
+    def subscribe(self, listener: Callable[[TaskChange], None]) -> None:
+        """Calls `listener` with a `TaskChange` every time the store changes.
+
+        Single mutations send one change for the task they touched. Anything that re-sorts a whole
+        module, like a batch, a reload or a new sort metric, sends one `RESET` per module instead.
+        Changes are sent after the store is updated, from whichever thread changed it, which is
+        always the GUI thread."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[TaskChange], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, change: TaskChange) -> None:
+        """Sends `change` to every listener. Private."""
+        for listener in list(self._listeners):  # A listener may unsubscribe while we're at it.
+            listener(change)
+
+    def _notify_reset(self, modules) -> None:
+        """Tells every listener that `modules` changed wholesale. Private."""
+        if not self._listeners:  # Don't bother building the changes.
+            return
+        for module in modules:
+            self._notify(TaskChange(ChangeKind.RESET, module=module))
+
+    def _load_store(self, tasks: list[Task]) -> None:
+        """Replaces everything in the store with `tasks`. Private."""
+        self.task_dict.clear()  # Clear the task list.
+        for t in tasks:
+            self.task_dict.setdefault(t.get_module(), []).append(t)  # Group the tasks by module.
 
         # We gotta do this bc otherwise deleting every task in a module will raise an error later on.
         for mod in self.module_list:
             if self.task_dict.get(mod, None) == None:
                 self.task_dict[mod] = []
+
+        self._sort_task_dict()  # Sort every module, which also rebuilds the indices.
+
+    def fetch_tasks(self) -> Iterator[Task]:
+        """Reads every task from wherever tasks are kept, without touching the store.
+
+        Doesn't touch any state, so `TaskLoader` calls it from a worker thread. The store
+        is all there is by default, so this just yields what's in it."""
+        for tasks in list(self.task_dict.values()):
+            yield from list(tasks)
+
+    def take_snapshot(self, key: tuple) -> TaskSnapshot:
+        """Captures the store, its sort keys and the archive, for `restore_snapshot` on the next launch."""
+        return TaskSnapshot(key, self.task_dict, self.sort_metric.value, self._sort_keys,
+                            self.archive.counts, self.archive.cutoff)
+
+    def restore_snapshot(self, snapshot: TaskSnapshot) -> None:
+        """Replaces the store with a snapshot's, without decoding or re-sorting anything if it can help it.
+
+        Sets `from_snapshot`, since taskwarrior may have been changed in ways the snapshot key can't see."""
+        self.task_dict = snapshot.task_dict  # The tasks are already decoded and grouped.
+        for mod in self.module_list:  # Same as `_load_store`.
+            self.task_dict.setdefault(mod, [])
+
+        if snapshot.sort_metric == self.sort_metric.value and snapshot.sort_keys.keys() == self.task_dict.keys():
+            self._sort_keys = snapshot.sort_keys  # Already sorted by the current metric.
+            self._uuid_index.clear()
+            self._id_index.clear()
+            for mod in self.task_dict:
+                self._reindex_module(mod)  # Rebuild the indices, they're cheap.
+            self._notify_reset(list(self.task_dict))  # Everything is different.
+        else:
+            self._sort_task_dict()  # Sorted by something else, so sort again. This notifies too.
+
+        self.archive = CompletedArchive()
+        self.archive.counts = snapshot.archive_counts
+        self.archive.cutoff = snapshot.archive_cutoff
+        self.from_snapshot = True
+
+    def replace_tasks(self, tasks: list[Task]) -> bool:
+        """Brings the store in line with `tasks` one task at a time, e.g. after checking a snapshot.
+
+        Tasks that only differ in `VOLATILE_FIELDS` count as the same. Tasks changed through the API
+        since `begin_load` are left as they are, `tasks` was read before that. Listeners hear about
+        each task that was added, changed or removed, not whole modules. Returns whether anything changed."""
+        skip = self._mutated or set()
+        fresh = {str(t.get_uuid()): t for t in tasks}
+
+        gone = [task_uuid for task_uuid in self._uuid_index if task_uuid not in fresh and task_uuid not in skip]
+        for task_uuid in gone:
+            self._unstore_task(task_uuid)  # Deleted since the snapshot.
+
+        changed = bool(gone)
+        for task_uuid, t in fresh.items():
+            if task_uuid in skip:  # The store has it as it is now.
+                continue
+            stored = self.get_by_uuid(task_uuid)
+            if stored is None or not self._same_task(stored, t):  # Added or edited since the snapshot.
+                self._store_task(t)
+                changed = True
+
+        self.from_snapshot = False  # Either way the store is up to date now.
+        return changed
+
+    @classmethod
+    def _same_task(cls, a: Task, b: Task) -> bool:
+        """Whether `a` and `b` are equal apart from their `VOLATILE_FIELDS`. Private."""
+        return ({k: v for k, v in a.items() if k not in cls.VOLATILE_FIELDS}
+                == {k: v for k, v in b.items() if k not in cls.VOLATILE_FIELDS})
+
+    def save_snapshot(self) -> None:
+        """Saves the store for the next launch. Nowhere to save it by default."""
+        pass
+
+    def begin_load(self) -> None:
+        """Starts remembering which tasks get changed through the API, before `TaskLoader` starts reading.
+
+        What the loader hands back may have been read before those changes, so `add_loaded_tasks`
+        leaves these tasks as they are in the store."""
+        self._mutated = set()
+
+    def end_load(self) -> None:
+        """Stops remembering changed tasks, the load is over however it ended."""
+        self._mutated = None
+
+    def _mark_mutated(self, task_uuids: Iterable[str]) -> None:
+        """Remembers that the API changed `task_uuids`, if a load is running. Private."""
+        if self._mutated is not None:
+            self._mutated.update(task_uuids)
+
+    def add_loaded_tasks(self, tasks: list[Task]) -> None:
+        """Stores a chunk of tasks read by `fetch_tasks()`, replacing any already stored copies.
+
+        Tasks changed through the API since `begin_load` are skipped, the store already has them as they are now."""
+        if self._mutated:
+            tasks = [t for t in tasks if str(t.get_uuid()) not in self._mutated]  # Read before the change, or the delete.
+        self._apply_batch(tasks, set())  # One re-sort and re-index per module in the chunk.
+
+    def _sort_task_dict(self) -> None:
+        """Fully re-sorts every module. Private.
+
+        This is the only place sort keys get computed in bulk: on (re)load and when the sort metric changes."""
+        self._sort_key_fn, self._sort_reverse = self._get_sort_params(self.sort_metric)  # Get the sort parameters.
+        self._sort_keys.clear()  # The old keys are for the old metric.
+
+        for key in self.task_dict:
+            self._sort_keys[key] = [self._sort_key(t) for t in self.task_dict[key]]  # Compute each task's key once.
+            self._sort_module(key)  # Sort the task list.
+
+        self._uuid_index.clear()  # Every position may have moved.
+        self._id_index.clear()
+        for key in self.task_dict:
+            self._reindex_module(key)  # Rebuild the indices.
+
+        self._notify_reset(list(self.task_dict))  # Every module was re-sorted.
+
+    def _sort_module(self, module: str) -> None:
+        """Sorts `module` by its already cached keys, in place. Private."""
+        tasks = self.task_dict[module]
+        keys = self._sort_keys[module]
+        order = sorted(range(len(tasks)), key=keys.__getitem__)  # Stable, like `list.sort`.
+
+        tasks[:] = [tasks[i] for i in order]  # Sort the task list in place.
+        keys[:] = [keys[i] for i in order]  # Keep the keys alongside it.
+
+    def _reindex_module(self, module: str, start: int = 0) -> None:
+        """Re-records the positions of every task in `module` from `start` onwards. Private.
+
+        Splicing a task in or out of a module shifts everything after it, so that's all that needs fixing."""
+        tasks = self.task_dict[module]
+        for pos in range(start, len(tasks)):
+            t = tasks[pos]
+            task_uuid = str(t.get_uuid())
+            self._uuid_index[task_uuid] = (module, pos)  # Record where the task lives.
+
+            task_id = self._id_key(t.get('id'))
+            if task_id is not None:  # Only pending tasks have an id.
+                self._id_index[task_id] = task_uuid
+
+    def _sort_key(self, t: Task):
+        """The cached sort key of `t` under the current sort metric. Private."""
+        key = self._sort_key_fn(t)
+        return _Descending(key) if self._sort_reverse else key
+
+    @staticmethod
+    def _id_key(task_id) -> Optional[str]:
+        """Taskwarrior ids are ints, `FakeTaskAPI` ids are strings; index both the same way. Private."""
+        if task_id is None or str(task_id) == '0':  # Completed and deleted tasks have id 0.
+            return None
+        return str(task_id)
+
+    def _store_task(self, t: Task) -> None:
+        """Puts `t` into `task_dict`, replacing any stored task with the same uuid. Private.
+
+        This is how mutations keep the store up to date without a full reload: the task is
+        bisected into place in the module it lands in, nothing gets re-sorted."""
+        task_uuid = str(t.get_uuid())
+        self._mark_mutated((task_uuid,))  # A load running meanwhile may have read an older copy.
+        old = self._uuid_index.get(task_uuid)  # Where the old copy was, for the listeners.
+        self._unstore_task(task_uuid, notify=False)  # Drop the old copy, it may live in another module.
+
+        module = t.get_module()  # Get the module the task belongs to now.
+        tasks = self.task_dict.setdefault(module, [])
+        keys = self._sort_keys.setdefault(module, [])
+
+        key = self._sort_key(t)  # Compute the task's key once.
+        pos = bisect_right(keys, key)  # After any equal keys, same as appending and then sorting.
+        tasks.insert(pos, t)  # Add the task to its module.
+        keys.insert(pos, key)
+
+        self._reindex_module(module, pos)  # Record the new positions.
+
+        if self._listeners:  # Tell them what happened, as one change.
+            new = (module, pos)
+            kind = ChangeKind.ADDED if old is None else ChangeKind.CHANGED if old == new else ChangeKind.MOVED
+            self._notify(TaskChange(kind, task_uuid, old, new))
+
+    def _unstore_task(self, task_uuid: str, notify: bool = True) -> Optional[Task]:
+        """Removes the task with uuid `task_uuid` from `task_dict` and returns it. Private.
+
+        Pass `notify=False` if the task is about to be stored again, so listeners only hear about it once."""
+        self._mark_mutated((task_uuid,))  # A load running meanwhile may still hand it back.
+        location = self._uuid_index.pop(task_uuid, None)  # Find the task.
+        if location is None:  # The task wasn't stored.
+            return None
+
+        module, pos = location
+        t = self.task_dict[module].pop(pos)  # Remove the task.
+        self._sort_keys[module].pop(pos)  # And its key.
+
+        task_id = self._id_key(t.get('id'))
+        if task_id is not None and self._id_index.get(task_id) == task_uuid:
+            del self._id_index[task_id]  # Forget its id too.
+
+        self._reindex_module(module, pos)  # Everything after it moved up by one.
+
+        if notify and self._listeners:
+            self._notify(TaskChange(ChangeKind.REMOVED, task_uuid, old=location))
+        return t
+
+    def _renumber(self, tasks: list[Task]) -> None:
+        """Swaps in fresh copies of stored tasks that only differ in their `id`. Private.
+
+        Taskwarrior renumbers the pending tasks whenever one stops being pending, but keeps them in
+        the same order, so each copy takes the old one's place and only the ID sort could notice.
+        A module whose keys did fall out of order is re-sorted."""
+        for t in tasks:  # Forget the old ids first, another task may have one of them now.
+            task_uuid = str(t.get_uuid())
+            module, pos = self._uuid_index[task_uuid]
+            task_id = self._id_key(self.task_dict[module][pos].get('id'))
+            if task_id is not None and self._id_index.get(task_id) == task_uuid:
+                del self._id_index[task_id]
+
+        moved: dict[str, list[tuple[str, tuple[str, int]]]] = {}  # Module -> (uuid, position) of each copy.
+        for t in tasks:
+            task_uuid = str(t.get_uuid())
+            module, pos = self._uuid_index[task_uuid]
+            self.task_dict[module][pos] = t  # Same place, new id.
+            self._sort_keys[module][pos] = self._sort_key(t)
+            task_id = self._id_key(t.get('id'))
+            if task_id is not None:
+                self._id_index[task_id] = task_uuid
+            moved.setdefault(module, []).append((task_uuid, (module, pos)))
+
+        resorted = []
+        for module, changed in moved.items():
+            keys = self._sort_keys[module]
+            if any(keys[i + 1] < keys[i] for i in range(len(keys) - 1)):  # Only if something sorts by id.
+                self._sort_module(module)
+                self._reindex_module(module)
+                resorted.append(module)
+            elif self._listeners:
+                for task_uuid, location in changed:
+                    self._notify(TaskChange(ChangeKind.CHANGED, task_uuid, location, location))
+        self._notify_reset(resorted)
+
+    @contextmanager
+    def batch(self) -> Iterator['TaskAPI']:
+        """Groups mutations so they're written, stored and indexed once, e.g.
+        
+        ```
+        with api.batch():
+            for t in tasks:
+                t.set('status', 'completed')
+                api.update_task(t)
+        ```
+        Adds, updates and deletes inside the block are queued. When the outermost block exits they're
+        flushed by `_commit_batch()` in bulk, and the touched modules are re-sorted and re-indexed once.
+        Reads inside the block still see the tasks as they were before it. If the block raises, nothing
+        that was queued is written."""
+        self._batch_depth += 1  # Enter the batch.
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1  # Leave the batch.
+            if self._batch_depth == 0:  # If this was the outermost block, throw the queue away.
+                self._clear_batch()
+            raise
+        else:
+            self._batch_depth -= 1  # Leave the batch.
+            if self._batch_depth == 0:  # If this was the outermost block, write everything.
+                self._flush_batch()
+
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0  # True inside a `with api.batch():` block.
+
+    def _queue_put(self, t: Task, is_new: bool = False) -> None:
+        """Queues `t` to be added or updated when the batch is flushed. Private."""
+        task_uuid = str(t.get_uuid())
+        self._batch_puts[task_uuid] = t  # Only the last version of a task matters.
+        self._batch_deletes.pop(task_uuid, None)
+
+        if is_new:  # Remember that it doesn't exist yet.
+            self._batch_new.add(task_uuid)
+
+    def _queue_delete(self, t: Task) -> None:
+        """Queues `t` to be deleted when the batch is flushed. Private."""
+        task_uuid = str(t.get_uuid())
+        self._batch_puts.pop(task_uuid, None)  # Don't bother writing it first.
+
+        if task_uuid in self._batch_new:  # Added and deleted within the batch, so nothing to do.
+            self._batch_new.discard(task_uuid)
+        else:
+            self._batch_deletes[task_uuid] = t
+
+    def _is_queued(self, task_uuid: str) -> bool:
+        return task_uuid in self._batch_puts  # True if the task would exist once the batch is flushed.
+
+    def _clear_batch(self) -> None:
+        self._batch_puts.clear()  # Forget everything that was queued.
+        self._batch_deletes.clear()
+        self._batch_new.clear()
+
+    def _flush_batch(self) -> None:
+        """Writes the queued mutations and applies them to the store. Private."""
+        puts = list(self._batch_puts.values())
+        deletes = list(self._batch_deletes.values())
+        self._clear_batch()
+
+        if not puts and not deletes:  # If nothing was queued.
+            return
+
+        stored = self._commit_batch(puts, deletes)  # Write them to the backing store.
+        self._mark_mutated(str(t.get_uuid()) for t in puts + deletes)
+        self._apply_batch(stored, {str(t.get_uuid()) for t in deletes})  # Then update `task_dict`.
+
+    def _commit_batch(self, puts: list[Task], deletes: list[Task]) -> list[Task]:
+        """Writes a flushed batch to wherever tasks are kept, returning the tasks to store. Private.
+
+        There's nowhere to write to by default, so the queued tasks are stored as they are."""
+        return puts
+
+    def _apply_batch(self, puts: list[Task], deleted: set[str]) -> None:
+        """Stores `puts` and drops `deleted` with one re-sort and re-index per touched module. Private."""
+        dropped = deleted | {str(t.get_uuid()) for t in puts}  # Old copies of updated tasks go too.
+        touched: set[str] = set()  # The modules that need re-sorting.
+
+        removed_by_module: dict[str, set[int]] = {}
+        for task_uuid in dropped:
+            location = self._uuid_index.pop(task_uuid, None)  # Find the stored copy.
+            if location is None:  # New tasks aren't stored yet.
+                continue
+
+            module, pos = location
+            removed_by_module.setdefault(module, set()).add(pos)
+
+            task_id = self._id_key(self.task_dict[module][pos].get('id'))
+            if task_id is not None and self._id_index.get(task_id) == task_uuid:
+                del self._id_index[task_id]  # Forget its id too.
+
+        for module, positions in removed_by_module.items():
+            tasks = self.task_dict[module]
+            keys = self._sort_keys[module]
+            tasks[:] = [tasks[i] for i in range(len(tasks)) if i not in positions]  # Splice them all out at once.
+            keys[:] = [keys[i] for i in range(len(keys)) if i not in positions]
+            touched.add(module)
+
+        for t in puts:
+            module = t.get_module()  # Get the module the task belongs to now.
+            self.task_dict.setdefault(module, []).append(t)  # Add it to the end for now.
+            self._sort_keys.setdefault(module, []).append(self._sort_key(t))
+            touched.add(module)
+
+        for module in touched:
+            self._sort_module(module)  # Sort each touched module once.
+            self._reindex_module(module)  # And index it once.
+
+        self._notify_reset(touched)  # Positions all over the touched modules moved, so send one change per module.
+
+    def refresh(self) -> None:
+        """Rebuilds the whole task store from its source of truth.
+
+        Mutations update `task_dict` in place, so this is only needed as an explicit
+        consistency check, e.g. after taskwarrior was modified outside of TaskChampion."""
+        self._init_task_list()
     
     @staticmethod
     def _get_sort_params(metric: SortMetric) -> tuple[Callable[[Task], str | int], bool]:
-        """Meant to be called in `self._init_task_list()` by doing the following:
+        """Meant to be called in `self._sort_task_dict()` by doing the following:
         
         ```
-        k, r = self._get_sort_params(self.sort_metric)
-        self.task_list.sort(key=k, reverse=r)
+        self._sort_key_fn, self._sort_reverse = self._get_sort_params(self.sort_metric)
         ```
-        That's it.
+        That's it. `self._sort_key()` then wraps the key function so both directions sort ascending.
 
         """
         
@@ -108,6 +544,64 @@ class TaskAPI:
             return None  # Return None.
         
         return self.task_dict[mod][idx]  # Return the task at the index.
+
+    def index_of(self, task_uuid: str) -> Optional[tuple[str, int]]:
+        """Returns the `(module, position)` of the task with uuid `task_uuid`, or None if it isn't stored."""
+        return self._uuid_index.get(str(task_uuid))
+
+    def positions_of(self, task_uuids: Iterable[str], module: str) -> list[int]:
+        """The positions in `module` of the tasks with uuids `task_uuids`, in order. Uuids stored elsewhere, or not at all, are skipped."""
+        locations = map(self._uuid_index.get, task_uuids)  # One lookup each, without a call per task.
+        positions = [loc[1] for loc in locations if loc is not None and loc[0] == module]
+        positions.sort()
+        return positions
+
+    def get_by_uuid(self, task_uuid: str) -> Optional[Task]:
+        location = self.index_of(task_uuid)  # Look the task up.
+        if location is None:  # If the task isn't stored.
+            return None
+
+        module, pos = location
+        return self.task_dict[module][pos]  # Return the task.
+
+    def get_by_id(self, task_id: int | str) -> Optional[Task]:
+        """Looks a task up by its taskwarrior id. Only pending tasks have one."""
+        task_uuid = self._id_index.get(self._id_key(task_id))  # Translate the id to a uuid.
+        if task_uuid is None:  # If no task has that id.
+            return None
+
+        return self.get_by_uuid(task_uuid)  # Return the task.
+
+    def update_by_uuid(self, task_uuid: str, **attrs) -> Task:
+        """Sets each of `attrs` on the task with uuid `task_uuid` and saves it.
+
+        Raises:
+            ValueError: If no task has that uuid."""
+        task_uuid = str(task_uuid)
+        t = self.get_by_uuid(task_uuid)  # Look the task up.
+        if t is None:  # It may only exist in the current batch so far.
+            t = self._batch_puts.get(task_uuid)
+        if t is None:  # If the task isn't stored.
+            raise ValueError(f"task {task_uuid} not found.")
+
+        for attr, val in attrs.items():
+            t.set(attr, val)  # Set the attribute.
+
+        self.update_task(t)  # Save the task.
+        return self.get_by_uuid(task_uuid) or t  # Return the stored copy, or the queued one inside a batch.
+
+    def delete_by_uuid(self, task_uuid: str) -> None:
+        task_uuid = str(task_uuid)
+        if self.in_batch() and task_uuid in self._batch_new:  # Added during this batch, so it isn't stored yet.
+            self._queue_delete(self._batch_puts[task_uuid])
+            return
+
+        location = self.index_of(task_uuid)  # Look the task up.
+        if location is None:  # If the task isn't stored.
+            return
+
+        module, pos = location
+        self.delete_at(pos, module)  # Delete the task.
     
     def add_new_task(self, description: str, tags=None,  module="Main", nonstandard_cols: dict[str, str]={}, **kw) -> Task: ...  # Add a new task.
     def add_task(self, t: Task) -> None: ...  # Add a task.
@@ -118,28 +612,160 @@ class TaskAPI:
 
 @singleton
 class TaskAPIImpl(TaskAPI):
-    def __init__(self):  # Initialize the TaskAPIImpl class.
+    BATCH_CHUNK = 500  # Max uuids per taskwarrior command when flushing a batch.
+    SHOWN_STATUSES = ('pending', 'waiting', 'completed')  # What the initial load shows. Recurring templates and deleted tasks aren't.
+
+    def __init__(self, load_tasks: bool = True, completed_days: int | None = None, completed_count: int | None = None,
+                 archive_file: str | None = None, loader: str = "taskwarrior",
+                 snapshot_file: str | None = None):  # Initialize the TaskAPIImpl class.
+        """Pass `load_tasks=False` to start with an empty store and fill it with `TaskLoader` instead.
+
+        `completed_days` and `completed_count` limit which completed tasks get loaded, see `split_completed`.
+        The rest are only counted, in `archive`, which is kept in `archive_file` between runs so only
+        tasks that have aged out of the window since last time need to be read.
+
+        `loader="files"` reads the tasks straight from taskwarrior's data directory instead of running
+        `task export`, see `TaskDataLoader`. Writes always go through `task`.
+
+        With `load_tasks=False` and a `snapshot_file`, a snapshot saved by `save_snapshot` for the same
+        data files is restored right away, and the GUI checks it against taskwarrior in the background."""
         self.warrior = TaskWarrior()  # Create a TaskWarrior object.
+        self.data_dir = find_data_dir(self.warrior.config)  # Where taskwarrior keeps its data.
+        self.data_loader = TaskDataLoader(self.data_dir) if loader == "files" else None  # None means `task export`.
+        self.snapshot_file = snapshot_file  # Where `save_snapshot` writes, or None to never snapshot.
+        self.loader_name = loader  # Which loader was picked, snapshots from the other one don't count.
+        self.completed_days = completed_days  # Load completed tasks from the last N days.
+        self.completed_count = completed_count  # Load the last N completed tasks.
+        self.archive_file = archive_file  # Where `archive` is saved, or None to rebuild it every time.
+        self._skip_initial_load = not load_tasks  # Whether to leave loading to the caller.
         super().__init__()  # Call the parent constructor.
+        self._skip_initial_load = False  # `refresh()` always reloads.
 
     def _init_task_list(self) -> None:
-        """Refreshes the task list. Private.
+        """Reloads the task list from taskwarrior. Private.
 
-        Called after any operation that would require re-sorting the list of tasks."""
-        self.task_dict.clear()  # Clear the task list.
-
-        tasks = self.warrior.load_tasks()  # Load the tasks.
-        task_list = [Task(x) for x in tasks['pending'] + tasks['completed']]  # Load the tasks into the task list.
-        for t in task_list:
-            # TODO: I'm no python expert, can somebody verify that there isn't a better way to do this?
-            self.task_dict[t.get_module()] = self.task_dict.get(t.get_module(), []) + [t]
+        This runs a full `task export`, so it's only called on startup and from `refresh()`."""
+        if self._skip_initial_load:  # The tasks will be loaded in the background.
+            snapshot = load_snapshot(self.snapshot_file, self._snapshot_key()) if self.snapshot_file else None
+            if snapshot is not None:  # Show last run's tasks until the background load catches up.
+                self.restore_snapshot(snapshot)
+            else:
+                self._load_store([])
+            return
 
         super()._init_task_list()  # Call the parent init task list method.
-    
+
+    def _snapshot_key(self) -> tuple:
+        """The key snapshots are saved under: the data files plus every setting that changes what gets loaded. Private."""
+        return snapshot_key(self.data_dir, self.completed_days, self.completed_count, self.loader_name)
+
+    def save_snapshot(self) -> None:
+        """Saves the store, if it's fully loaded. Called on exit, after every write has gone through."""
+        if not self.snapshot_file or not self.loaded or self.in_batch():  # Nothing complete to save.
+            return
+
+        try:
+            save_snapshot(self.snapshot_file, self.take_snapshot(self._snapshot_key()))
+        except Exception as e:  # Not worth crashing over, the next launch just starts cold.
+            logger.log_warn(f"Couldn't save the task snapshot: {e}")
+
+    def fetch_tasks(self) -> Iterator[Task]:
+        """Yields every pending task and the completed tasks inside the window.
+
+        Also replaces `archive`, in one assignment, so it's safe to read from the GUI thread meanwhile."""
+        records = self._read_data_files() if self.data_loader is not None else None
+        if records is None:  # Not configured, or the files couldn't be read.
+            records = self._export_records()
+
+        for x in records:
+            yield Task(x)  # Decode each task only when it's asked for.
+
+    def _export_records(self) -> list[dict]:
+        """Reads the tasks with `task export`. Private."""
+        if self.completed_days is None and self.completed_count is None:  # No window, load everything.
+            tasks = self.warrior.load_tasks()  # Load the tasks.
+            self.archive = CompletedArchive()  # Nothing is archived.
+            return tasks['pending'] + tasks['completed']
+
+        return self.warrior._get_json('status:pending', 'export') + self._fetch_completed()
+
+    def _read_data_files(self) -> list[dict] | None:
+        """Reads the tasks with `data_loader`, or returns None if it can't. Private.
+
+        Everything is read before any task is handed out, so falling back never loads a task twice."""
+        try:
+            records = list(self.data_loader.records())  # Parse every file.
+        except (DataLoaderError, OSError) as e:
+            logger.log_warn(f"Falling back to `task export`: {e}")
+            return None
+
+        pending = [x for x in records if x.get('status') == 'pending']
+        kept, archived = split_completed([x for x in records if x.get('status') == 'completed'],
+                                         self.completed_days, self.completed_count)
+
+        archive = CompletedArchive()  # Everything was read anyway, so there's nothing to gain from the saved one.
+        archive.add_records(archived)
+        archive.cutoff = window_cutoff(self.completed_days)
+        self.archive = archive
+
+        return pending + kept
+
+    def _fetch_completed(self) -> list[dict]:
+        """Exports the completed tasks inside the window and brings `archive` up to date. Private."""
+        cutoff = window_cutoff(self.completed_days)  # Tasks that ended before this are archived.
+
+        args = ['status:completed']
+        if cutoff is not None:  # Let taskwarrior skip the old tasks, `.after` is strict so go back a second.
+            args.append(f'end.after:{shift_timestamp(cutoff, -1)}')
+        kept, trimmed = split_completed(self.warrior._get_json(*args, 'export'), count=self.completed_count)
+
+        archive = self._archive_before(cutoff)  # Everything that ended before the cutoff.
+        archive.add_records(trimmed)  # Plus whatever the count limit cut, which can change every load.
+        self.archive = archive
+        return kept
+
+    def _archive_before(self, cutoff: str | None) -> CompletedArchive:
+        """Counts the completed tasks that ended before `cutoff`, reading as few as possible. Private.
+
+        The saved archive already counts everything before its own cutoff, so usually only
+        the tasks that ended between the two cutoffs have to be exported."""
+        if cutoff is None:  # No day limit, so nothing is old enough.
+            return CompletedArchive()
+
+        archive = CompletedArchive.load(self.archive_file) if self.archive_file else CompletedArchive()
+        if archive.cutoff is None or archive.cutoff > cutoff:  # Never built, or the window got longer.
+            archive.clear()
+            records = self.warrior._get_json('status:completed', f'end.before:{cutoff}', 'export')
+        else:  # Only read the tasks that aged out since last time.
+            records = self.warrior._get_json('status:completed', f'end.after:{shift_timestamp(archive.cutoff, -1)}',
+                                             f'end.before:{cutoff}', 'export')
+
+        archive.add_records(records)
+        archive.cutoff = cutoff
+
+        if self.archive_file:
+            archive.save(self.archive_file)  # Only the cutoff part is saved, the count limit is redone every load.
+        return archive
+
     def add_new_task(self, description: str, tags=None, module="Main", nonstandard_cols: dict[str, str]={}, **kw) -> Task:  # Add a new task.
         """TODO: This needs to be updated to allow for module to be set here."""
         if kw.get("due"):
             due = QtCore.QDate.fromString(kw.get("due"), "yyyy-MM-dd").toString("yyyy-MM-dd")
+
+        if self.in_batch():  # Build the task ourselves, `_commit_batch` will import it.
+            # The GUI passes "" for every field left blank. `task add` skips those, so we do too.
+            kw = {k: v for k, v in kw.items() if v not in (None, "")}
+            task = Task(self.warrior._stub_task(description, tags, **kw))
+            task['uuid'] = str(uuid.uuid4())  # Taskwarrior keeps whatever uuid an imported task has.
+            task['status'] = 'pending'
+            task['entry'] = self._timestamp()
+
+            task.set_module(module)
+            for col in nonstandard_cols:
+                task.set_nonstandard_col(col, nonstandard_cols[col])
+
+            self._queue_put(task, is_new=True)  # Queue the task.
+            return task  # Return the task.
         
         # Idk how to init a task without taskwarrior's help so we just do after.
         task = Task(self.warrior.task_add(description, tags, **kw))  # Add a task.
@@ -152,39 +778,159 @@ class TaskAPIImpl(TaskAPI):
         annotations = task.get_annotations()
         
         
-        task = self.warrior.task_annotate(task, annotations)
+        task = Task(self.warrior.task_annotate(task, annotations))  # taskw_ng hands back the task as it was stored.
 
-        self._init_task_list()  # Initialize the task list.
+        if kw.get("recur"):  # That was the template, taskwarrior spawns the pending instance.
+            self._sync_pending([str(task.get_uuid())])
+        else:
+            self._store_task(task)  # Put the new task into the task list.
 
-        return Task(task)  # Return the task.
+        return task  # Return the task.
 
     def add_task(self, t: Task) -> None:
-        self.warrior.task_add(t)  # Add a task.
-        self._init_task_list()  # Initialize the task list.
+        if self.in_batch():  # Queue the task instead.
+            self._queue_put(t, is_new=True)
+            return
+
+        task = Task(self.warrior.task_add(t))  # Add a task.
+        if task.get('recur'):  # That was the template, taskwarrior spawns the pending instance.
+            self._sync_pending([str(task.get_uuid())])
+        else:
+            self._store_task(task)
 
     def delete_at(self, idx: int, module: str) -> None:
         if len(self.task_dict[module]) <= idx:  # If the index is out of bounds.
             return  # Return.
 
-        t = self.task_dict[module].pop(idx)  # Pop the task at the index.
+        if self.in_batch():  # Queue the deletion instead.
+            self._queue_delete(self.task_dict[module][idx])
+            return
+
+        t = self._unstore_task(str(self.task_dict[module][idx].get_uuid()))  # Remove the task at the index.
         self.warrior.task_delete(uuid=str(t['uuid']))  # Delete the task.
+        self._sync_pending()  # The pending tasks after it were renumbered.
 
     def update_task(self, new_task: Task) -> None:
-        if new_task.get_due() is not None:  # If the task has a due date.
+        if isinstance(new_task.get_due(), str):  # If the due date was just typed in. Stored ones are already datetimes.
             new_task['due'] = QtCore.QDate.fromString(new_task['due'], "yyyy-MM-dd").toString("yyyy-MM-dd")  # Set the due date.
+
+        if self.in_batch():  # Queue the task instead, importing it writes the annotations as they are.
+            self._queue_put(new_task)
+            return
         
         annotations=new_task.get_annotations()
         if len(annotations) > 3:
             new_task.denotate()
-        
+
+        resync = self._renumbers(new_task)  # Before taskw_ng is done with the changes.
         self.warrior.task_update(new_task)  # Update the task.
-        self.warrior.task_annotate(new_task, annotations)
-        
-        self._init_task_list()  # Initialize the task list.
+        updated = Task(self.warrior.task_annotate(new_task, annotations))  # The task as taskwarrior now has it.
+
+        if resync:  # Completed, deleted or recurring, so other tasks changed too.
+            self._sync_pending([str(updated.get_uuid())])
+        else:
+            self._store_task(updated)  # Replace the stored copy of the task.
+
+    @staticmethod
+    def _renumbers(t: Task) -> bool:
+        """Whether writing `t` changes other tasks too: a new status renumbers the pending tasks,
+        and completing or editing a recurring task can spawn an instance. Private."""
+        changes = t.get_changes(keep=True)  # `task_update` still needs them.
+        return 'status' in changes or 'recur' in changes or bool(t.get('recur'))
+
+    def _sync_pending(self, touched: Iterable[str] = ()) -> None:
+        """Brings the stored pending tasks in line with taskwarrior, after a write that changes more than itself. Private.
+
+        Only the pending and waiting tasks are exported, not everything like `refresh()`. New ones,
+        e.g. a recurring task's next instance, are stored, renumbered ones get their new id, see
+        `_renumber`. `touched`, the tasks just written, and stored tasks that aren't pending anymore
+        are looked up by uuid: completed ones are stored, anything else, like a recurring template
+        or a deleted task, is dropped."""
+        records = self.warrior._get_json('status:pending', 'export') + self.warrior._get_json('status:waiting', 'export')
+        fresh = {str(x['uuid']): Task(x) for x in records}
+
+        stored_pending = {task_uuid for task_uuid, (module, pos) in self._uuid_index.items()
+                          if self.task_dict[module][pos].get('status') in ('pending', 'waiting')}
+        lookup = list((stored_pending | set(touched)) - fresh.keys())
+        found: dict[str, Task] = {}
+        for start in range(0, len(lookup), self.BATCH_CHUNK):
+            for x in self.warrior._get_json(*lookup[start:start + self.BATCH_CHUNK], 'export'):
+                found[str(x['uuid'])] = Task(x)
+
+        for task_uuid in lookup:
+            t = found.get(task_uuid)
+            if t is None or t.get('status') not in self.SHOWN_STATUSES:  # Deleted, or not a task we show.
+                self._unstore_task(task_uuid)
+            elif self.get_by_uuid(task_uuid) is None or not self._same_task(self.get_by_uuid(task_uuid), t):
+                self._store_task(t)
+
+        renumbered = []
+        for task_uuid, t in fresh.items():
+            stored = self.get_by_uuid(task_uuid)
+            if stored is None or not self._same_task(stored, t):  # New, e.g. spawned, or changed elsewhere.
+                self._store_task(t)
+            elif stored.get('id') != t.get('id'):
+                renumbered.append(t)
+        self._renumber(renumbered)
+
+    def _flush_batch(self) -> None:
+        """Writes the batch, then catches up with whatever else it changed in taskwarrior, see `_sync_pending`. Private."""
+        puts = [str(u) for u in self._batch_puts]
+        resync = bool(self._batch_deletes) or any(self._renumbers(t) for t in self._batch_puts.values())
+        super()._flush_batch()
+        if resync:
+            self._sync_pending(puts)
+
+    def _commit_batch(self, puts: list[Task], deletes: list[Task]) -> list[Task]:
+        """Writes a whole batch with one `task import` and one `task delete`. Private.
+
+        The written tasks are then exported again, so what gets stored is what taskwarrior ended up with."""
+        if puts:
+            records = [self._import_record(t) for t in puts]  # Import takes a JSON array of tasks.
+            with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+                json.dump(records, f)  # Write the tasks to a file for taskwarrior to read.
+            try:
+                self.warrior._execute('import', f.name)  # Add or overwrite them all at once.
+            finally:
+                os.remove(f.name)  # Clean up the file.
+
+        if deletes:
+            uuids = [str(t.get_uuid()) for t in deletes]
+            for start in range(0, len(uuids), self.BATCH_CHUNK):  # Keep the command line a sane length.
+                self.warrior._execute('rc.bulk=0', *uuids[start:start + self.BATCH_CHUNK], 'delete')
+
+        stored: list[Task] = []
+        uuids = [str(t.get_uuid()) for t in puts]
+        for start in range(0, len(uuids), self.BATCH_CHUNK):
+            records = self.warrior._get_json(*uuids[start:start + self.BATCH_CHUNK], 'export')  # Read them back.
+            stored += [Task(x) for x in records]
+
+        return stored
+
+    @staticmethod
+    def _timestamp() -> str:
+        """The current time in taskwarrior's date format. Private."""
+        return datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    @classmethod
+    def _import_record(cls, t: Task) -> dict:
+        """Converts `t` into the JSON `task import` expects. Private."""
+        record = t.serialized()  # Convert the fields back into taskwarrior's format.
+        record.pop('id', None)  # Taskwarrior assigns these itself.
+        record.pop('urgency', None)
+
+        if not t.has_annotations():  # If the task has no annotations.
+            record.pop('annotations', None)
+        elif isinstance(t['annotations'], str):  # Our annotations, written by `set_module` and co.
+            record['annotations'] = [{'entry': cls._timestamp(), 'description': t.get_annotations()}]
+        else:  # Annotations the way taskwarrior gave them to us.
+            record['annotations'] = [{'entry': a._entry or cls._timestamp(), 'description': str(a)} for a in t['annotations']]
+
+        return record
 
     def set_sort_metric(self, metric: SortMetric):
         self.sort_metric = metric  # Set the sort metric.
-        self._init_task_list()  # Initialize the task list.
+        self._sort_task_dict()  # Re-sort, the tasks themselves haven't changed.
 
     def clear_tasks(self):
         raise RuntimeError("clear_tasks should only be called in a test environment.")
@@ -219,48 +965,62 @@ class FakeTaskAPI(TaskAPI):
         for col in nonstandard_cols:
             task.set_nonstandard_col(col, nonstandard_cols[col])
 
-        self.task_dict[module].append(task)  # Append the task to the task list.
-        self._init_task_list()  # Initialize the task list.
+        if self.in_batch():
+            self._queue_put(task, is_new=True)  # Queue the task.
+        else:
+            self._store_task(task)  # Put the task into the task list.
 
         return task  # Return the task.
 
     def add_task(self, t: Task) -> None:
         # Unused at the moment.
 
-        self.task_dict[t.get_module()].append(t)  # Append the task to the task list.
-        self._init_task_list()  # Initialize the task list.
+        if self.in_batch():
+            self._queue_put(t, is_new=True)  # Queue the task.
+        else:
+            self._store_task(t)  # Put the task into the task list.
 
     def delete_at(self, idx: int, module: str) -> None:
         if len(self.task_dict[module]) <= idx:  # If the index is out of bounds.
             return  # Return.
 
-        self.task_dict[module].pop(idx)  # Pop the task at the index.
+        if self.in_batch():  # Queue the deletion instead.
+            self._queue_delete(self.task_dict[module][idx])
+            return
+
+        self._unstore_task(str(self.task_dict[module][idx].get_uuid()))  # Remove the task at the index.
 
     def update_task(self, new_task: Task) -> None:
-        found = False  # Initialize found to False.
         if new_task.get_due():
             new_task['due'] = QtCore.QDate.fromString(new_task['due'], "yyyy-MM-dd").toString("yyyy-MM-dd")
-        for idx in range(self.num_tasks(new_task.get_module())):  # For each task.
-            if self.task_dict[new_task.get_module()][idx].get_uuid() == new_task.get_uuid():  # If the UUIDs match.
-                self.task_dict[new_task.get_module()][idx] = new_task  # Update the task.
-                found = True  # Set found to True.
-                break
-        
-        if not found:
+
+        task_uuid = str(new_task.get_uuid())
+        if self.in_batch():
+            if self.index_of(task_uuid) is None and not self._is_queued(task_uuid):  # If the task doesn't exist.
+                raise ValueError(f"task {new_task} not found.")  # Raise a value error.
+            self._queue_put(new_task)  # Queue the task.
+            return
+
+        if self.index_of(task_uuid) is None:  # If the task isn't stored.
             raise ValueError(f"task {new_task} not found.")  # Raise a value error.
-        
-        self._init_task_list()  # Initialize the task list.
+
+        self._store_task(new_task)  # Replace the stored task, possibly in a new module.
 
     def set_sort_metric(self, metric: SortMetric):
         self.sort_metric = metric  # Set the sort metric.
-        self._init_task_list()  # Initialize the task list.
+        self._sort_task_dict()  # Re-sort the task list.
 
     def clear_tasks(self):
+        # Only tests call this, so nothing is notified. Listeners from before it would point at modules that are gone.
         self.task_dict.clear()  # Clear the task list.
+        self._sort_keys.clear()  # Clear the sort keys.
+        self._uuid_index.clear()  # Clear the indices.
+        self._id_index.clear()
+        self._clear_batch()  # Clear anything queued.
 
 api: TaskAPI
 
-def register_api(cls: type[TaskAPI]):
+def register_api(cls: type[TaskAPI], *args, **kwargs):
     global api  # Declare api as global.
-    api = cls()  # Set api to an instance of the class.
+    api = cls(*args, **kwargs)  # Set api to an instance of the class.
 
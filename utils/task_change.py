@@ -0,0 +1,60 @@
+""" Prologue
+ *  Module Name: task_change.py
+ *  Purpose: The change notifications `TaskAPI` sends to whoever subscribed to it.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: None
+ *  Invariants: A change is sent after the store was updated, so `new` is where the task is now.
+ *  Known Faults: None encountered
+"""
+from enum import Enum
+from typing import Optional
+
+# Where a task is stored: its module, and its position in that module.
+Location = tuple[str, int]
+
+class ChangeKind(Enum):
+    ADDED   = 0  # The task wasn't stored before.
+    CHANGED = 1  # The task was updated, but stayed where it was.
+    MOVED   = 2  # The task was updated and now sits somewhere else, in its module or another one.
+    REMOVED = 3  # The task isn't stored anymore.
+    RESET   = 4  # A whole module was re-sorted or replaced, e.g. by a batch. There's no single task.
+
+class TaskChange:
+    """One change to the store, see `TaskAPI.subscribe`."""
+    def __init__(self, kind: ChangeKind, task_uuid: Optional[str] = None, old: Optional[Location] = None,
+                 new: Optional[Location] = None, module: Optional[str] = None):
+        self.kind = kind
+        self.task_uuid = task_uuid  # None for a reset.
+        self.old = old  # Where the task was before, None if it's new.
+        self.new = new  # Where the task is now, None if it's gone.
+        self.module = module  # The module that was reset, only set for a reset.
+
+    def dirty_rows(self, module: str, num_tasks: int) -> Optional[range]:
+        """The positions in `module` that hold a different task, or a changed one, because of this change.
+
+        `num_tasks` is how many tasks `module` holds now. Returns None if every position may have
+        changed, and an empty range if `module` wasn't touched at all."""
+        if self.kind == ChangeKind.RESET:
+            return None if self.module == module else range(0)
+
+        old = self.old[1] if self.old is not None and self.old[0] == module else None
+        new = self.new[1] if self.new is not None and self.new[0] == module else None
+
+        if old is not None and new is not None:  # Moved within the module, only the tasks in between shifted.
+            return range(min(old, new), max(old, new) + 1)
+        if new is not None:  # Moved in, everything after it shifted down.
+            return range(new, num_tasks)
+        if old is not None:  # Moved out, everything after it shifted up and the last position emptied.
+            return range(old, num_tasks + 1)
+        return range(0)
+
+    def __repr__(self) -> str:
+        return f"TaskChange({self.kind.name}, {self.task_uuid}, {self.old} -> {self.new}, module={self.module})"
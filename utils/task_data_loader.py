@@ -0,0 +1,199 @@
+""" Prologue
+ *  Module Name: task_data_loader.py
+ *  Purpose: Reads tasks straight out of taskwarrior's data directory, without running `task`.
+ *  Inputs: A taskwarrior data directory.
+ *  Outputs: Task records in the same shape `task export` produces.
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: DataLoaderError: if the directory holds no data this loader understands,
+ *                              or a data file can't be parsed.
+ *  Side effects: None. The data files are only ever read, never written.
+ *  Invariants: None
+ *  Known Faults: Urgency isn't stored on disk, so records never have one. Recurring templates and deleted
+ *                tasks are skipped, like the `task export` path does.
+"""
+
+import datetime
+import json
+import os
+import re
+import sqlite3
+from typing import Iterator
+
+# The statuses `TaskAPIImpl` loads, everything else is skipped.
+LOADED_STATUSES = ('pending', 'completed')
+
+# The statuses taskwarrior gives an id to, in `pending.data` order. Deleted and completed lines don't count.
+NUMBERED_STATUSES = ('pending', 'waiting', 'recurring')
+
+# Attributes taskwarrior stores as epoch seconds, but exports as timestamps.
+DATE_ATTRIBUTES = {'entry', 'start', 'end', 'due', 'until', 'wait', 'modified', 'scheduled'}
+
+# One `name:"value"` pair of a FF4 line. Values escape quotes with a backslash.
+_FF4_ATTRIBUTE = re.compile(r'([^\s:\[\]]+):"((?:[^"\\]|\\.)*)"')
+
+# Escapes older taskwarrior versions used in FF4 values.
+_FF4_LEGACY_ESCAPES = {'&open;': '[', '&close;': ']', '&dquot;': '"', '&quot;': '"'}
+
+class DataLoaderError(Exception):
+    """Raised when a data directory can't be read. Callers fall back to `task export`."""
+    pass
+
+def find_data_dir(taskrc: dict) -> str:
+    """The data directory a parsed taskrc points at, `~/.task` if it doesn't say."""
+    location = taskrc.get('data', {}).get('location', '~/.task') if isinstance(taskrc.get('data'), dict) else '~/.task'
+    return os.path.expanduser(str(location))
+
+def _timestamp(epoch: str) -> str:
+    """Converts epoch seconds to the timestamp format `task export` uses. Private."""
+    if not epoch.isdigit():  # Already a timestamp, or something we don't understand.
+        return epoch
+    return datetime.datetime.fromtimestamp(int(epoch), datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+def _decode_ff4_value(value: str) -> str:
+    """Undoes the escaping taskwarrior applies to FF4 values. Private."""
+    for escape, char in _FF4_LEGACY_ESCAPES.items():
+        value = value.replace(escape, char)
+
+    if '\\' not in value:  # Nothing left to unescape.
+        return value
+    try:
+        return json.loads(f'"{value}"')  # Taskwarrior 2.6 escapes values like JSON strings.
+    except json.JSONDecodeError:
+        return value  # Keep it as is rather than lose the task.
+
+def to_export_record(attributes: dict[str, str]) -> dict:
+    """Converts the flat string attributes taskwarrior stores into what `task export` would print.
+
+    Handles both storage formats: FF4's `tags`, `depends` and `annotation_<epoch>` attributes, and
+    the `tag_<name>` and `dep_<uuid>` attributes that the SQLite replica uses instead."""
+    record: dict = {}
+    tags: list[str] = []
+    depends: list[str] = []
+    annotations: list[dict] = []
+
+    for name, value in attributes.items():
+        if name == 'tags':
+            tags += [t for t in value.split(',') if t]
+        elif name.startswith('tag_'):
+            tags.append(name[len('tag_'):])
+        elif name == 'depends':
+            depends += [d for d in value.split(',') if d]
+        elif name.startswith('dep_'):
+            depends.append(name[len('dep_'):])
+        elif name.startswith('annotation_'):
+            annotations.append({'entry': _timestamp(name[len('annotation_'):]), 'description': value})
+        elif name in DATE_ATTRIBUTES:
+            record[name] = _timestamp(value)
+        else:
+            record[name] = value
+
+    if tags:
+        record['tags'] = list(dict.fromkeys(tags))  # Both formats may be present, keep the order and drop repeats.
+    if depends:
+        record['depends'] = list(dict.fromkeys(depends))
+    if annotations:
+        record['annotations'] = sorted(annotations, key=lambda a: a['entry'])  # Oldest first, like export.
+
+    return record
+
+def parse_ff4_line(line: str) -> dict[str, str]:
+    """Parses one line of `pending.data` or `completed.data` into its raw attributes.
+
+    Raises:
+        DataLoaderError: If the line isn't a FF4 task."""
+    line = line.strip()
+    if not (line.startswith('[') and line.endswith(']')):
+        raise DataLoaderError(f"Not a FF4 task: {line[:80]}")
+
+    return {name: _decode_ff4_value(value) for name, value in _FF4_ATTRIBUTE.findall(line[1:-1])}
+
+class TaskDataLoader:
+    """Reads task records from a taskwarrior data directory.
+
+    Taskwarrior 2.x keeps tasks in `pending.data` and `completed.data`, one FF4 line per task.
+    Taskwarrior 3.x keeps them in `taskchampion.sqlite3`. Whichever is there gets read."""
+    FF4_FILES = ('pending.data', 'completed.data')  # In the order `task export` lists them.
+    SQLITE_FILE = 'taskchampion.sqlite3'
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+
+    def source(self) -> str:
+        """Which format the directory holds, 'sqlite' or 'ff4'.
+
+        Raises:
+            DataLoaderError: If it holds neither."""
+        if os.path.isfile(os.path.join(self.data_dir, self.SQLITE_FILE)):
+            return 'sqlite'
+        if os.path.isfile(os.path.join(self.data_dir, self.FF4_FILES[0])):
+            return 'ff4'
+        raise DataLoaderError(f"No taskwarrior data in {self.data_dir}")
+
+    def records(self) -> Iterator[dict]:
+        """Yields every pending and completed task as a `task export` record, pending tasks first.
+
+        Raises:
+            DataLoaderError: If the data can't be read."""
+        if self.source() == 'sqlite':
+            yield from self._sqlite_records()
+        else:
+            yield from self._ff4_records()
+
+    def _ff4_records(self) -> Iterator[dict]:
+        """Reads `pending.data` and `completed.data`. Private."""
+        next_id = 1  # Pending tasks are numbered in `pending.data` order, like taskwarrior does.
+        for filename in self.FF4_FILES:
+            path = os.path.join(self.data_dir, filename)
+            if not os.path.isfile(path):  # `completed.data` doesn't exist until something is completed.
+                continue
+
+            with open(path, 'r', encoding='utf-8') as file:
+                for line in file:
+                    if not line.strip():  # Skip blank lines.
+                        continue
+
+                    record = to_export_record(parse_ff4_line(line))
+                    if filename == 'pending.data' and record.get('status') in NUMBERED_STATUSES:
+                        record['id'] = next_id  # Deleted tasks wait here for the next gc without a number.
+                        next_id += 1
+                    if record.get('status') in LOADED_STATUSES:
+                        if record['status'] != 'pending':
+                            record['id'] = 0  # Only pending tasks keep their number.
+                        yield record
+
+    def _sqlite_records(self) -> Iterator[dict]:
+        """Reads the SQLite replica. Private."""
+        path = os.path.join(self.data_dir, self.SQLITE_FILE)
+        try:
+            db = sqlite3.connect(f'file:{path}?mode=ro', uri=True)  # Never write to taskwarrior's data.
+        except sqlite3.Error as e:
+            raise DataLoaderError(f"Can't open {path}: {e}")
+
+        try:
+            ids = {task_uuid: task_id for task_id, task_uuid in db.execute('SELECT id, uuid FROM working_set')}
+            pending: list[dict] = []
+            completed: list[dict] = []
+
+            for task_uuid, data in db.execute('SELECT uuid, data FROM tasks'):
+                record = to_export_record(json.loads(data))
+                record['uuid'] = task_uuid
+                status = record.get('status')
+                if status == 'pending':
+                    record['id'] = ids.get(task_uuid, 0)
+                    pending.append(record)
+                elif status in LOADED_STATUSES:
+                    record['id'] = 0
+                    completed.append(record)
+        except (sqlite3.Error, json.JSONDecodeError, TypeError) as e:
+            raise DataLoaderError(f"Can't read {path}: {e}")
+        finally:
+            db.close()
+
+        pending.sort(key=lambda x: x['id'] or float('inf'))  # Numbered tasks first, in order.
+        yield from pending
+        yield from completed
@@ -0,0 +1,111 @@
+""" Prologue
+ *  Module Name: task_generator.py
+ *  Purpose: Generates synthetic task sets for benchmarks and tests.
+ *  Inputs: A task count and a seed.
+ *  Outputs: Task records in the shape `task export` produces, or a taskwarrior data directory holding them.
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: `write_data_dir` writes `pending.data` and `completed.data`.
+ *  Invariants: The same arguments always generate the same tasks.
+ *  Known Faults: None encountered
+"""
+
+import datetime
+import json
+import os
+import random
+import uuid
+
+MODULES = ["Main", "Work", "School", "Home"]  # Spread across a few modules, like a real user.
+PROJECTS = [None, "Thesis", "Garden", "Taxes", "EECS 582", "Chores"]
+TAGS = ["urgent", "errand", "phone", "email", "reading", "writing", "gym", "bills"]
+PRIORITIES = [None, "H", "M", "L"]
+WORDS = ["write", "read", "call", "fix", "plan", "review", "buy", "send", "clean", "finish",
+         "report", "groceries", "draft", "meeting", "notes", "car", "paper", "budget", "slides", "code"]
+
+BASE_TIME = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)  # Every date is some time after this.
+
+def _timestamp(dt: datetime.datetime) -> str:
+    return dt.strftime('%Y%m%dT%H%M%SZ')  # Taskwarrior's date format.
+
+def generate_records(n: int, seed: int = 0, completed_ratio: float = 0.3, modules: list[str] = MODULES) -> list[dict]:
+    """Generates `n` task records, about `completed_ratio` of them completed.
+
+    Each record has a description, priority, project, tags, dates and a module annotation,
+    drawn from small pools so sorting and XP grouping see plenty of ties."""
+    rng = random.Random(seed)  # Everything comes from here, so a seed always gives the same tasks.
+    records: list[dict] = []
+    next_id = 1
+
+    for _ in range(n):
+        entry = BASE_TIME + datetime.timedelta(seconds=rng.randrange(365 * 24 * 3600))
+        record = {
+            'uuid': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))),
+            'entry': _timestamp(entry),
+            'modified': _timestamp(entry),
+            'annotations': [{'entry': _timestamp(entry), 'description': json.dumps({'module': rng.choice(modules)})}],
+        }
+
+        priority = rng.choice(PRIORITIES)
+        if priority is not None:
+            record['priority'] = priority
+        project = rng.choice(PROJECTS)
+        if project is not None:
+            record['project'] = project
+        tags = rng.sample(TAGS, rng.randint(0, 3))
+        if tags:
+            record['tags'] = tags
+
+        if rng.random() < completed_ratio:
+            record['status'] = 'completed'
+            record['end'] = _timestamp(entry + datetime.timedelta(hours=rng.randint(1, 24 * 30)))
+            record['id'] = 0  # Only pending tasks have an id.
+        else:
+            record['status'] = 'pending'
+            record['id'] = next_id
+            next_id += 1
+
+        records.append(record)
+
+    return records
+
+def _ff4_value(value: str) -> str:
+    """Escapes a value the way taskwarrior 2.6 writes it to a FF4 file. Private."""
+    return json.dumps(value)[1:-1]  # JSON string escaping, minus the quotes.
+
+def _epoch(timestamp: str) -> str:
+    dt = datetime.datetime.strptime(timestamp, '%Y%m%dT%H%M%SZ').replace(tzinfo=datetime.timezone.utc)
+    return str(int(dt.timestamp()))  # FF4 stores dates as epoch seconds.
+
+def to_ff4_line(record: dict) -> str:
+    """Formats a record as one line of `pending.data` or `completed.data`."""
+    attributes: dict[str, str] = {}
+    for name, value in record.items():
+        if name in ('id', 'urgency'):  # Not stored, taskwarrior works these out.
+            continue
+        elif name == 'annotations':
+            for a in value:
+                attributes[f"annotation_{_epoch(a['entry'])}"] = a['description']
+        elif name in ('tags', 'depends'):
+            attributes[name] = ','.join(value)
+        elif name in ('entry', 'modified', 'end', 'due', 'start', 'wait', 'until', 'scheduled'):
+            attributes[name] = _epoch(value)
+        else:
+            attributes[name] = str(value)
+
+    return '[' + ' '.join(f'{name}:"{_ff4_value(attributes[name])}"' for name in sorted(attributes)) + ']'
+
+def write_data_dir(path: str, records: list[dict]) -> None:
+    """Writes `records` as a taskwarrior 2.x data directory, for `TaskDataLoader` to read."""
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'pending.data'), 'w', encoding='utf-8') as pending, \
+         open(os.path.join(path, 'completed.data'), 'w', encoding='utf-8') as completed:
+        for record in records:
+            file = pending if record['status'] == 'pending' else completed
+            file.write(to_ff4_line(record) + '\n')
@@ -0,0 +1,72 @@
+""" Prologue
+ *  Module Name: task_loader.py
+ *  Purpose: Loads tasks on a worker thread so the GUI can paint before every task has been read.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: The API must be registered with `register_api` before a loader is started.
+ *  Postconditions: None
+ *  Error/Exception conditions: Errors raised while loading are logged and reported through `TaskLoader.failed`.
+ *  Side effects: Runs `TaskAPI.fetch_tasks` on a `QThreadPool` thread.
+ *  Invariants: The store is only ever touched on the GUI thread, by whoever receives `chunk_loaded`.
+ *  Known Faults: None encountered
+"""
+
+from PySide6 import QtCore
+from typing import Callable, Iterator
+from utils.task import Task
+from utils.logger import logger
+
+class TaskLoader(QtCore.QObject):
+    """Reads tasks on a worker thread and hands them back to the GUI thread in chunks.
+
+    The first chunk is small so the first screen of rows can paint right away, the rest stream in
+    behind it. Connect to the signals before calling `start()`."""
+    FIRST_CHUNK = 50  # Roughly a screen of rows.
+    CHUNK = 500  # Tasks per chunk after the first one.
+
+    chunk_loaded = QtCore.Signal(object)  # Emitted with a list[Task] for each chunk.
+    finished = QtCore.Signal()  # Emitted once every chunk has been emitted.
+    failed = QtCore.Signal(str)  # Emitted with the error message if loading failed.
+
+    def __init__(self, fetch_tasks: Callable[[], Iterator[Task]]):
+        super().__init__()  # Call the parent constructor.
+        self.fetch_tasks = fetch_tasks  # Called on the worker thread, must not touch the store.
+        self.runnable: _TaskLoaderRunnable | None = None  # Kept alive for as long as the load runs.
+
+    def start(self) -> None:
+        """Starts loading on the global thread pool."""
+        self.runnable = _TaskLoaderRunnable(self)  # Create the worker.
+        QtCore.QThreadPool.globalInstance().start(self.runnable)  # Run it on another thread.
+
+    def run(self) -> None:
+        """Runs on the worker thread. Signals emitted from here are queued to the GUI thread."""
+        try:
+            chunk: list[Task] = []
+            limit = self.FIRST_CHUNK  # The first chunk goes out as soon as possible.
+
+            for t in self.fetch_tasks():
+                chunk.append(t)  # Collect the task.
+                if len(chunk) >= limit:  # If the chunk is full.
+                    self.chunk_loaded.emit(chunk)  # Send it to the GUI thread.
+                    chunk = []
+                    limit = self.CHUNK
+
+            if chunk:  # Send whatever is left.
+                self.chunk_loaded.emit(chunk)
+
+            self.finished.emit()  # Tell the GUI thread we're done.
+        except Exception as e:
+            self.failed.emit(logger.log_error(f"Failed to load tasks: {e}"))  # Report the error.
+
+class _TaskLoaderRunnable(QtCore.QRunnable):
+    """The `QRunnable` that `QThreadPool` actually runs. Private."""
+    def __init__(self, loader: TaskLoader):
+        super().__init__()  # Call the parent constructor.
+        self.loader = loader  # The loader to run.
+
+    def run(self) -> None:
+        self.loader.run()  # Load the tasks.
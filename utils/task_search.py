@@ -0,0 +1,234 @@
+""" Prologue
+ *  Module Name: task_search.py
+ *  Purpose: An inverted index over the stored tasks, for the search bar.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: `register_api` was called before this module is imported.
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: Subscribes to the API's change notifications.
+ *  Invariants: Once built, every stored task is indexed under the module it's stored in, or its module is stale.
+ *  Known Faults: `FakeTaskAPI.clear_tasks` doesn't notify, so tests call `rebuild` after it.
+"""
+
+import re
+import sys
+from bisect import bisect_left, insort
+from typing import Optional
+from utils.singleton import singleton
+from utils.task import Task
+from utils.task_api import api
+from utils.task_change import ChangeKind, TaskChange
+
+WORD = re.compile(r"\w+")  # What counts as a token.
+END = "\U0010ffff"  # Sorts after anything that can follow a prefix, see `_prefix_range`.
+
+def task_tokens(t: Task) -> set[str]:
+    """Every token `t` can be found by, lowercased.
+
+    Words of the description, tags, project and nonstandard columns are indexed as is. All but the
+    description are also indexed as `field:word`, so a search can say where to look, e.g.
+    `project:home` or `priority:h`."""
+    tokens: set[str] = set(WORD.findall(str(t.get('description') or "").lower()))  # Most of the words.
+    def add(field: str, text, plain: bool = True) -> None:
+        for word in WORD.findall(str(text).lower()):
+            if plain:
+                tokens.add(word)
+            tokens.add(f"{field}:{word}")
+
+    if t.get('project'):
+        add('project', t['project'])
+    if t.get('priority'):
+        add('priority', t['priority'], plain=False)  # A plain `h` would match every word starting with h.
+
+    tags = t.get('tags') or []
+    for tag in tags if isinstance(tags, (list, tuple)) else [tags]:
+        for x in tag if isinstance(tag, (list, tuple)) else [tag]:  # FakeTaskAPI nests them.
+            if x:
+                add('tag', x)
+
+    for col, val in t.get_nonstandard_cols().items():
+        if val:
+            add(col.lower(), val)
+    return tokens
+
+def query_terms(query: str) -> list[str]:
+    """Splits a search into the prefixes that all have to match, e.g. `"Buy mil project:ho"` ->
+    `["buy", "mil", "project:ho"]`."""
+    terms = []
+    for part in query.lower().split():
+        field, sep, text = part.rpartition(':')
+        if sep and field:  # `field:text`, the field has to match exactly.
+            terms += [f"{field}:{word}" for word in WORD.findall(text)] or [f"{field}:"]
+        else:
+            terms += WORD.findall(part)
+    return terms
+
+@singleton
+class TaskSearchIndex:
+    """Token -> uuids of the tasks that have it, kept up to date with the store.
+
+    Nothing is indexed until the first search or `build_step`, so loading doesn't pay for it. After
+    that single changes are applied as they happen, while a module that was reset, e.g. by a batch
+    or a load, is only marked stale and indexed again before the next search. Every term of a search
+    is a prefix, looked up with a bisect over the sorted tokens, so a keystroke costs the tasks it
+    matches, not every task."""
+    CACHE_SIZE = 64  # How many term lookups are kept, they're thrown away whenever the index changes.
+    BUILD_STEP = 2_000  # How many tasks `build_step` indexes by default, about 40ms worth.
+
+    def __init__(self):
+        self._reset()
+        api.subscribe(self.on_task_change)
+
+    def _reset(self) -> None:
+        """Empties the index. Private."""
+        self._postings: dict[str, set[str]] = {}  # Token -> uuids.
+        self._vocab: list[str] = []  # Every token in `_postings`, sorted.
+        self._tokens: dict[str, frozenset[str]] = {}  # Uuid -> its tokens, to unindex it.
+        self._by_module: dict[str, set[str]] = {}  # Module -> uuids indexed under it.
+        self._module_of: dict[str, str] = {}  # Uuid -> the module it's indexed under.
+        self._stale: set[str] = set()  # Modules to index again before the next search.
+        self._cursor: Optional[tuple[str, int]] = None  # The stale module `build_step` is part way through, and where.
+        self._built = False  # Whether anything was indexed yet.
+        self._cache: dict[str, set[str]] = {}  # Term -> its matches.
+
+    def rebuild(self) -> None:
+        """Forgets everything, the index is built again on the next search."""
+        self._reset()
+
+    def on_task_change(self, change: TaskChange) -> None:
+        if not self._built:  # Nothing to keep up to date.
+            return
+
+        self._cache.clear()
+        if self._cursor is not None and self._cursor[0] in (change.module, change.old and change.old[0],
+                                                            change.new and change.new[0]):
+            self._cursor = None  # The tasks shifted under `build_step`, start that module over.
+        if change.kind == ChangeKind.RESET:
+            self._stale.add(change.module)
+            return
+
+        task_uuid = str(change.task_uuid)
+        self._unindex(task_uuid, self._vocab_remove)
+        if change.new is not None:
+            self._index(api.task_at(change.new[1], change.new[0]), change.new[0], self._vocab_add)
+
+    def search(self, query: str) -> Optional[set[str]]:
+        """The uuids of the tasks matching every term of `query`, see `query_terms`. None if there are no terms.
+
+        Don't modify the set."""
+        terms = query_terms(query)
+        if not terms:
+            return None
+        self.build_step(sys.maxsize)  # Whatever is left, all at once.
+
+        matches = sorted((self._lookup(term) for term in set(terms)), key=len)  # Smallest first.
+        if len(matches) == 1:
+            return matches[0]
+        return matches[0].intersection(*matches[1:])
+
+    def positions(self, query: str, module: str) -> Optional[list[int]]:
+        """Where the tasks matching `query` are in `module`, in order. None if there are no terms."""
+        matches = self.search(query)
+        if matches is None:
+            return None
+
+        return api.positions_of(matches & self._by_module.get(module, set()), module)
+
+    def _lookup(self, term: str) -> set[str]:
+        """The uuids of every task with a token starting with `term`. Private."""
+        found = self._cache.get(term)
+        if found is None:
+            lo, hi = self._prefix_range(term)
+            if hi - lo == 1:
+                found = self._postings[self._vocab[lo]]
+            else:
+                found = set().union(*(self._postings[token] for token in self._vocab[lo:hi]))
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            self._cache[term] = found
+        return found
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        """The slice of `_vocab` holding the tokens that start with `prefix`. Private."""
+        return bisect_left(self._vocab, prefix), bisect_left(self._vocab, prefix + END)
+
+    def build_step(self, limit: int = BUILD_STEP) -> bool:
+        """Indexes up to `limit` tasks of the modules that aren't indexed yet, or are stale.
+
+        The GUI calls this on idle turns once the tasks are loaded, so the first search doesn't
+        have to build the whole index. Returns whether there's more to do."""
+        if not self._built:
+            self._built = True
+            self._stale = set(api.task_dict)
+        if not self._stale:
+            return False
+
+        self._cache.clear()
+        while self._stale and limit > 0:
+            module, start = self._cursor or (next(iter(self._stale)), 0)
+            if start == 0:  # Starting on the module, forget what it held before.
+                for task_uuid in list(self._by_module.get(module, ())):
+                    self._unindex(task_uuid, None)
+
+            tasks = api.task_dict.get(module, [])
+            for t in tasks[start:start + limit]:
+                self._index(t, module, None)
+            done = min(start + limit, len(tasks))
+            limit -= done - start
+
+            if done >= len(tasks):
+                self._stale.discard(module)
+                self._cursor = None
+            else:
+                self._cursor = (module, done)
+
+        self._vocab = sorted(self._postings)  # Once, instead of for every token.
+        return bool(self._stale)
+
+    def _index(self, t: Task, module: str, on_new_token) -> None:
+        """Indexes `t` under `module`. `on_new_token` is called with each token no task had so far. Private."""
+        task_uuid = str(t['uuid'])
+        tokens = frozenset(task_tokens(t))
+        self._tokens[task_uuid] = tokens
+        self._module_of[task_uuid] = module
+        self._by_module.setdefault(module, set()).add(task_uuid)
+
+        postings = self._postings  # Runs for every task when the index is built.
+        for token in tokens:
+            uuids = postings.get(token)
+            if uuids is None:
+                uuids = postings[token] = set()
+                if on_new_token is not None:
+                    on_new_token(token)
+            uuids.add(task_uuid)
+
+    def _unindex(self, task_uuid: str, on_gone_token) -> None:
+        """Forgets `task_uuid`, if it's indexed. `on_gone_token` is called with each token no task has anymore. Private."""
+        tokens = self._tokens.pop(task_uuid, None)
+        if tokens is None:
+            return
+        self._by_module[self._module_of.pop(task_uuid)].discard(task_uuid)
+
+        for token in tokens:
+            uuids = self._postings[token]
+            uuids.discard(task_uuid)
+            if not uuids:
+                del self._postings[token]
+                if on_gone_token is not None:
+                    on_gone_token(token)
+
+    def _vocab_add(self, token: str) -> None:
+        insort(self._vocab, token)
+
+    def _vocab_remove(self, token: str) -> None:
+        del self._vocab[bisect_left(self._vocab, token)]
+
+    def __len__(self) -> int:
+        return len(self._tokens)  # How many tasks are indexed.
+
+search_index = TaskSearchIndex()
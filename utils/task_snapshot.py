@@ -0,0 +1,81 @@
+""" Prologue
+ *  Module Name: task_snapshot.py
+ *  Purpose: Saves the decoded task store to disk so the next launch can show it without loading anything.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: A missing, corrupt or outdated snapshot loads as None.
+ *  Side effects: `save_snapshot` writes the snapshot file.
+ *  Invariants: A snapshot is only handed back if its key matches the data directory it was saved for.
+ *  Known Faults: Changes made to taskwarrior while TaskChampion was running are only caught by the
+ *                background refresh on the next launch.
+"""
+
+import os
+import pickle
+import tempfile
+import zlib
+from utils.task import Task
+
+SNAPSHOT_VERSION = 1  # Bump whenever `TaskSnapshot` or `Task` pickling changes.
+
+# The files taskwarrior 2.x and 3.x keep their tasks in. Any of them changing invalidates a snapshot.
+DATA_FILES = ('pending.data', 'completed.data', 'undo.data', 'backlog.data', 'taskchampion.sqlite3')
+
+class TaskSnapshot:
+    """Everything `TaskAPI` needs to put its store back together without decoding a single task."""
+    def __init__(self, key: tuple, task_dict: dict[str, list[Task]], sort_metric: int, sort_keys: dict[str, list],
+                 archive_counts: dict, archive_cutoff: str | None):
+        self.key = key  # What the snapshot was saved for, see `snapshot_key`.
+        self.task_dict = task_dict  # The store, module by module.
+        self.sort_metric = sort_metric  # The `SortMetric` value `sort_keys` were computed for.
+        self.sort_keys = sort_keys  # Each module's sort keys, parallel to `task_dict`.
+        self.archive_counts = archive_counts  # `CompletedArchive.counts`.
+        self.archive_cutoff = archive_cutoff  # `CompletedArchive.cutoff`.
+
+def data_fingerprint(data_dir: str) -> tuple:
+    """The name, mtime and size of every taskwarrior data file in `data_dir`."""
+    fingerprint = []
+    for name in DATA_FILES:
+        try:
+            st = os.stat(os.path.join(data_dir, name))
+        except OSError:  # Not every file exists.
+            continue
+        fingerprint.append((name, st.st_mtime_ns, st.st_size))
+
+    return tuple(fingerprint)
+
+def snapshot_key(data_dir: str, *settings) -> tuple:
+    """What a snapshot is valid for: the data files as they are now, plus any settings that change what's loaded."""
+    return (SNAPSHOT_VERSION, os.path.abspath(data_dir), data_fingerprint(data_dir), settings)
+
+def load_snapshot(path: str, key: tuple) -> TaskSnapshot | None:
+    """Reads the snapshot at `path`, or returns None if there isn't one or it was saved for a different `key`."""
+    try:
+        with open(path, 'rb') as file:
+            snapshot = pickle.loads(zlib.decompress(file.read()))
+    except Exception:  # Missing, truncated, or pickled by an older version. Any of them just means a cold start.
+        return None
+
+    if not isinstance(snapshot, TaskSnapshot) or snapshot.key != key:  # Taskwarrior's data changed since.
+        return None
+    return snapshot
+
+def save_snapshot(path: str, snapshot: TaskSnapshot) -> None:
+    """Writes `snapshot` to `path`, replacing the old one in one step so a crash can't leave half a file."""
+    data = zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL), 1)  # Fast beats small here.
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(data)
+        os.replace(tmp, path)  # Atomic on every platform we run on.
+    except OSError:
+        os.remove(tmp)  # Clean up, then let the caller know.
+        raise
@@ -0,0 +1,108 @@
+""" Prologue
+ *  Module Name: xp_columns.py
+ *  Purpose: A columnar, NumPy encoding of the XP ledger's counts, so re-scoring and bar sums are array operations.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: None
+ *  Invariants: `values` scores every row the way `XpControllerWidget.get_completion_value` would.
+ *  Known Faults: NumPy is optional. Without it `HAVE_NUMPY` is False and the ledger sums its keys in Python.
+"""
+
+from typing import Iterable, Optional
+from utils.completed_archive import ArchiveKey
+
+try:
+    import numpy as np
+    HAVE_NUMPY = True
+except ImportError:  # Optional, the ledger falls back to plain Python.
+    np = None
+    HAVE_NUMPY = False
+
+def _codes(values: Iterable, vocab: dict) -> list[int]:
+    """Numbers each distinct value in the order they're first seen, adding them to `vocab`. Private."""
+    return [vocab.setdefault(x, len(vocab)) for x in values]
+
+def _product(multipliers: dict, items: Optional[Iterable]) -> float:
+    """Multiplies the multipliers of `items`, like `get_completion_value` does for projects and tags. Private."""
+    factor = 1
+    for x in items or ():
+        if x in multipliers:
+            factor *= multipliers[x]
+    return factor
+
+class XpColumns:
+    """The ledger's `(key, module) -> [tasks, completed]` counts as integer columns, one row per count.
+
+    Priorities, projects, modules and whole tag sets are numbered, and which tags each row has is a
+    list of (row, tag) pairs, i.e. a sparse membership matrix. Scoring then only looks each multiplier
+    up once per distinct value, and everything per row is a gather, a product or a `bincount`."""
+    def __init__(self, counts: dict[tuple[ArchiveKey, str], list[int]]):
+        rows = list(counts)
+        self.row_of: dict[tuple[ArchiveKey, str], int] = {row: i for i, row in enumerate(rows)}  # (key, module) -> its row.
+
+        self.priorities: dict = {}  # Each distinct value -> its code.
+        self.projects: dict = {}
+        self.tagsets: dict = {}
+        self.tags: dict = {}
+        self.modules: dict = {}
+        self.priority = np.array(_codes((key[0] for key, _ in rows), self.priorities), dtype=np.int32)
+        self.project = np.array(_codes((key[1] for key, _ in rows), self.projects), dtype=np.int32)
+        self.tagset = np.array(_codes((key[2] for key, _ in rows), self.tagsets), dtype=np.int32)
+        self.module = np.array(_codes((module for _, module in rows), self.modules), dtype=np.int32)
+
+        pairs = [(i, tag) for i, (key, _) in enumerate(rows) for tag in key[2] or ()]
+        self.tag_rows = np.array([i for i, _ in pairs], dtype=np.int32)  # The sparse membership, a row per pair.
+        self.tag_codes = np.array(_codes((tag for _, tag in pairs), self.tags), dtype=np.int32)
+
+        self.n = np.array([c[0] for c in counts.values()], dtype=np.float64)  # Tasks per row.
+        self.done = np.array([c[1] for c in counts.values()], dtype=np.float64)  # Completed tasks per row.
+
+    def add(self, row: tuple[ArchiveKey, str], sign: int, completed: bool) -> bool:
+        """Counts one more task in `row`, or one less if `sign` is -1. False if there's no such row yet."""
+        i = self.row_of.get(row)
+        if i is None:
+            return False
+        self.n[i] += sign
+        self.done[i] += sign * completed
+        return True
+
+    def values(self, priorities: dict, projects: dict, tags: dict) -> 'np.ndarray':
+        """What a task in each row is worth with these multipliers, see `XpControllerWidget.get_completion_value`."""
+        by_priority = np.array([priorities.get(p, 0.5) for p in self.priorities], dtype=np.float64)
+        by_project = np.array([_product(projects, p) for p in self.projects], dtype=np.float64)
+        by_tag = np.array([_product(tags, [t]) for t in self.tags], dtype=np.float64)
+
+        values = by_priority[self.priority] * by_project[self.project]
+        np.multiply.at(values, self.tag_rows, by_tag[self.tag_codes])  # Each tag a row has multiplies it.
+        return values
+
+    def totals(self, values: 'np.ndarray') -> dict[tuple, tuple[float, float]]:
+        """`(possible, gained)` per total key, see `total_keys`, with each row's tasks worth `values`."""
+        possible = values * self.n
+        gained = values * self.done
+        totals: dict[tuple, tuple[float, float]] = {('main',): (float(possible.sum()), float(gained.sum()))}
+
+        for name, vocab, codes, rows in (('priority', self.priorities, self.priority, None),
+                                         ('project', self.projects, self.project, None),
+                                         ('module', self.modules, self.module, None),
+                                         ('tag', self.tags, self.tag_codes, self.tag_rows)):
+            p = possible if rows is None else possible[rows]
+            g = gained if rows is None else gained[rows]
+            by_possible = np.bincount(codes, weights=p, minlength=len(vocab))
+            by_gained = np.bincount(codes, weights=g, minlength=len(vocab))
+            for value, code in vocab.items():
+                totals[(name, value)] = (float(by_possible[code]), float(by_gained[code]))
+        return totals
+
+    def bar(self, priority: Optional[str], project: Optional[str], tags: Optional[tuple[str, ...]], value: float) -> tuple[float, float]:
+        """`(possible, gained)` of the tasks with the same priority, the same project or the same tags, for `value` each."""
+        mask = ((self.priority == self.priorities.get(priority, -1)) | (self.project == self.projects.get(project, -1))
+                | (self.tagset == self.tagsets.get(tags, -1)))
+        return float(value * self.n[mask].sum()), float(value * self.done[mask].sum())
@@ -0,0 +1,283 @@
+""" Prologue
+ *  Module Name: xp_ledger.py
+ *  Purpose: Running XP totals over the stored tasks, kept up to date with the store instead of recounted.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: `register_api` was called before this module is imported.
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: Each ledger subscribes to the API's change notifications until it's detached.
+ *  Invariants: Once refreshed, the totals equal what `recompute` would count from scratch.
+ *  Known Faults: `FakeTaskAPI.clear_tasks` doesn't notify, so tests call `rebuild` after it.
+"""
+
+import math
+from typing import Callable, Iterable, Optional
+from utils.completed_archive import ArchiveKey, CompletedArchive
+from utils.logger import logger
+from utils.task import Task
+from utils.task_api import api
+from utils.task_change import ChangeKind, TaskChange
+from utils.xp_columns import HAVE_NUMPY, XpColumns
+
+MAIN = ('main',)  # The key of the totals over every task.
+
+# Scores a task from its priority, project and tags, e.g. `XpControllerWidget.get_completion_value`.
+Score = Callable[[Optional[str], Optional[str], Optional[list[str]]], float]
+# The (priority, project, tag) multiplier maps `Score` reads, e.g. `XpControllerWidget.get_multipliers`.
+Multipliers = Callable[[], tuple[dict, dict, dict]]
+
+def xp_key(t: Task) -> ArchiveKey:
+    """What XP is computed from, in the shape the archive counts completed tasks by.
+
+    Empty values are None, and tags are flattened, since FakeTaskAPI nests them."""
+    get = dict.get  # Runs for every task on a recount, and `Task.get` is a Python level wrapper around the same lookup.
+    priority, project, tags = get(t, 'priority'), get(t, 'project'), get(t, 'tags')
+    if tags:
+        tags = tuple(tags) if isinstance(tags, (list, tuple)) else (tags,)
+        if not isinstance(tags[0], str):  # Nested, or FakeTaskAPI's `[None]`.
+            tags = tuple(x for tag in tags for x in (tag if isinstance(tag, (list, tuple)) else [tag]) if x)
+    return (str(priority) if priority else None, str(project) if project else None, tags or None)
+
+def total_keys(key: ArchiveKey, module: Optional[str]) -> list[tuple]:
+    """The totals a task with `key` stored in `module` counts towards. Archived tasks have no module."""
+    priority, project, tags = key
+    keys = [MAIN, ('priority', priority), ('project', project)]
+    keys += [('tag', tag) for tag in tags or ()]
+    if module is not None:
+        keys.append(('module', module))
+    return keys
+
+class XpTotals:
+    """How much XP a set of tasks is worth, and how much of it the completed ones earned."""
+    def __init__(self, possible: float = 0.0, gained: float = 0.0):
+        self.possible = possible
+        self.gained = gained
+
+    def __add__(self, other: 'XpTotals') -> 'XpTotals':
+        return XpTotals(self.possible + other.possible, self.gained + other.gained)
+
+    def isclose(self, other: 'XpTotals') -> bool:
+        """Equal, give or take what adding and subtracting floats over and over drifts by."""
+        return math.isclose(self.possible, other.possible, abs_tol=1e-6) and math.isclose(self.gained, other.gained, abs_tol=1e-6)
+
+    def __repr__(self) -> str:
+        return f"XpTotals({self.gained:g} / {self.possible:g})"
+
+class XpLedger:
+    """XP totals over every task, and per priority, project, tag and module.
+
+    Tasks are counted by their `xp_key` and module, and a task's XP only depends on its key, so the
+    totals are a sum over the distinct keys, not over the tasks. Adding, deleting, completing or
+    editing a task moves it between keys in O(1). A reset, e.g. a batch or a chunk of loaded tasks,
+    only marks its module stale, it's counted again the next time totals are read. A new `score`
+    function, e.g. because the multipliers changed, re-sums the keys without touching a task.
+
+    If NumPy is installed and `multipliers` is given, re-scoring and bar sums run over `XpColumns`
+    instead, as array operations. Otherwise they're Python loops over the keys, see `vectorized`.
+
+    `recompute` counts everything from scratch, that's what `verify` checks the running totals against."""
+    def __init__(self, score: Score, multipliers: Optional[Multipliers] = None):
+        self.score = score
+        self.multipliers = multipliers
+        self.vectorized = HAVE_NUMPY and multipliers is not None  # Whether to use `XpColumns`.
+        self.rebuild()
+        api.subscribe(self.on_task_change)
+
+    def detach(self) -> None:
+        """Stops following the store, before the ledger is thrown away."""
+        api.unsubscribe(self.on_task_change)
+
+    def rebuild(self) -> None:
+        """Forgets everything and counts the store again on the next read."""
+        self._entries: dict[str, tuple[str, ArchiveKey, bool]] = {}  # Uuid -> (module, key, completed) it's counted as.
+        self._by_module: dict[str, set[str]] = {}  # Module -> uuids counted in it.
+        self._counts: dict[tuple[ArchiveKey, str], list[int]] = {}  # (key, module) -> [tasks, completed tasks].
+        self._totals: dict[tuple, XpTotals] = {}  # Total key, see `total_keys` -> its totals, the archive aside.
+        self._values: dict[ArchiveKey, float] = {}  # Key -> what `score` says it's worth.
+        self._stale: set[str] = set(api.task_dict)  # Modules to count again before the next read.
+        self._archive: Optional[CompletedArchive] = None  # The archive `_archive_totals` was summed from.
+        self._archive_totals: dict[tuple, XpTotals] = {}
+        self._columns: Optional[XpColumns] = None  # `_counts` as columns, built when they're first needed.
+
+    def rescore(self) -> None:
+        """Re-sums every total with the current `score`, e.g. after the multipliers changed."""
+        self._values.clear()
+        if self.vectorized:
+            columns = self._get_columns()
+            totals = columns.totals(columns.values(*self.multipliers()))
+            self._totals = {key: XpTotals(possible, gained) for key, (possible, gained) in totals.items()}
+        else:
+            self._totals = self._sum((key, module, n, done) for (key, module), (n, done) in self._counts.items())
+        self._archive = None  # Summed with the old values too.
+
+    def on_task_change(self, change: TaskChange) -> None:
+        if change.kind == ChangeKind.RESET:  # Count it again once someone asks.
+            self._stale.add(change.module)
+            return
+
+        self._remove(str(change.task_uuid))
+        if change.new is not None:
+            module, idx = change.new
+            self._add(api.task_at(idx, module), module)
+
+    def total(self, key: tuple = MAIN) -> XpTotals:
+        """The totals of `key`: `MAIN`, `('priority', p)`, `('project', p)`, `('tag', t)` or `('module', m)`.
+
+        Archived tasks count towards every key but their module's, which isn't kept."""
+        self._refresh()
+        return self._totals.get(key, XpTotals()) + self._archive_totals.get(key, XpTotals())
+
+    def bar_totals(self, priority: Optional[str], project: Optional[str], tags: Optional[Iterable[str]], value: float) -> XpTotals:
+        """The totals of an XP bar for `priority`, `project` and `tags`: every task that has the same priority,
+        the same project or the same tags counts, for `value` each, see `XpBar.update_xp`."""
+        self._refresh()
+        priority, project, tags = priority or None, project or None, tuple(tags) if tags else None
+        totals = XpTotals()
+        matches = lambda key: key[0] == priority or key[1] == project or key[2] == tags
+
+        if self.vectorized:
+            totals = XpTotals(*self._get_columns().bar(priority, project, tags, value))
+        else:
+            for (key, _), (n, done) in self._counts.items():
+                if matches(key):
+                    totals.possible += value * n
+                    totals.gained += value * done
+        for key, n in api.archive.counts.items():  # All completed, and only a few keys.
+            if matches(key):
+                totals.possible += value * n
+                totals.gained += value * n
+        return totals
+
+    def recompute(self) -> dict[tuple, XpTotals]:
+        """Every total, counted from scratch over the store and the archive. Slow, see `verify`."""
+        counts: dict[tuple[ArchiveKey, str], list[int]] = {}
+        for module, tasks in api.task_dict.items():
+            for t in tasks:
+                c = counts.setdefault((xp_key(t), module), [0, 0])
+                c[0] += 1
+                c[1] += t.get('status') == 'completed'
+
+        totals = self._sum((key, module, n, done) for (key, module), (n, done) in counts.items())
+        for key, value in self._sum((key, None, n, n) for key, n in api.archive.counts.items()).items():
+            totals[key] = totals.get(key, XpTotals()) + value
+        return totals
+
+    def verify(self) -> bool:
+        """Checks the running totals against `recompute`. Logs and returns False if any of them drifted."""
+        self._refresh()
+        expected = self.recompute()
+        ok = True
+        for key in expected.keys() | self._totals.keys() | self._archive_totals.keys():
+            have = self.total(key)
+            if not have.isclose(expected.get(key, XpTotals())):
+                logger.log_warn(f"XP ledger drifted for {key}: {have} instead of {expected.get(key)}")
+                ok = False
+        return ok
+
+    def _refresh(self) -> None:
+        """Counts the stale modules again, and sums the archive if it was replaced. Private."""
+        for module in self._stale:
+            self._count_module(module)
+        self._stale.clear()
+
+        if self._archive is not api.archive:  # The loaders replace it, they never change it in place.
+            self._archive = api.archive
+            self._archive_totals = self._sum((key, None, n, n) for key, n in api.archive.counts.items())
+
+    def _count_module(self, module: str) -> None:
+        """Counts every task of `module` again, in bulk: the totals change once per key, not once per task. Private."""
+        for task_uuid in self._by_module.pop(module, ()):
+            del self._entries[task_uuid]
+        self._columns = None  # Rows come and go, encode them again when they're needed.
+        old = [(key, m, -n, -done) for (key, m), (n, done) in self._counts.items() if m == module]
+        for key, m, _, _ in old:
+            del self._counts[(key, m)]
+
+        entries = self._entries  # Runs for every task of the module.
+        counts: dict[ArchiveKey, list[int]] = {}
+        uuids = [str(t['uuid']) for t in api.task_dict.get(module, [])]
+        for task_uuid, t in zip(uuids, api.task_dict.get(module, [])):
+            key = xp_key(t)
+            completed = dict.get(t, 'status') == 'completed'
+            entries[task_uuid] = (module, key, completed)
+            c = counts.get(key)
+            if c is None:
+                c = counts[key] = [0, 0]
+            c[0] += 1
+            c[1] += completed
+
+        self._by_module[module] = set(uuids)
+        for key, c in counts.items():
+            self._counts[(key, module)] = c
+        new = [(key, module, n, done) for key, (n, done) in counts.items()]
+        for k, x in self._sum(old + new).items():  # The difference, per total.
+            have = self._totals.get(k)
+            self._totals[k] = x if have is None else have + x
+
+    def _get_columns(self) -> XpColumns:
+        """`_counts` as columns, encoded again if a key showed up since they were last encoded. Private."""
+        if self._columns is None:
+            self._columns = XpColumns(self._counts)
+        return self._columns
+
+    def _value(self, key: ArchiveKey) -> float:
+        """What a task with `key` is worth, scored once per key. Private."""
+        value = self._values.get(key)
+        if value is None:
+            priority, project, tags = key
+            value = self._values[key] = self.score(priority, project, list(tags) if tags else None)
+        return value
+
+    def _sum(self, counts: Iterable[tuple[ArchiveKey, Optional[str], int, int]]) -> dict[tuple, XpTotals]:
+        """Totals from `(key, module, tasks, completed tasks)` counts. Private."""
+        totals: dict[tuple, XpTotals] = {}
+        for key, module, n, done in counts:
+            value = self._value(key)
+            for k in total_keys(key, module):
+                x = totals.get(k)
+                if x is None:
+                    x = totals[k] = XpTotals()
+                x.possible += value * n
+                x.gained += value * done
+        return totals
+
+    def _add(self, t: Task, module: str) -> None:
+        """Counts `t`, stored in `module`. Private."""
+        task_uuid = str(t['uuid'])
+        entry = (module, xp_key(t), t.get('status') == 'completed')
+        self._entries[task_uuid] = entry
+        self._by_module.setdefault(module, set()).add(task_uuid)
+        self._apply(entry, 1)
+
+    def _remove(self, task_uuid: str) -> None:
+        """Stops counting `task_uuid`, if it's counted. Private."""
+        entry = self._entries.pop(task_uuid, None)
+        if entry is None:
+            return
+        self._by_module[entry[0]].discard(task_uuid)
+        self._apply(entry, -1)
+
+    def _apply(self, entry: tuple[str, ArchiveKey, bool], sign: int) -> None:
+        """Adds one task counted as `entry` to the counts and totals, or takes it away if `sign` is -1. Private."""
+        module, key, completed = entry
+        c = self._counts.setdefault((key, module), [0, 0])
+        c[0] += sign
+        c[1] += sign * completed
+        if c[0] == 0:  # Keep `bar_totals` to the keys that are still around.
+            del self._counts[(key, module)]
+        if self._columns is not None and not self._columns.add((key, module), sign, completed):
+            self._columns = None  # A new key, encode them again when they're needed.
+
+        value = self._value(key) * sign
+        for k in total_keys(key, module):
+            x = self._totals.get(k)
+            if x is None:
+                x = self._totals[k] = XpTotals()
+            x.possible += value
+            if completed:
+                x.gained += value
@@ -0,0 +1,56 @@
+""" Prologue
+ *  Module Name: xp_router.py
+ *  Purpose: Finds the XP bars a task counts towards with a few hash lookups, instead of asking every bar.
+ *  Inputs: None
+ *  Outputs: None
+ *  Additional code sources: None
+ *  Developers: Ethan Berkley, Jacob Wilkus, Derek Norton
+ *  Date: 10/18/2026
+ *  Last Modified: 10/18/2026
+ *  Preconditions: None
+ *  Postconditions: None
+ *  Error/Exception conditions: None
+ *  Side effects: None
+ *  Invariants: A route lists its bars in the order they were added, each once, with the fallback last.
+ *  Known Faults: None encountered
+"""
+
+from typing import TYPE_CHECKING
+from utils.completed_archive import ArchiveKey
+
+if TYPE_CHECKING:
+    from components.GUI.xp_bar import XpBar
+
+class XpRouter:
+    """Priority, project and tags -> the bars with the same priority, the same project or the same tags.
+
+    Each route is worked out once per `xp_key` and handed out as the same list until a bar is added,
+    so callers can tell whether their bars changed with an `is` check, see `TaskRow._bind_xp_fns`."""
+    def __init__(self, fallback: 'XpBar'):
+        self.fallback = fallback  # The bar every task counts towards, the main one.
+        self._bars: list['XpBar'] = []  # Every routed bar, in the order they were added.
+        self._by_attribute: dict[tuple, list[int]] = {}  # ('priority' | 'project' | 'tags', value) -> positions in `_bars`.
+        self._routes: dict[ArchiveKey, list['XpBar']] = {}  # Key -> its route.
+
+    def add(self, bar: 'XpBar', key: ArchiveKey) -> None:
+        """Routes the tasks with the same priority, project or tags as `key` to `bar` too."""
+        priority, project, tags = key
+        idx = len(self._bars)
+        self._bars.append(bar)
+        for attribute in (('priority', priority), ('project', project), ('tags', tags)):
+            self._by_attribute.setdefault(attribute, []).append(idx)
+        self._routes = {}  # New lists, so everyone holding an old one notices.
+
+    def route(self, key: ArchiveKey) -> list['XpBar']:
+        """The bars a task with `key` counts towards. Don't modify the list."""
+        route = self._routes.get(key)
+        if route is None:
+            priority, project, tags = key
+            found = set(self._by_attribute.get(('priority', priority), ()))
+            found.update(self._by_attribute.get(('project', project), ()))
+            found.update(self._by_attribute.get(('tags', tags), ()))
+            route = self._routes[key] = [self._bars[i] for i in sorted(found)] + [self.fallback]
+        return route
+
+    def __len__(self) -> int:
+        return len(self._bars)  # How many bars are routed to, the fallback aside.